@@ -1,143 +1,263 @@
 import discord
-from discord.ext import commands, tasks
-import aiohttp
+from discord.ext import commands
 import asyncio
 import json
+import os
 import re
-from datetime import datetime
-from utils.config import YOUTUBE_CHANNELS
-from utils.data import get_channels_for_type
-from cogs.settings import get_guild_settings
+from utils.config import YOUTUBE_CHANNELS, POLL_JOBS
+from utils import adaptive, breaker, dispatch, http_client, scheduler, warmstart
+from utils.dedupe import SentWindow
+from cogs.settings import get_notify_index
 
-sent_community_posts = set()
-COMMUNITY_CHECK_MINUTES = [2, 7, 12, 17, 22, 27, 32, 37, 42, 47, 52, 57]
+sent_community_posts = None
+# 예전 버전이 쓰던 파일. 처음 한 번 DB 로 옮긴 뒤 이름을 바꿔 둔다.
+LEGACY_SENT_COMMUNITY_FILE = "data/sent_community.json"
 
 def load_sent_community_posts():
+    """보낸 게시물 ID 집합 (채널별 최근 것만 보관). 예전 JSON 파일이 있으면 옮겨온다."""
+    posts = SentWindow("community")
     try:
-        with open("data/sent_community.json", "r") as f:
-            return set(json.load(f))
-    except:
-        return set()
+        with open(LEGACY_SENT_COMMUNITY_FILE, "r") as f:
+            legacy = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return posts
+    posts.add("", legacy)
+    os.replace(LEGACY_SENT_COMMUNITY_FILE, f"{LEGACY_SENT_COMMUNITY_FILE}.migrated")
+    print(f"[커뮤니티] 기존 게시물 기록 {len(legacy)}개를 DB 로 옮김")
+    return posts
 
-def save_sent_community_posts():
-    global sent_community_posts
-    with open("data/sent_community.json", "w") as f:
-        json.dump(list(sent_community_posts), f)
+_json_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"\s*")
+_TABS_KEY = '"twoColumnBrowseResultsRenderer"'
 
-async def get_community_posts(channel_id, max_posts=5):
-    url = "https://www.youtube.com/youtubei/v1/browse"
+def extract_browse_tabs(body: bytes) -> list:
+    """browse 응답에서 탭 목록만 디코드한다.
+    
+    응답 대부분은 header / metadata / microformat / frameworkUpdates 같은 쓰지 않는 부분이다.
+    twoColumnBrowseResultsRenderer 값이 시작하는 위치를 찾아 그 객체 하나만 raw_decode 하고
+    나머지는 건너뛴다. 키를 못 찾거나 모양이 다르면 예전처럼 전체를 디코드한다.
+    """
+    text = body.decode("utf-8")
+    key = text.find(_TABS_KEY)
+    if key >= 0:
+        colon = text.find(":", key + len(_TABS_KEY))
+        try:
+            renderer, _ = _json_decoder.raw_decode(text, _WHITESPACE.match(text, colon + 1).end())
+            if isinstance(renderer, dict) and isinstance(renderer.get("tabs"), list):
+                return renderer["tabs"]
+        except ValueError:
+            pass
+    data = json.loads(text)
+    return data.get("contents", {}).get("twoColumnBrowseResultsRenderer", {}).get("tabs", [])
+
+def _post_from_renderer(post_renderer: dict) -> dict:
+    post_id = post_renderer.get("postId", "")
+    
+    content_text = ""
+    content_runs = post_renderer.get("contentText", {}).get("runs", [])
+    for run in content_runs:
+        content_text += run.get("text", "")
+    
+    if len(content_text) > 200:
+        content_text = content_text[:200] + "..."
+    
+    vote_count = post_renderer.get("voteCount", {}).get("simpleText", "0")
+    
+    published_time = ""
+    time_text = post_renderer.get("publishedTimeText", {}).get("runs", [])
+    if time_text:
+        published_time = time_text[0].get("text", "")
     
-    headers = {
-        "Content-Type": "application/json",
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
-        "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+    image_url = None
+    backdrop = post_renderer.get("backstageAttachment", {})
+    if "backstageImageRenderer" in backdrop:
+        thumbnails = backdrop["backstageImageRenderer"].get("image", {}).get("thumbnails", [])
+        if thumbnails:
+            image_url = thumbnails[-1].get("url", "")
+    
+    return {
+        "post_id": post_id,
+        "content": content_text,
+        "likes": vote_count,
+        "published": published_time,
+        "image_url": image_url,
+        "url": f"https://www.youtube.com/post/{post_id}"
     }
+
+def _walk_items(items: list, page: dict, max_posts: int, known=None):
+    """게시물 항목을 최신순으로 훑는다. known 에 있는 게시물을 만나면 멈춘다.
+    
+    page: {"posts": [...], "first_post_id": 맨 위 게시물, "continuation": 다음 페이지 토큰, "reached_known": bool}
+    """
+    for item in items:
+        if "continuationItemRenderer" in item:
+            page["continuation"] = (item["continuationItemRenderer"].get("continuationEndpoint", {})
+                                    .get("continuationCommand", {}).get("token"))
+            continue
+        post_renderer = item.get("backstagePostThreadRenderer", {}).get("post", {}).get("backstagePostRenderer", {})
+        post_id = post_renderer.get("postId") if post_renderer else None
+        if not post_id:
+            continue
+        page["first_post_id"] = page["first_post_id"] or post_id
+        if known is not None and post_id in known:
+            page["reached_known"] = True
+            return
+        if len(page["posts"]) >= max_posts:
+            return
+        page["posts"].append(_post_from_renderer(post_renderer))
+
+def _new_page() -> dict:
+    return {"posts": [], "first_post_id": None, "continuation": None, "reached_known": False}
+
+def walk_tabs(tabs: list, max_posts=5, channel_id="", known=None) -> dict | None:
+    """탭 목록에서 커뮤니티 탭을 찾아 게시물을 훑는다 (_walk_items 의 page). 탭이 없으면 None."""
+    community_tab = None
+    for tab in tabs:
+        tab_renderer = tab.get("tabRenderer", {})
+        title = tab_renderer.get("title", "")
+        if title in ["커뮤니티", "Community", "게시물", "Posts"]:
+            community_tab = tab_renderer
+            break
+    
+    if not community_tab:
+        # 디버그: 어떤 탭들이 있는지 출력
+        tab_names = [tab.get("tabRenderer", {}).get("title", "없음") for tab in tabs]
+        print(f"[커뮤니티] 커뮤니티 탭을 찾을 수 없음 (채널: {channel_id}, 탭: {tab_names})")
+        return None
     
-    payload = {
-        "context": {
-            "client": {
-                "clientName": "WEB",
-                "clientVersion": "2.20241216.00.00",
-                "hl": "ko",
-                "gl": "KR"
-            }
-        },
-        "browseId": channel_id,
-        "params": "Egljb21tdW5pdHnyBgQKAkoA"
+    page = _new_page()
+    content = community_tab.get("content", {})
+    section_list = content.get("sectionListRenderer", {})
+    for section in section_list.get("contents", []):
+        if "continuationItemRenderer" in section:
+            _walk_items([section], page, max_posts)
+            continue
+        _walk_items(section.get("itemSectionRenderer", {}).get("contents", []), page, max_posts, known)
+        if page["reached_known"] or len(page["posts"]) >= max_posts:
+            break
+    return page
+
+def posts_from_tabs(tabs: list, max_posts=5, channel_id="", known=None) -> list:
+    """탭 목록에서 커뮤니티 탭의 게시물 목록을 뽑는다."""
+    page = walk_tabs(tabs, max_posts, channel_id, known)
+    return page["posts"] if page else []
+
+def parse_community_posts(body: bytes, max_posts=5, channel_id="", known=None) -> list:
+    """browse 응답 본문(bytes) → 게시물 목록."""
+    return posts_from_tabs(extract_browse_tabs(body), max_posts, channel_id, known)
+
+BROWSE_URL = "https://www.youtube.com/youtubei/v1/browse"
+BROWSE_HEADERS = {
+    "Content-Type": "application/json",
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
+    "Accept-Language": "ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+BROWSE_CONTEXT = {
+    "client": {
+        "clientName": "WEB",
+        "clientVersion": "2.20241216.00.00",
+        "hl": "ko",
+        "gl": "KR"
     }
+}
+# 따라갈 이어보기(continuation) 페이지 수. 첫 페이지가 전부 새 게시물일 때만 쓴다.
+MAX_CONTINUATION_PAGES = 2
+# 커뮤니티 게시물을 확인하는 유튜브 채널 (YOUTUBE_CHANNELS 키)
+COMMUNITY_CHANNELS = ["genshin_yt", "starrail_yt", "zzz_yt", "wuwa_yt", "petitplanet_yt", "varsapura_yt", "nexusanima_yt"]
+_PROBE_PATTERN = re.compile(rb'"postId"\s*:\s*"([^"]*)"')
+
+# channel_id -> 마지막으로 본 맨 위 게시물 ID (변경 확인용, 메모리에만)
+newest_post_ids: dict[str, str] = {}
+# 변경 확인 카운터: 요청 수 / 맨 위 게시물이 그대로라 중간에 끊은 수 / 실제로 읽은 바이트
+probe_stats = {"requests": 0, "unchanged": 0, "bytes_read": 0, "continuations": 0}
+
+async def _read_browse(payload: dict, newest: str | None) -> bytes | None:
+    """browse 요청. newest 를 주면 응답을 읽다가 첫 postId 가 newest 와 같을 때 바로 끊고 None.
     
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload, headers=headers, timeout=aiohttp.ClientTimeout(total=30)) as resp:
-                if resp.status != 200:
-                    print(f"[커뮤니티] API 실패: {resp.status}")
-                    return []
-                data = await resp.json()
-    except Exception as e:
-        print(f"[커뮤니티] 오류: {e}")
+    커뮤니티 탭 응답에서 첫 postId 는 맨 위(최신) 게시물이다. 보통 본문 앞쪽에 나오므로
+    변경이 없으면 나머지(대부분의 바이트)는 받지도 파싱하지도 않는다.
+    """
+    probe_stats["requests"] += 1
+    body = bytearray()
+    scanned = 0
+    async with http_client.post(BROWSE_URL, json=payload, headers=BROWSE_HEADERS) as resp:
+        if resp.status != 200:
+            raise RuntimeError(f"API 실패: {resp.status}")
+        async for chunk in resp.content.iter_chunked(16384):
+            body += chunk
+            if newest is None:
+                continue
+            # 조각 경계에 걸친 키도 찾도록 조금 앞에서부터 다시 본다
+            match = _PROBE_PATTERN.search(body, max(0, scanned - 64))
+            if match is None:
+                scanned = len(body)
+                continue
+            if match.group(1).decode() == newest:
+                probe_stats["unchanged"] += 1
+                probe_stats["bytes_read"] += len(body)
+                return None
+            newest = None  # 바뀌었다 → 끝까지 읽는다
+    probe_stats["bytes_read"] += len(body)
+    return bytes(body)
+
+async def fetch_community_posts(channel_id, max_posts=5, *, known=None):
+    """커뮤니티 게시물 (실패하면 예외).
+    
+    known(보낸 게시물 ID 집합)을 주면 증분 모드:
+    - 맨 위 게시물이 지난번과 같으면 응답을 끝까지 받지 않고 None (변경 없음)
+    - 아니면 최신순으로 훑다가 known 게시물에서 멈추고 그 앞의 새 게시물만 돌려준다
+    - 첫 페이지가 전부 새 게시물이면 continuation 으로 다음 페이지를 이어서 본다
+    """
+    newest = newest_post_ids.get(channel_id) if known is not None else None
+    body = await _read_browse({"context": BROWSE_CONTEXT, "browseId": channel_id,
+                               "params": "Egljb21tdW5pdHnyBgQKAkoA"}, newest)
+    if body is None:
+        return None
+    
+    page = walk_tabs(extract_browse_tabs(body), max_posts, channel_id, known)
+    if page is None:
         return []
+    if page["first_post_id"]:
+        newest_post_ids[channel_id] = page["first_post_id"]
     
-    posts = []
+    pages = 0
+    while (known is not None and page["continuation"] and not page["reached_known"]
+           and len(page["posts"]) < max_posts and pages < MAX_CONTINUATION_PAGES):
+        pages += 1
+        probe_stats["continuations"] += 1
+        token, page["continuation"] = page["continuation"], None
+        data = json.loads(await _read_browse({"context": BROWSE_CONTEXT, "continuation": token}, None))
+        for action in data.get("onResponseReceivedEndpoints", []):
+            items = action.get("appendContinuationItemsAction", {}).get("continuationItems", [])
+            _walk_items(items, page, max_posts, known)
+    return page["posts"]
+
+async def get_community_posts(channel_id, max_posts=5):
+    """fetch_community_posts 와 같지만 실패하면 로그만 남기고 [] 를 돌려준다."""
     try:
-        tabs = data.get("contents", {}).get("twoColumnBrowseResultsRenderer", {}).get("tabs", [])
-        
-        community_tab = None
-        for tab in tabs:
-            tab_renderer = tab.get("tabRenderer", {})
-            title = tab_renderer.get("title", "")
-            if title in ["커뮤니티", "Community", "게시물", "Posts"]:
-                community_tab = tab_renderer
-                break
-        
-        if not community_tab:
-            # 디버그: 어떤 탭들이 있는지 출력
-            tab_names = [tab.get("tabRenderer", {}).get("title", "없음") for tab in tabs]
-            print(f"[커뮤니티] 커뮤니티 탭을 찾을 수 없음 (채널: {channel_id}, 탭: {tab_names})")
-            return []
-        
-        content = community_tab.get("content", {})
-        section_list = content.get("sectionListRenderer", {})
-        contents = section_list.get("contents", [])
-        
-        for section in contents:
-            item_section = section.get("itemSectionRenderer", {})
-            items = item_section.get("contents", [])
-            
-            for item in items[:max_posts]:
-                post_renderer = item.get("backstagePostThreadRenderer", {}).get("post", {}).get("backstagePostRenderer", {})
-                
-                if not post_renderer:
-                    continue
-                
-                post_id = post_renderer.get("postId", "")
-                
-                content_text = ""
-                content_runs = post_renderer.get("contentText", {}).get("runs", [])
-                for run in content_runs:
-                    content_text += run.get("text", "")
-                
-                if len(content_text) > 200:
-                    content_text = content_text[:200] + "..."
-                
-                vote_count = post_renderer.get("voteCount", {}).get("simpleText", "0")
-                
-                published_time = ""
-                time_text = post_renderer.get("publishedTimeText", {}).get("runs", [])
-                if time_text:
-                    published_time = time_text[0].get("text", "")
-                
-                image_url = None
-                backdrop = post_renderer.get("backstageAttachment", {})
-                if "backstageImageRenderer" in backdrop:
-                    thumbnails = backdrop["backstageImageRenderer"].get("image", {}).get("thumbnails", [])
-                    if thumbnails:
-                        image_url = thumbnails[-1].get("url", "")
-                
-                if post_id:
-                    posts.append({
-                        "post_id": post_id,
-                        "content": content_text,
-                        "likes": vote_count,
-                        "published": published_time,
-                        "image_url": image_url,
-                        "url": f"https://www.youtube.com/post/{post_id}"
-                    })
-        
+        return await fetch_community_posts(channel_id, max_posts)
     except Exception as e:
-        print(f"[커뮤니티] 파싱 오류: {e}")
+        print(f"[커뮤니티] 오류: {e}")
         return []
-    
-    return posts
 
 class Community(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         global sent_community_posts
         sent_community_posts = load_sent_community_posts()
-        self.check_community.start()
+        scheduler.register("community", self.check_community, before=self.before_check_community,
+                           reschedule=self._next_poll_in, **POLL_JOBS["community"])
     
     def cog_unload(self):
-        self.check_community.cancel()
+        scheduler.unregister("community")
+    
+    def _next_poll_in(self):
+        """알림 채널이 있는 커뮤니티 중 가장 먼저 차례가 오는 것까지 남은 초 (스케줄러 다음 실행 시각)."""
+        notify_index = get_notify_index()
+        return adaptive.next_in(
+            f"community:{yt_key}" for yt_key in COMMUNITY_CHANNELS
+            if yt_key in YOUTUBE_CHANNELS and (notify_index.has(f"{yt_key}_community") or notify_index.has(yt_key))
+        )
     
     @commands.command(name="커뮤확인", aliases=["커뮤테스트"])
     @commands.has_permissions(administrator=True)
@@ -196,38 +316,46 @@ class Community(commands.Cog):
 
         await ctx.send(embed=embed)
     
-    @tasks.loop(minutes=1)
     async def check_community(self):
         global sent_community_posts
         
-        current_minute = datetime.now().minute
-        if current_minute not in COMMUNITY_CHECK_MINUTES:
-            return
-        
-        print(f"[커뮤니티] 체크 중... ({current_minute}분)")
-        guild_settings = get_guild_settings()
+        notify_index = get_notify_index()
         
-        community_channels = ["genshin_yt", "starrail_yt", "zzz_yt", "wuwa_yt", "petitplanet_yt", "varsapura_yt", "nexusanima_yt"]
-        for yt_key in community_channels:
+        for yt_key in COMMUNITY_CHANNELS:
             if yt_key not in YOUTUBE_CHANNELS:
                 continue
             yt_info = YOUTUBE_CHANNELS[yt_key]
             community_key = f"{yt_key}_community"
-            registered_channels = get_channels_for_type(guild_settings, community_key)
+            registered_channels = notify_index.channels(community_key)
             
             # 커뮤니티 키가 없으면 기본 유튜브 키로 fallback (이전 설정 호환)
             if not registered_channels:
-                registered_channels = get_channels_for_type(guild_settings, yt_key)
+                registered_channels = notify_index.channels(yt_key)
             
+            source = f"community:{yt_key}"
             if not registered_channels:
                 # 디버그: 등록된 채널이 없으면 스킵
+                adaptive.forget(source)
+                continue
+            # 채널별 적응형 간격: 이번 회차는 차례가 된 채널만 (다른 채널 차례라서 깨어났을 수 있다)
+            if not adaptive.due(source):
                 continue
+            # innertube 가 계속 실패하면 차단기가 열려 있는 동안 요청하지 않는다
+            if not breaker.allow(source):
+                continue
+            adaptive.mark_polled(source)
             
             print(f"[커뮤니티] {yt_info['name']}: {len(registered_channels)}개 채널에서 알림 대기 중")
-            posts = await get_community_posts(yt_info["channel_id"], max_posts=3)
-            
+            try:
+                # 증분 모드: 맨 위 게시물이 그대로면 None, 아니면 보낸 적 없는 게시물만
+                posts = await fetch_community_posts(yt_info["channel_id"], max_posts=3, known=sent_community_posts)
+            except Exception as e:
+                print(f"[커뮤니티] {yt_info['name']}: 게시물 가져오기 실패 ({e})")
+                breaker.failure(source, e)
+                continue
+            breaker.success(source)
+            warmstart.touch(source)
             if not posts:
-                print(f"[커뮤니티] {yt_info['name']}: 게시물 가져오기 실패")
                 continue
             
             new_posts = []
@@ -255,47 +383,45 @@ class Community(commands.Cog):
                 
                 embed.set_footer(text="YouTube 커뮤니티")
                 
-                for channel_id in registered_channels:
-                    channel = self.bot.get_channel(channel_id)
-                    if channel:
-                        try:
-                            await channel.send(embed=embed)
-                            print(f"[커뮤니티] ✅ 알림 전송 완료: {channel.name}")
-                        except Exception as e:
-                            print(f"[커뮤니티] ❌ 메시지 전송 실패 ({channel_id}): {e}")
-                    else:
-                        print(f"[커뮤니티] ❌ 채널을 찾을 수 없음: {channel_id}")
+                sent = await dispatch.fan_out(self.bot, registered_channels, embed=embed, tag="커뮤니티")
+                print(f"[커뮤니티] ✅ 알림 전송 완료: {sent}/{len(registered_channels)}개 채널")
                 
-                sent_community_posts.add(post_id)
                 new_posts.append(post_id)
             
             # 새 게시물이 있을 때만 한 번 저장 (성능 최적화)
             if new_posts:
-                save_sent_community_posts()
+                sent_community_posts.add(yt_key, new_posts)
+                adaptive.record_publish(source)
                 print(f"[커뮤니티] {yt_info['name']}: {len(new_posts)}개 새 게시물 처리 완료")
-            
-            await asyncio.sleep(2)
+        
+        warmstart.flush()
     
-    @check_community.before_loop
     async def before_check_community(self):
         global sent_community_posts
         await self.bot.wait_until_ready()
         
-        print("[커뮤니티] 기존 게시물 캐싱 중...")
+        # 최근까지 정상 확인했던 채널은 DB 의 보낸 게시물 목록을 그대로 쓰고 바로 시작한다
+        cold = [
+            source.split(":", 1)[1]
+            for source in warmstart.cold_sources(f"community:{key}" for key in COMMUNITY_CHANNELS if key in YOUTUBE_CHANNELS)
+        ]
+        if not cold:
+            print("[커뮤니티] 최근 상태가 남아 있어 초기화 생략 (warm start)")
+            return
         
-        community_channels = ["genshin_yt", "starrail_yt", "zzz_yt", "wuwa_yt", "petitplanet_yt", "varsapura_yt", "nexusanima_yt"]
-        for yt_key in community_channels:
-            if yt_key not in YOUTUBE_CHANNELS:
+        print(f"[커뮤니티] 기존 게시물 캐싱 중... ({len(cold)}개 채널 동시)")
+        results = await asyncio.gather(
+            *(get_community_posts(YOUTUBE_CHANNELS[key]["channel_id"], max_posts=5) for key in cold),
+            return_exceptions=True,
+        )
+        for yt_key, posts in zip(cold, results):
+            if isinstance(posts, Exception) or not posts:
                 continue
-            yt_info = YOUTUBE_CHANNELS[yt_key]
-            posts = await get_community_posts(yt_info["channel_id"], max_posts=5)
-            if posts:
-                print(f"[커뮤니티] {yt_info['name']}: {len(posts)}개 캐시")
-            for post in posts:
-                sent_community_posts.add(post["post_id"])
-            await asyncio.sleep(1)
+            print(f"[커뮤니티] {YOUTUBE_CHANNELS[yt_key]['name']}: {len(posts)}개 캐시")
+            sent_community_posts.add(yt_key, [post["post_id"] for post in posts])
+            warmstart.touch(f"community:{yt_key}")
+        warmstart.flush()
         
-        save_sent_community_posts()
         print(f"[커뮤니티] 초기화 완료. 기존 게시물 {len(sent_community_posts)}개 캐시됨.")
 
 async def setup(bot):
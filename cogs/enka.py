@@ -1,41 +1,14 @@
 import discord
 from discord import app_commands
 from discord.ext import commands
-import aiohttp
 from utils.config import AVATAR_ID_TO_KR, AVATAR_ICON_NAMES, COSTUME_ART_NAMES, CHARACTER_NAME_TO_ENKA
-from utils.data import load_uid_data, save_uid_data
-from utils import nanoka
-
-# nanoka GI 캐릭터 목록(id→한글명) 캐시 — 하드코딩표(AVATAR_ID_TO_KR)에 없는 신캐 매칭용
-_gi_name_cache = {}
-
-
-async def _ensure_gi_names():
-    if _gi_name_cache:
-        return
-    try:
-        async with aiohttp.ClientSession() as session:
-            version = await nanoka.get_version(session, "gi")
-            if not version:
-                return
-            async with session.get(nanoka.char_list_url("gi", version)) as resp:
-                if resp.status != 200:
-                    return
-                data = await resp.json()
-        for cid, c in (data.items() if isinstance(data, dict) else []):
-            name = c.get('ko') or c.get('en')
-            if name:
-                try:
-                    _gi_name_cache[int(cid)] = name
-                except (TypeError, ValueError):
-                    pass
-    except Exception as e:
-        print(f"[Enka] GI 이름 캐시 실패: {e}")
+from utils.data import get_uid, set_uid
+from utils import breaker, catalog, http_client
 
 
 def resolve_char_name(avatar_id) -> str:
-    """avatar_id → 한글 이름 (하드코딩표 → nanoka 캐시 → 폴백 순)."""
-    return AVATAR_ID_TO_KR.get(avatar_id) or _gi_name_cache.get(avatar_id) or f"캐릭터_{avatar_id}"
+    """avatar_id → 한글 이름 (하드코딩표 → nanoka 카탈로그 → 폴백 순)."""
+    return AVATAR_ID_TO_KR.get(avatar_id) or catalog.name_of("character", "gi", avatar_id) or f"캐릭터_{avatar_id}"
 
 class CharacterSelect(discord.ui.Select):
     def __init__(self, characters, uid, bot):
@@ -48,7 +21,7 @@ class CharacterSelect(discord.ui.Select):
     
     async def callback(self, interaction: discord.Interaction):
         char_id = int(self.values[0])
-        await _ensure_gi_names()
+        await catalog.refresh()
         char_name = resolve_char_name(char_id)
         await interaction.response.send_message(f"🔍 **{char_name}** 빌드를 불러오는 중...", ephemeral=True)
         await show_build_for_uid(interaction.channel, interaction.user, self.uid, char_name, char_id)
@@ -58,19 +31,34 @@ class CharacterSelectView(discord.ui.View):
         super().__init__(timeout=60)
         self.add_item(CharacterSelect(characters, uid, bot))
 
+ENKA_HEADERS = {"User-Agent": "HoyoRedeemBot/1.0"}
+
+async def fetch_enka_profile(uid):
+    """enka.network 프로필 조회 → (HTTP 상태, 200 이면 JSON). 계속 실패 중이면 breaker.BreakerOpen."""
+    breaker.check("enka")
+    try:
+        async with http_client.get(f"https://enka.network/api/uid/{uid}/", headers=ENKA_HEADERS) as resp:
+            data = await resp.json() if resp.status == 200 else None
+    except Exception as e:
+        breaker.failure("enka", e)
+        raise
+    # 5xx 만 enka 장애로 센다 (424 점검 / 404 없는 UID / 429 는 정상 응답)
+    if resp.status >= 500:
+        breaker.failure("enka", f"HTTP {resp.status}")
+    else:
+        breaker.success("enka")
+    return resp.status, data
+
 async def show_build_for_uid(channel, user, uid, char_name, target_avatar_id=None):
-    await _ensure_gi_names()
+    await catalog.refresh()
     try:
-        async with aiohttp.ClientSession() as session:
-            headers = {"User-Agent": "HoyoRedeemBot/1.0"}
-            async with session.get(f"https://enka.network/api/uid/{uid}/", headers=headers) as resp:
-                if resp.status != 200:
-                    await channel.send(f"❌ API 오류: {resp.status}")
-                    return
-                data = await resp.json()
+        status, data = await fetch_enka_profile(uid)
     except Exception as e:
         await channel.send(f"❌ 연결 오류: {e}")
         return
+    if status != 200:
+        await channel.send(f"❌ API 오류: {status}")
+        return
     
     avatar_list = data.get("avatarInfoList", [])
     if not avatar_list:
@@ -272,29 +260,24 @@ class Enka(commands.Cog):
             return
         
         user_id = str(interaction.user.id)
-        uid_data = load_uid_data()
-        uid_data[user_id] = uid
-        save_uid_data(uid_data)
+        set_uid(user_id, uid)
         
         await interaction.response.defer()
         
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {"User-Agent": "HoyoRedeemBot/1.0"}
-                async with session.get(f"https://enka.network/api/uid/{uid}/", headers=headers) as resp:
-                    if resp.status == 424:
-                        await interaction.followup.send(f"✅ UID `{uid}` 등록 완료!\n⚠️ 게임 점검 중이라 캐릭터 조회 불가")
-                        return
-                    if resp.status == 429:
-                        await interaction.followup.send(f"✅ UID `{uid}` 등록 완료!\n⚠️ 잠시 후 `/전시`로 확인해주세요")
-                        return
-                    if resp.status != 200:
-                        await interaction.followup.send(f"✅ UID `{uid}` 등록 완료!\n❌ API 오류: {resp.status}")
-                        return
-                    data = await resp.json()
+            status, data = await fetch_enka_profile(uid)
         except Exception as e:
             await interaction.followup.send(f"✅ UID `{uid}` 등록 완료!\n❌ 연결 오류: {e}")
             return
+        if status == 424:
+            await interaction.followup.send(f"✅ UID `{uid}` 등록 완료!\n⚠️ 게임 점검 중이라 캐릭터 조회 불가")
+            return
+        if status == 429:
+            await interaction.followup.send(f"✅ UID `{uid}` 등록 완료!\n⚠️ 잠시 후 `/전시`로 확인해주세요")
+            return
+        if status != 200:
+            await interaction.followup.send(f"✅ UID `{uid}` 등록 완료!\n❌ API 오류: {status}")
+            return
         
         player_info = data.get("playerInfo", {})
         nickname = player_info.get("nickname", "알 수 없음")
@@ -306,7 +289,7 @@ class Enka(commands.Cog):
             await interaction.followup.send(f"✅ UID `{uid}` 등록 완료!\n\n📭 **{nickname}** (AR {level})\n전시된 캐릭터가 없어요! 게임에서 캐릭터 전시 설정을 확인해주세요.")
             return
         
-        await _ensure_gi_names()
+        await catalog.refresh()
         characters = []
         for avatar in avatar_list:
             avatar_id = avatar.get("avatarId", 0)
@@ -336,28 +319,23 @@ class Enka(commands.Cog):
             return
         
         user_id = str(ctx.author.id)
-        uid_data = load_uid_data()
-        uid_data[user_id] = uid
-        save_uid_data(uid_data)
+        set_uid(user_id, uid)
         
         async with ctx.typing():
             try:
-                async with aiohttp.ClientSession() as session:
-                    headers = {"User-Agent": "HoyoRedeemBot/1.0"}
-                    async with session.get(f"https://enka.network/api/uid/{uid}/", headers=headers) as resp:
-                        if resp.status == 424:
-                            await ctx.send(f"✅ UID `{uid}` 등록 완료!\n⚠️ 게임 점검 중이라 캐릭터 조회 불가")
-                            return
-                        if resp.status == 429:
-                            await ctx.send(f"✅ UID `{uid}` 등록 완료!\n⚠️ 잠시 후 `!전시`로 확인해주세요")
-                            return
-                        if resp.status != 200:
-                            await ctx.send(f"✅ UID `{uid}` 등록 완료!\n❌ API 오류: {resp.status}")
-                            return
-                        data = await resp.json()
+                status, data = await fetch_enka_profile(uid)
             except Exception as e:
                 await ctx.send(f"✅ UID `{uid}` 등록 완료!\n❌ 연결 오류: {e}")
                 return
+            if status == 424:
+                await ctx.send(f"✅ UID `{uid}` 등록 완료!\n⚠️ 게임 점검 중이라 캐릭터 조회 불가")
+                return
+            if status == 429:
+                await ctx.send(f"✅ UID `{uid}` 등록 완료!\n⚠️ 잠시 후 `!전시`로 확인해주세요")
+                return
+            if status != 200:
+                await ctx.send(f"✅ UID `{uid}` 등록 완료!\n❌ API 오류: {status}")
+                return
         
         player_info = data.get("playerInfo", {})
         nickname = player_info.get("nickname", "알 수 없음")
@@ -369,7 +347,7 @@ class Enka(commands.Cog):
             await ctx.send(f"✅ UID `{uid}` 등록 완료!\n\n📭 **{nickname}** (AR {level})\n전시된 캐릭터가 없어요! 게임에서 캐릭터 전시 설정을 확인해주세요.")
             return
         
-        await _ensure_gi_names()
+        await catalog.refresh()
         characters = []
         for avatar in avatar_list:
             avatar_id = avatar.get("avatarId", 0)
@@ -399,14 +377,12 @@ class Enka(commands.Cog):
             return
         
         user_id = str(ctx.author.id)
-        uid_data = load_uid_data()
+        uid = get_uid(user_id)
         
-        if user_id not in uid_data:
+        if uid is None:
             await ctx.send("❌ 먼저 UID를 등록해주세요! `!uid 123456789`")
             return
         
-        uid = uid_data[user_id]
-        
         async with ctx.typing():
             await show_build_for_uid(ctx.channel, ctx.author, uid, 캐릭터)
     
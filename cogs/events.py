@@ -1,9 +1,9 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import aiohttp
 import re
 from datetime import datetime, timezone, timedelta
+from utils import http_client, singleflight
 
 
 class Events(commands.Cog):
@@ -47,28 +47,29 @@ class Events(commands.Cog):
         }
     
     async def fetch_events(self, game: str):
-        """게임별 이벤트 정보를 가져옵니다."""
+        """게임별 이벤트 정보를 가져옵니다. 같은 게임을 동시에 조회하면 요청 한 번으로 합칩니다."""
         config = self.api_configs.get(game)
         if not config:
             return None
-        
+        return await singleflight.do(f"events:{game}", lambda: self._fetch_events(game, config))
+    
+    async def _fetch_events(self, game: str, config: dict):
         try:
-            async with aiohttp.ClientSession() as session:
-                # 이벤트 목록 가져오기
-                async with session.get(config["list_url"], params=config["params"]) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get("retcode") == 0:
-                            list_data = data.get("data", {})
-                            
-                            # 이벤트 상세 내용(보상 정보) 가져오기
-                            async with session.get(config["content_url"], params=config["params"]) as content_response:
-                                if content_response.status == 200:
-                                    content_data = await content_response.json()
-                                    if content_data.get("retcode") == 0:
-                                        list_data["content_list"] = content_data.get("data", {}).get("list", [])
-                            
-                            return list_data
+            # 이벤트 목록 가져오기
+            async with http_client.get(config["list_url"], params=config["params"]) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    if data.get("retcode") == 0:
+                        list_data = data.get("data", {})
+                        
+                        # 이벤트 상세 내용(보상 정보) 가져오기
+                        async with http_client.get(config["content_url"], params=config["params"]) as content_response:
+                            if content_response.status == 200:
+                                content_data = await content_response.json()
+                                if content_data.get("retcode") == 0:
+                                    list_data["content_list"] = content_data.get("data", {}).get("list", [])
+                        
+                        return list_data
         except Exception as e:
             print(f"[이벤트] {game} API 오류: {e}")
         return None
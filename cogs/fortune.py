@@ -4,7 +4,7 @@ from discord.ext import commands
 import random
 from datetime import date
 from utils.config import CHARACTER_FORTUNES
-from utils.data import load_data, save_data
+from utils.data import get_fortune_date, set_fortune_date
 
 class Fortune(commands.Cog):
     def __init__(self, bot):
@@ -15,13 +15,7 @@ class Fortune(commands.Cog):
         user_id = str(interaction.user.id)
         today = date.today().isoformat()
         
-        data = load_data()
-        
-        # fortune_dates가 없을 경우를 대비해 안전하게 처리
-        if "fortune_dates" not in data:
-            data["fortune_dates"] = {}
-        
-        if data["fortune_dates"].get(user_id) == today:
+        if get_fortune_date(user_id) == today:
             embed = discord.Embed(
                 title="오늘의 운세는 이미 확인했어요!",
                 description="내일 다시 확인해주세요~",
@@ -33,8 +27,7 @@ class Fortune(commands.Cog):
         # weights = [0.5 if char[0] == "삼칠이" else 1.0 for char in CHARACTER_FORTUNES]
         character, emoji, description, color = random.choice(CHARACTER_FORTUNES)
         
-        data["fortune_dates"][user_id] = today
-        save_data(data)
+        set_fortune_date(user_id, today)
         
         embed = discord.Embed(
             title=f"{emoji} 오늘의 운세: {character}",
@@ -49,13 +42,7 @@ class Fortune(commands.Cog):
         user_id = str(ctx.author.id)
         today = date.today().isoformat()
         
-        data = load_data()
-        
-        # fortune_dates가 없을 경우를 대비해 안전하게 처리
-        if "fortune_dates" not in data:
-            data["fortune_dates"] = {}
-        
-        if data["fortune_dates"].get(user_id) == today:
+        if get_fortune_date(user_id) == today:
             embed = discord.Embed(
                 title="오늘의 운세는 이미 확인했어요!",
                 description="내일 다시 확인해주세요~",
@@ -67,8 +54,7 @@ class Fortune(commands.Cog):
         # weights = [0.5 if char[0] == "삼칠이" else 1.0 for char in CHARACTER_FORTUNES]
         character, emoji, description, color = random.choice(CHARACTER_FORTUNES)
         
-        data["fortune_dates"][user_id] = today
-        save_data(data)
+        set_fortune_date(user_id, today)
         
         embed = discord.Embed(
             title=f"{emoji} 오늘의 운세: {character}",
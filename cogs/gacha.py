@@ -2,7 +2,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import random
-from utils.data import load_data, save_data
+from utils.data import get_gacha_pity, set_gacha_pity, delete_gacha_pity
 
 # 산드로네 일러스트. 출시 전엔 CDN(enka)에 없어 썸네일이 안 뜰 수 있으나(=미표시), 출시되면 자동 표시됨.
 # 지금 바로 이미지를 띄우고 싶으면 HoYoLAB 등에서 받은 직링크로 교체하면 됨.
@@ -35,10 +35,8 @@ class Gacha(commands.Cog):
     @app_commands.command(name="기원리셋", description="기원 누적 기록을 초기화해요")
     async def slash_gacha_reset(self, interaction: discord.Interaction):
         user_id = str(interaction.user.id)
-        data = load_data()
-        
-        if user_id in data["gacha_pity"]:
-            data["gacha_pity"][user_id] = {
+        if get_gacha_pity(user_id) is not None:
+            set_gacha_pity(user_id, {
                 "pity_5star": 0,
                 "pity_4star": 0,
                 "total_pulls": 0,
@@ -46,8 +44,7 @@ class Gacha(commands.Cog):
                 "total_columbina": 0,
                 "total_qiqi": 0,
                 "guaranteed": False
-            }
-            save_data(data)
+            })
         
         embed = discord.Embed(
             title="🔄 기원 기록 초기화",
@@ -69,10 +66,8 @@ class Gacha(commands.Cog):
     @commands.command(name="기원리셋")
     async def gacha_reset(self, ctx):
         user_id = str(ctx.author.id)
-        data = load_data()
-        
-        if user_id in data["gacha_pity"]:
-            data["gacha_pity"][user_id] = {
+        if get_gacha_pity(user_id) is not None:
+            set_gacha_pity(user_id, {
                 "pity_5star": 0,
                 "pity_4star": 0,
                 "total_pulls": 0,
@@ -80,8 +75,7 @@ class Gacha(commands.Cog):
                 "total_columbina": 0,
                 "total_qiqi": 0,
                 "guaranteed": False
-            }
-            save_data(data)
+            })
         
         embed = discord.Embed(
             title="🔄 기원 기록 초기화",
@@ -105,9 +99,7 @@ class Gacha(commands.Cog):
         await ctx.send(embed=embed)
     
     async def _do_gacha(self, user_id, num_pulls, display_name):
-        data = load_data()
-        
-        user_data = data["gacha_pity"].get(user_id, {})
+        user_data = get_gacha_pity(user_id) or {}
         pity_5star = user_data.get("pity_5star", 0)
         pity_4star = user_data.get("pity_4star", 0)
         total_pulls = user_data.get("total_pulls", 0)
@@ -187,9 +179,7 @@ class Gacha(commands.Cog):
                 count_3star += 1
         
         # 데이터 저장
-        if user_id not in data["gacha_pity"]:
-            data["gacha_pity"][user_id] = {}
-        data["gacha_pity"][user_id].update({
+        set_gacha_pity(user_id, {
             "pity_5star": pity_5star,
             "pity_4star": pity_4star,
             "total_pulls": total_pulls,
@@ -198,7 +188,6 @@ class Gacha(commands.Cog):
             "total_qiqi": total_qiqi,
             "guaranteed": guaranteed
         })
-        save_data(data)
         
         # 결과 그리드: 모든 뽑기를 5개씩 동그라미로 나열 (5성이 어디서 떴는지 한눈에)
         display_str = ""
@@ -281,8 +270,7 @@ class Gacha(commands.Cog):
             embed.set_footer(text="데이터가 초기화되었습니다. 다시 1회부터 시작할 수 있습니다.")
 
             # 데이터 초기화
-            del data["gacha_pity"][user_id]
-            save_data(data)
+            delete_gacha_pity(user_id)
             
             return embed
 
@@ -6,6 +6,7 @@ import discord
 from discord.ext import commands
 from discord import ui
 import aiohttp
+from utils import governor
 from utils.honeyhunter import (
     fetch_character_list, fetch_character_detail,
     fetch_weapon_list, fetch_weapon_detail,
@@ -144,7 +145,7 @@ class GenshinInfo(commands.Cog):
 
     async def _get_session(self) -> aiohttp.ClientSession:
         if not hasattr(self.bot, '_hh_session') or self.bot._hh_session.closed:
-            self.bot._hh_session = aiohttp.ClientSession()
+            self.bot._hh_session = aiohttp.ClientSession(trace_configs=[governor.trace_config()])
         return self.bot._hh_session
 
     async def _ensure_char_cache(self):
@@ -1,13 +1,13 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
-import aiohttp
+import asyncio
 import hashlib
 import json
 import os
-from utils.config import SENT_HAKUSHIN_FILE
-from utils.data import load_guild_settings
-from utils import nanoka
+from utils.config import SENT_HAKUSHIN_FILE, POLL_JOBS
+from cogs.settings import get_notify_index
+from utils import adaptive, catalog, dispatch, nanoka, scheduler
 
 # 표시용 게임 메타데이터. 데이터 자체는 nanoka manifest.json 한 방으로 가져온다.
 GAME_CONFIGS = {
@@ -26,10 +26,28 @@ class HakushinNotify(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.cache = self._load_cache()
-        self.check_updates.start()
+        self._prefetch_tasks: set[asyncio.Task] = set()
+        # 마지막으로 해시를 비교한 manifest generation (None = 아직 비교 안 함 → 시작 후 첫 확인은 항상 비교)
+        self._compared_generation = None
+        scheduler.register("hakushin", self.check_updates, before=self.before_check_updates,
+                           reschedule=lambda: adaptive.next_in(["nanoka:manifest"]), **POLL_JOBS["hakushin"])
 
     def cog_unload(self):
-        self.check_updates.cancel()
+        scheduler.unregister("hakushin")
+        for task in self._prefetch_tasks:
+            task.cancel()
+
+    async def _schedule_prefetch(self, game_key: str, new_block: dict):
+        """신규 항목 상세를 백그라운드로 데이터 캐시에 미리 받는다 (폴링/알림은 기다리지 않음)."""
+        version = await nanoka.get_version(game_key)
+        if not version or not new_block:
+            return
+        running = nanoka.prefetch_stats().get(game_key)
+        if running and running["running"] and running["version"] == version:
+            return
+        task = asyncio.create_task(nanoka.prefetch_new(game_key, version, new_block))
+        self._prefetch_tasks.add(task)
+        task.add_done_callback(self._prefetch_tasks.discard)
 
     def _load_cache(self) -> dict:
         """저장된 해시 캐시 로드"""
@@ -48,9 +66,9 @@ class HakushinNotify(commands.Cog):
         with open(SENT_HAKUSHIN_FILE, 'w', encoding='utf-8') as f:
             json.dump(self.cache, f, ensure_ascii=False, indent=2)
 
-    async def _fetch_new_block(self, session, game_key: str) -> tuple[dict | None, str]:
-        """manifest 에서 해당 게임의 new 블록과 그 해시를 반환."""
-        manifest = await nanoka.fetch_manifest(session)
+    async def _fetch_new_block(self, game_key: str, manifest: dict | None = None) -> tuple[dict | None, str]:
+        """manifest(없으면 캐시된 것)에서 해당 게임의 new 블록과 그 해시를 반환."""
+        manifest = manifest or await nanoka.fetch_manifest()
         if not manifest:
             return None, ""
         new_block = manifest.get(game_key, {}).get("new")
@@ -58,52 +76,75 @@ class HakushinNotify(commands.Cog):
             return None, ""
         return new_block, _hash_new(new_block)
 
-    @tasks.loop(minutes=30)
     async def check_updates(self):
+        # 적응형 간격: 다음 실행은 reschedule 이 차례 시각으로 잡는다. 간격이 그새 늘었으면 건너뜀
+        if not adaptive.due("nanoka:manifest"):
+            return
+        adaptive.mark_polled("nanoka:manifest")
         print("[Nanoka] 업데이트 확인 중...")
-        # manifest 는 fetch_manifest 내부에서 캐싱되므로 1회만 실제 요청됨
-        async with aiohttp.ClientSession() as session:
-            # 매 루프마다 최신 manifest 를 강제로 한 번 받아온다
-            await nanoka.fetch_manifest(session, force=True)
-
-            for game_key, config in GAME_CONFIGS.items():
-                try:
-                    new_block, new_hash = await self._fetch_new_block(session, game_key)
-                    if new_block is None:
-                        continue
-
-                    old_hash = self.cache["hashes"].get(game_key, "")
-
-                    if new_hash != old_hash and old_hash != "":
-                        print(f"[Nanoka] {config['name']} 업데이트 감지! ({old_hash[:8]} → {new_hash[:8]})")
-                        await self._send_notification(game_key, config, new_block)
-
-                    self.cache["hashes"][game_key] = new_hash
-                except Exception as e:
-                    print(f"[Nanoka] {config['name']} 확인 실패: {e}")
-
+        # 매 루프마다 최신 manifest 를 한 번 확인한다 (조건부 GET).
+        # 지난번에 비교한 본문과 같은 generation 이면 해시 비교/알림을 건너뛴다.
+        # (새 본문을 검색·상태 명령이 먼저 받아 갔어도 generation 은 올라가 있으므로 놓치지 않는다)
+        manifest, generation = await nanoka.refresh_manifest()
+        if not manifest:
+            print("[Nanoka] manifest 없음 — 확인 생략")
+            return
+        if generation == self._compared_generation:
+            print("[Nanoka] manifest 변경 없음 — 확인 생략")
+            return
+        # 데이터 버전이 바뀐 게임의 이름 색인(캐릭터/무기/성유물 목록)을 다시 만든다
+        await catalog.refresh()
+
+        updated = failed = False
+        for game_key, config in GAME_CONFIGS.items():
+            try:
+                new_block, new_hash = await self._fetch_new_block(game_key, manifest)
+                if new_block is None:
+                    continue
+
+                old_hash = self.cache["hashes"].get(game_key, "")
+
+                if new_hash != old_hash and old_hash != "":
+                    print(f"[Nanoka] {config['name']} 업데이트 감지! ({old_hash[:8]} → {new_hash[:8]})")
+                    await self._schedule_prefetch(game_key, new_block)
+                    await self._send_notification(game_key, config, new_block)
+                    updated = True
+
+                self.cache["hashes"][game_key] = new_hash
+            except Exception as e:
+                failed = True
+                print(f"[Nanoka] {config['name']} 확인 실패: {e}")
+
+        # 실패한 게임이 있으면 같은 본문이라도 다음 회차에 다시 비교한다
+        if not failed:
+            self._compared_generation = generation
+        if updated:
+            adaptive.record_publish("nanoka:manifest")
         self._save_cache()
         print("[Nanoka] 업데이트 확인 완료")
 
-    @check_updates.before_loop
     async def before_check_updates(self):
         await self.bot.wait_until_ready()
 
         # 초기 해시 로드 (처음이면 현재 해시 저장 → 봇 시작 직후 알림 폭탄 방지)
         if not any(self.cache["hashes"].values()):
             print("[Nanoka] 초기 해시 로딩 중...")
-            async with aiohttp.ClientSession() as session:
-                for game_key in GAME_CONFIGS:
-                    _, new_hash = await self._fetch_new_block(session, game_key)
-                    if new_hash:
-                        self.cache["hashes"][game_key] = new_hash
-                        print(f"[Nanoka] {GAME_CONFIGS[game_key]['name']}: {new_hash[:8]}")
+            for game_key in GAME_CONFIGS:
+                _, new_hash = await self._fetch_new_block(game_key)
+                if new_hash:
+                    self.cache["hashes"][game_key] = new_hash
+                    print(f"[Nanoka] {GAME_CONFIGS[game_key]['name']}: {new_hash[:8]}")
             self._save_cache()
             print("[Nanoka] 초기 해시 로딩 완료")
 
+        # 재시작 후에도 현재 버전 신규 항목이 캐시에 있는지 확인하고, 빠진 것만 받는다
+        for game_key in GAME_CONFIGS:
+            new_block, _ = await self._fetch_new_block(game_key)
+            if new_block:
+                await self._schedule_prefetch(game_key, new_block)
+
     async def _send_notification(self, game_key: str, config: dict, new_block: dict):
         """업데이트 알림 전송"""
-        guild_settings = load_guild_settings()
         site = nanoka.site_url(game_key)
 
         embed = discord.Embed(
@@ -148,17 +189,8 @@ class HakushinNotify(commands.Cog):
 
         embed.set_footer(text="nanoka.cc 데이터 기반 • 30분마다 체크")
 
-        sent_count = 0
-        for guild_id, settings in guild_settings.items():
-            channel_id = settings.get("hakushin_update")
-            if channel_id:
-                try:
-                    channel = self.bot.get_channel(int(channel_id))
-                    if channel:
-                        await channel.send(embed=embed)
-                        sent_count += 1
-                except Exception as e:
-                    print(f"[Nanoka] 알림 전송 실패 (guild {guild_id}): {e}")
+        channel_ids = get_notify_index().channels("hakushin_update")
+        sent_count = await dispatch.fan_out(self.bot, channel_ids, embed=embed, tag="Nanoka")
 
         print(f"[Nanoka] {config['name']} 알림 {sent_count}개 채널에 전송")
 
@@ -168,18 +200,17 @@ class HakushinNotify(commands.Cog):
             description="현재 저장된 해시와 최신 해시를 비교합니다.",
             color=0x5865F2,
         )
-        async with aiohttp.ClientSession() as session:
-            await nanoka.fetch_manifest(session, force=True)
-            for game_key, config in GAME_CONFIGS.items():
-                saved_hash = (self.cache["hashes"].get(game_key) or "없음")[:8]
-                _, current_hash = await self._fetch_new_block(session, game_key)
-                current_hash = current_hash[:8] if current_hash else "오류"
-                status = "✅ 동일" if saved_hash == current_hash else "🔄 변경됨"
-                embed.add_field(
-                    name=f"{config['emoji']} {config['name']}",
-                    value=f"저장: `{saved_hash}`\n현재: `{current_hash}`\n상태: {status}",
-                    inline=True,
-                )
+        await nanoka.fetch_manifest(force=True)
+        for game_key, config in GAME_CONFIGS.items():
+            saved_hash = (self.cache["hashes"].get(game_key) or "없음")[:8]
+            _, current_hash = await self._fetch_new_block(game_key)
+            current_hash = current_hash[:8] if current_hash else "오류"
+            status = "✅ 동일" if saved_hash == current_hash else "🔄 변경됨"
+            embed.add_field(
+                name=f"{config['emoji']} {config['name']}",
+                value=f"저장: `{saved_hash}`\n현재: `{current_hash}`\n상태: {status}",
+                inline=True,
+            )
         embed.set_footer(text="30분마다 자동 체크됩니다")
         return embed
 
@@ -50,6 +50,7 @@ def build_help_embed(is_admin: bool) -> discord.Embed:
         embed.add_field(
             name="🔧 관리 · 진단 (관리자)",
             value="`!업데이트상태` — nanoka 업데이트 상태\n"
+                  "`!봇상태` — 폴링·네트워크 내부 상태\n"
                   "`!커뮤확인 게임명` — 커뮤니티 최근 글\n"
                   "`!영상확인 게임명` — 유튜브 최근 영상",
             inline=False,
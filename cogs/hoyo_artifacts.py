@@ -2,17 +2,13 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import re
-import aiohttp
-from cogs.hoyo_shared import Game, GAME_COLORS, GAME_URLS, clean_description, HoyoSelectView, GameSelectView
+from cogs.hoyo_shared import Game, GAME_COLORS, GAME_URLS, clean_description, HoyoSelectView, GameSelectView, search_catalog, autocomplete_choices
 from utils import nanoka
 
 
 class HoyoArtifacts(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self._artifact_cache_gi = {}
-        self._artifact_cache_hsr = {}
-        self._artifact_cache_zzz = {}
 
     def _get_artifact_term(self, game: Game) -> str:
         if game == Game.HSR:
@@ -45,67 +41,8 @@ class HoyoArtifacts(commands.Cog):
 
         return re.sub(r'#(\d+)\[([^\]]+)\](%?)', replace_placeholder, desc)
 
-    @staticmethod
-    def _gi_set_name(art_data: dict) -> str | None:
-        set_data = art_data.get('set', {})
-        first = next(iter(set_data.values()), {})
-        nm = first.get('name', {})
-        return nm.get('ko') or nm.get('en')
-
-    async def _load_all_artifact_caches(self):
-        targets = [
-            ("gi", self._artifact_cache_gi),
-            ("hsr", self._artifact_cache_hsr),
-            ("zzz", self._artifact_cache_zzz),
-        ]
-        async with aiohttp.ClientSession() as session:
-            for game_key, cache in targets:
-                if cache:
-                    continue
-                try:
-                    version = await nanoka.get_version(session, game_key)
-                    if not version:
-                        continue
-                    async with session.get(nanoka.artifact_list_url(game_key, version)) as resp:
-                        if resp.status != 200:
-                            continue
-                        data = await resp.json()
-                    if not isinstance(data, dict):
-                        continue
-                    for art_id, art_data in data.items():
-                        if not isinstance(art_data, dict):
-                            continue
-                        name = None
-                        if game_key == "gi":
-                            name = self._gi_set_name(art_data)
-                        elif game_key == "hsr":
-                            name = art_data.get('ko') or art_data.get('en')
-                        elif game_key == "zzz":
-                            ko = art_data.get('ko', {})
-                            name = ko.get('name') if isinstance(ko, dict) else None
-                        if name:
-                            cache[name.lower()] = str(art_id)
-                except Exception as e:
-                    print(f"[{game_key}] 성유물 캐시 로드 실패: {e}")
-
     async def _search_artifact_all_games(self, name: str) -> list:
-        await self._load_all_artifact_caches()
-        name_lower = name.lower()
-        results = []
-
-        for art_name, art_id in self._artifact_cache_gi.items():
-            if name_lower in art_name or art_name in name_lower:
-                results.append({"game": Game.GI, "game_name": "원신", "name": art_name, "id": art_id})
-                break
-        for art_name, art_id in self._artifact_cache_hsr.items():
-            if name_lower in art_name or art_name in name_lower:
-                results.append({"game": Game.HSR, "game_name": "스타레일", "name": art_name, "id": art_id})
-                break
-        for art_name, art_id in self._artifact_cache_zzz.items():
-            if name_lower in art_name or art_name in name_lower:
-                results.append({"game": Game.ZZZ, "game_name": "젠레스 존 제로", "name": art_name, "id": art_id})
-                break
-        return results
+        return await search_catalog("artifact", name)
 
     def _extract_set_effects(self, game: Game, art_data: dict, fallback_name: str | None):
         """게임별로 (이름, 2세트효과, 4세트효과, 아이콘url) 추출."""
@@ -160,16 +97,14 @@ class HoyoArtifacts(commands.Cog):
             await interaction.followup.send(**kwargs)
 
         try:
-            async with aiohttp.ClientSession() as session:
-                version = await nanoka.get_version(session, game_key)
-                if not version:
-                    await send_msg(content=f"❌ {artifact_term} 정보를 가져올 수 없어요. (버전 조회 실패)")
-                    return
-                async with session.get(nanoka.artifact_list_url(game_key, version)) as resp:
-                    if resp.status != 200:
-                        await send_msg(content=f"❌ {artifact_term} 정보를 가져올 수 없어요.")
-                        return
-                    all_data = await resp.json()
+            version = await nanoka.get_version(game_key)
+            if not version:
+                await send_msg(content=f"❌ {artifact_term} 정보를 가져올 수 없어요. (버전 조회 실패)")
+                return
+            all_data = await nanoka.fetch_json(nanoka.artifact_list_url(game_key, version))
+            if all_data is None:
+                await send_msg(content=f"❌ {artifact_term} 정보를 가져올 수 없어요.")
+                return
 
             art_data = all_data.get(str(artifact_id))
             if not art_data:
@@ -210,24 +145,22 @@ class HoyoArtifacts(commands.Cog):
     async def _show_new_artifacts(self, interaction: discord.Interaction, game: Game, game_name: str):
         game_key = GAME_URLS.get(game, "gi")
         try:
-            async with aiohttp.ClientSession() as session:
-                manifest = await nanoka.fetch_manifest(session)
-                if not manifest:
-                    await interaction.followup.send("❌ 신규 데이터를 가져올 수 없어요.")
-                    return
-                game_block = manifest.get(game_key, {})
-                version = game_block.get("latest")
-                artifact_ids = game_block.get("new", {}).get(nanoka.ARTIFACT_ENDPOINT[game_key], [])
-
-                if not artifact_ids:
-                    await interaction.followup.send(f"❌ {game_name} 출시 예정 {self._get_artifact_term(game)}이 없어요.")
-                    return
-
-                async with session.get(nanoka.artifact_list_url(game_key, version)) as resp:
-                    if resp.status != 200:
-                        await interaction.followup.send("❌ 성유물 목록을 가져올 수 없어요.")
-                        return
-                    all_data = await resp.json()
+            manifest = await nanoka.fetch_manifest()
+            if not manifest:
+                await interaction.followup.send("❌ 신규 데이터를 가져올 수 없어요.")
+                return
+            game_block = manifest.get(game_key, {})
+            version = game_block.get("latest")
+            artifact_ids = game_block.get("new", {}).get(nanoka.ARTIFACT_ENDPOINT[game_key], [])
+
+            if not artifact_ids:
+                await interaction.followup.send(f"❌ {game_name} 출시 예정 {self._get_artifact_term(game)}이 없어요.")
+                return
+
+            all_data = await nanoka.fetch_json(nanoka.artifact_list_url(game_key, version))
+            if all_data is None:
+                await interaction.followup.send("❌ 성유물 목록을 가져올 수 없어요.")
+                return
 
             from types import SimpleNamespace
             artifacts = []
@@ -288,13 +221,17 @@ class HoyoArtifacts(commands.Cog):
             r = results[0]
             await self._show_artifact_detail_by_id(interaction, r["id"], r["game"], r["game_name"], r["name"])
         else:
-            embed = discord.Embed(title=f"🎮 '{name}' - 게임 선택", description="여러 게임에서 항목을 찾았어요:", color=0x5865F2)
+            embed = discord.Embed(title=f"🔍 '{name}' - 검색 결과", description="비슷한 이름을 여러 개 찾았어요:", color=0x5865F2)
             for r in results:
                 embed.add_field(name=r["game_name"], value=r["name"], inline=True)
             view = HoyoSelectView(self, results, results[0]["game"], results[0]["game_name"], 'artifact')
             msg = await interaction.followup.send(embed=embed, view=view)
             view.message = msg
 
+    @slash_artifact.autocomplete("name")
+    async def artifact_name_autocomplete(self, interaction: discord.Interaction, current: str):
+        return autocomplete_choices("artifact", current)
+
     @commands.command(name="성유물", aliases=["유물", "장비", "디스크"])
     async def artifact(self, ctx, *, name: str = None):
         if not name:
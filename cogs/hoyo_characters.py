@@ -1,9 +1,10 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
+import asyncio
 import re
-import aiohttp
-from cogs.hoyo_shared import Game, GAME_COLORS, GAME_URLS, clean_description, HoyoSelectView, GameSelectView
+from types import SimpleNamespace
+from cogs.hoyo_shared import Game, GAME_COLORS, GAME_URLS, clean_description, HoyoSelectView, GameSelectView, search_catalog, autocomplete_choices
 from utils import nanoka
 
 # 속성 한글화 (GI element / HSR damage_type 공용)
@@ -52,9 +53,6 @@ class HoyoCharacters(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self._char_cache_gi = {}
-        self._char_cache_hsr = {}
-        self._char_cache_zzz = {}
 
     # ─── 레어도 ─────────────────────────────────────────
     def _parse_rarity(self, game: Game, value) -> int:
@@ -87,53 +85,8 @@ class HoyoCharacters(commands.Cog):
             bits = [_first_value(data.get('element_type')), _first_value(data.get('weapon_type'))]
         return "  ·  ".join(str(b) for b in bits if b)
 
-    # ─── 이름→ID 캐시 ───────────────────────────────────
-    async def _load_all_char_caches(self):
-        targets = [
-            ("gi", self._char_cache_gi),
-            ("hsr", self._char_cache_hsr),
-            ("zzz", self._char_cache_zzz),
-        ]
-        async with aiohttp.ClientSession() as session:
-            for game_key, cache in targets:
-                if cache:
-                    continue
-                try:
-                    version = await nanoka.get_version(session, game_key)
-                    if not version:
-                        continue
-                    async with session.get(nanoka.char_list_url(game_key, version)) as resp:
-                        if resp.status != 200:
-                            continue
-                        data = await resp.json()
-                    if not isinstance(data, dict):
-                        continue
-                    for cid, cdata in data.items():
-                        if not isinstance(cdata, dict):
-                            continue
-                        name = cdata.get('ko') or cdata.get('en')
-                        if name:
-                            cache[name.lower()] = str(cid)
-                except Exception as e:
-                    print(f"[{game_key}] 캐릭터 캐시 로드 실패: {e}")
-
     async def _search_character_all_games(self, name: str) -> list:
-        await self._load_all_char_caches()
-        name_lower = name.lower()
-        results = []
-        for char_name, char_id in self._char_cache_gi.items():
-            if name_lower in char_name or char_name in name_lower:
-                results.append({"game": Game.GI, "game_name": "원신", "name": char_name, "id": char_id})
-                break
-        for char_name, char_id in self._char_cache_hsr.items():
-            if name_lower in char_name or char_name in name_lower:
-                results.append({"game": Game.HSR, "game_name": "스타레일", "name": char_name, "id": char_id})
-                break
-        for char_name, char_id in self._char_cache_zzz.items():
-            if name_lower in char_name or char_name in name_lower:
-                results.append({"game": Game.ZZZ, "game_name": "젠레스 존 제로", "name": char_name, "id": char_id})
-                break
-        return results
+        return await search_catalog("character", name)
 
     # ─── 상세 임베드 ─────────────────────────────────────
     def _build_embeds(self, game: Game, char_id, data: dict, game_name: str) -> list:
@@ -344,14 +297,10 @@ class HoyoCharacters(commands.Cog):
         return bool(name) and not placeholder
 
     async def _fetch_char_detail(self, game_key: str, char_id):
-        async with aiohttp.ClientSession() as session:
-            version = await nanoka.get_version(session, game_key)
-            if not version:
-                return None
-            async with session.get(nanoka.char_detail_url(game_key, version, char_id)) as resp:
-                if resp.status != 200:
-                    return None
-                return await resp.json()
+        version = await nanoka.get_version(game_key)
+        if not version:
+            return None
+        return await nanoka.fetch_json(nanoka.char_detail_url(game_key, version, char_id))
 
     async def _show_character_detail_by_id(self, interaction, char_id, game: Game, game_name: str):
         async def send_func(content=None, embeds=None):
@@ -376,45 +325,40 @@ class HoyoCharacters(commands.Cog):
     async def _show_new_characters(self, interaction: discord.Interaction, game: Game, game_name: str):
         game_key = GAME_URLS.get(game, "gi")
         try:
-            async with aiohttp.ClientSession() as session:
-                manifest = await nanoka.fetch_manifest(session)
-                if not manifest:
-                    await interaction.followup.send("❌ 신규 데이터를 가져올 수 없어요.")
-                    return
-                game_block = manifest.get(game_key, {})
-                version = game_block.get("latest")
-                char_ids = game_block.get("new", {}).get(nanoka.NEW_CHAR_KEY, [])
-                if not char_ids:
-                    await interaction.followup.send(f"❌ {game_name} 출시 예정 캐릭터가 없어요.")
-                    return
-
-                # 기존(Fix) 캐릭터 판별용 목록 (출시일/이름)
-                char_list = {}
-                try:
-                    async with session.get(nanoka.char_list_url(game_key, version)) as resp:
-                        if resp.status == 200:
-                            char_list = await resp.json()
-                except Exception:
-                    pass
-
-                from types import SimpleNamespace
-                chars = []
-                for cid in char_ids[:10]:
-                    url = nanoka.char_detail_url(game_key, version, cid)
-                    try:
-                        async with session.get(url) as resp:
-                            if resp.status != 200:
-                                continue
-                            d = await resp.json()
-                        c = SimpleNamespace()
-                        c.id = cid
-                        c.name = d.get('name') or f"{cid}"
-                        c.rarity = self._parse_rarity(game, d.get('rarity'))
-                        c.meta = self._char_meta(game, d)
-                        c.is_fix = self._is_existing_char(game, char_list.get(str(cid), {}))
-                        chars.append(c)
-                    except Exception:
-                        pass
+            manifest = await nanoka.fetch_manifest()
+            if not manifest:
+                await interaction.followup.send("❌ 신규 데이터를 가져올 수 없어요.")
+                return
+            game_block = manifest.get(game_key, {})
+            version = game_block.get("latest")
+            char_ids = game_block.get("new", {}).get(nanoka.NEW_CHAR_KEY, [])
+            if not char_ids:
+                await interaction.followup.send(f"❌ {game_name} 출시 예정 캐릭터가 없어요.")
+                return
+
+            # 기존(Fix) 캐릭터 판별용 목록(출시일/이름)과 상세 JSON 을 동시에 받는다 (공동 마감 안에 온 것만 표시)
+            shown_ids = char_ids[:10]
+            char_list, details = await asyncio.gather(
+                nanoka.fetch_json(nanoka.char_list_url(game_key, version)),
+                nanoka.fetch_many([nanoka.char_detail_url(game_key, version, cid) for cid in shown_ids]),
+            )
+            char_list = char_list or {}
+
+            chars = []
+            for cid, d in zip(shown_ids, details):
+                if not isinstance(d, dict):
+                    continue
+                c = SimpleNamespace()
+                c.id = cid
+                c.name = d.get('name') or f"{cid}"
+                c.rarity = self._parse_rarity(game, d.get('rarity'))
+                c.meta = self._char_meta(game, d)
+                c.is_fix = self._is_existing_char(game, char_list.get(str(cid), {}))
+                chars.append(c)
+            missing = len(shown_ids) - len(chars)
+            if not chars:
+                await interaction.followup.send(f"❌ {game_name} 출시 예정 정보를 불러올 수 없어요.")
+                return
 
             color = GAME_COLORS.get(game, 0xFFD700)
             has_fix = any(getattr(c, 'is_fix', False) for c in chars)
@@ -433,7 +377,10 @@ class HoyoCharacters(commands.Cog):
                     val += f"  ·  {meta}"
                 tag = "  `[Fix]`" if getattr(c, 'is_fix', False) else ""
                 embed.add_field(name=f"{i+1}.  {c.name}{tag}", value=val, inline=False)
-            embed.set_footer(text="데이터 출처 · nanoka.cc")
+            footer = "데이터 출처 · nanoka.cc"
+            if missing:
+                footer += f" · {missing}명은 정보를 불러오지 못했어요"
+            embed.set_footer(text=footer)
             view = HoyoSelectView(self, chars, game, game_name, 'character')
             msg = await interaction.followup.send(embed=embed, view=view)
             view.message = msg
@@ -467,13 +414,17 @@ class HoyoCharacters(commands.Cog):
             r = results[0]
             await self._show_character_detail_by_id(interaction, r["id"], r["game"], r["game_name"])
         else:
-            embed = discord.Embed(title=f"🎮 '{char_name}' - 게임 선택", description="여러 게임에서 캐릭터를 찾았어요:", color=0x5865F2)
+            embed = discord.Embed(title=f"🔍 '{char_name}' - 검색 결과", description="비슷한 이름의 캐릭터를 여러 명 찾았어요:", color=0x5865F2)
             for r in results:
                 embed.add_field(name=r["game_name"], value=r["name"], inline=True)
             view = HoyoSelectView(self, results, results[0]["game"], results[0]["game_name"], 'character')
             msg = await interaction.followup.send(embed=embed, view=view)
             view.message = msg
 
+    @slash_character.autocomplete("char_name")
+    async def char_name_autocomplete(self, interaction: discord.Interaction, current: str):
+        return autocomplete_choices("character", current)
+
     @commands.command(name="캐릭터")
     async def character(self, ctx, *, name: str = None):
         if not name:
@@ -1,6 +1,9 @@
 import discord
+from discord import app_commands
 from discord.ui import View, Select
 import re
+from utils import catalog
+from utils.search import EXACT, PREFIX
 
 # Import Enums from hakushin if available, else define them?
 # The bot seems to require hakushin, so we keep using it for Enums to minimize breakage.
@@ -28,6 +31,40 @@ GAME_URLS = {
     Game.HSR: "hsr",
     Game.ZZZ: "zzz"
 }
+GAME_BY_KEY = {key: game for game, key in GAME_URLS.items()}
+GAME_NAMES_KO = {Game.GI: "원신", Game.HSR: "스타레일", Game.ZZZ: "젠레스 존 제로"}
+# 자동완성 선택값: "{게임}:{id}"
+_AUTOCOMPLETE_VALUE = re.compile(r"([a-z]+):(\w+)")
+
+
+async def search_catalog(kind: str, query: str) -> list:
+    """세 게임 이름 색인에서 찾은 후보 → [{"game", "game_name", "name", "id"}] (순위순).
+
+    자동완성에서 고른 값("gi:10000089")이면 검색 없이 그 항목 하나만 돌려준다.
+    완전/앞부분 일치가 있으면 그 등급만 돌려준다 (하나뿐이면 바로 상세 화면으로 간다).
+    없으면 부분 일치·오타 허용 후보를 함께 보여 준다.
+    """
+    await catalog.refresh()
+    token = _AUTOCOMPLETE_VALUE.fullmatch(query.strip())
+    if token and token.group(1) in GAME_BY_KEY:
+        name = catalog.name_of(kind, token.group(1), token.group(2))
+        hits = [{"game": token.group(1), "id": token.group(2), "name": name, "tier": EXACT}] if name else []
+    else:
+        hits = catalog.search(kind, query)
+    if hits and hits[0]["tier"] >= PREFIX:
+        hits = [hit for hit in hits if hit["tier"] == hits[0]["tier"]]
+    return [{"game": GAME_BY_KEY[hit["game"]], "game_name": GAME_NAMES_KO[GAME_BY_KEY[hit["game"]]],
+             "name": hit["name"], "id": hit["id"]} for hit in hits]
+
+
+def autocomplete_choices(kind: str, current: str) -> list:
+    """슬래시 명령 자동완성 후보. 메모리 색인만 보므로 키 입력마다 불려도 네트워크 요청이 없다."""
+    return [
+        app_commands.Choice(name=f"{hit['name']} · {GAME_NAMES_KO[GAME_BY_KEY[hit['game']]]}"[:100],
+                            value=f"{hit['game']}:{hit['id']}")
+        for hit in catalog.complete(kind, current)
+    ]
+
 
 # ZZZ 스킬 아이콘 태그 -> 이모지
 ICONMAP_EMOJI = {
@@ -142,7 +179,7 @@ class HoyoSelectView(View):
                 description=f"{gname}에서 결과 확인"
             ))
             
-        select = Select(placeholder="게임을 선택해주세요", options=options[:25])
+        select = Select(placeholder="항목을 선택해주세요", options=options[:25])
         select.callback = self.select_callback
         self.add_item(select)
     
@@ -1,9 +1,9 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import aiohttp
 import re
-from cogs.hoyo_shared import Game, GAME_COLORS, GAME_URLS, clean_description, HoyoSelectView, GameSelectView
+from types import SimpleNamespace
+from cogs.hoyo_shared import Game, GAME_COLORS, GAME_URLS, clean_description, HoyoSelectView, GameSelectView, search_catalog, autocomplete_choices
 from utils import nanoka
 
 
@@ -27,9 +27,6 @@ class HoyoWeapons(commands.Cog):
 
     def __init__(self, bot):
         self.bot = bot
-        self._weapon_cache_gi = {}
-        self._weapon_cache_hsr = {}
-        self._weapon_cache_zzz = {}
 
     def _get_weapon_term(self, game: Game) -> str:
         if game == Game.HSR:
@@ -49,58 +46,8 @@ class HoyoWeapons(commands.Cog):
                 return int(m.group())
         return 4
 
-    async def _load_all_weapon_caches(self):
-        """게임별 무기/광추 이름→ID 캐시 로드 (nanoka 목록 JSON 기반)."""
-        targets = [
-            ("gi", self._weapon_cache_gi),
-            ("hsr", self._weapon_cache_hsr),
-            ("zzz", self._weapon_cache_zzz),
-        ]
-        async with aiohttp.ClientSession() as session:
-            for game_key, cache in targets:
-                if cache:
-                    continue
-                try:
-                    version = await nanoka.get_version(session, game_key)
-                    if not version:
-                        continue
-                    async with session.get(nanoka.weapon_list_url(game_key, version)) as resp:
-                        if resp.status != 200:
-                            continue
-                        data = await resp.json()
-                    if not isinstance(data, dict):
-                        continue
-                    for k, v in data.items():
-                        name = v.get('ko') or v.get('en')
-                        if not name:
-                            continue
-                        if game_key == "zzz":
-                            name = name.replace("Item_Weapon_", "").replace("_Name", "").replace("_", " ")
-                        cache[name.lower()] = str(k)
-                except Exception as e:
-                    print(f"[{game_key}] 무기 캐시 로드 실패: {e}")
-
     async def _search_weapon_all_games(self, name: str) -> list:
-        await self._load_all_weapon_caches()
-        name_lower = name.lower()
-        results = []
-
-        for weapon_name, weapon_id in self._weapon_cache_gi.items():
-            if name_lower in weapon_name or weapon_name in name_lower:
-                results.append({"game": Game.GI, "game_name": "원신", "name": weapon_name, "id": weapon_id})
-                break
-
-        for weapon_name, weapon_id in self._weapon_cache_hsr.items():
-            if name_lower in weapon_name or weapon_name in name_lower:
-                results.append({"game": Game.HSR, "game_name": "스타레일", "name": weapon_name, "id": weapon_id})
-                break
-
-        for weapon_name, weapon_id in self._weapon_cache_zzz.items():
-            if name_lower in weapon_name or weapon_name in name_lower:
-                results.append({"game": Game.ZZZ, "game_name": "젠레스 존 제로", "name": weapon_name, "id": weapon_id})
-                break
-
-        return results
+        return await search_catalog("weapon", name)
 
     def _weapon_type_label(self, game: Game, data: dict) -> str | None:
         """상세 데이터에서 종류/운명의 길/특성 라벨(한글) 추출."""
@@ -158,18 +105,16 @@ class HoyoWeapons(commands.Cog):
             await interaction.followup.send(**kwargs)
 
         try:
-            async with aiohttp.ClientSession() as session:
-                version = await nanoka.get_version(session, game_key)
-                if not version:
-                    await send_msg(content=f"❌ {weapon_term} 정보를 가져올 수 없어요. (버전 조회 실패)")
-                    return
-
-                url = nanoka.weapon_detail_url(game_key, version, weapon_id)
-                async with session.get(url) as resp:
-                    if resp.status != 200:
-                        await send_msg(content=f"❌ {weapon_term} 상세 정보를 가져올 수 없어요.")
-                        return
-                    data = await resp.json()
+            version = await nanoka.get_version(game_key)
+            if not version:
+                await send_msg(content=f"❌ {weapon_term} 정보를 가져올 수 없어요. (버전 조회 실패)")
+                return
+
+            url = nanoka.weapon_detail_url(game_key, version, weapon_id)
+            data = await nanoka.fetch_json(url)
+            if data is None:
+                await send_msg(content=f"❌ {weapon_term} 상세 정보를 가져올 수 없어요.")
+                return
 
             name = data.get('name') or f"Unknown {weapon_id}"
             if game == Game.ZZZ and "Item_Weapon_" in name:
@@ -218,60 +163,62 @@ class HoyoWeapons(commands.Cog):
     async def _show_new_weapons(self, interaction: discord.Interaction, game: Game, game_name: str):
         game_key = GAME_URLS.get(game, "gi")
         try:
-            async with aiohttp.ClientSession() as session:
-                manifest = await nanoka.fetch_manifest(session)
-                if not manifest:
-                    await interaction.followup.send("❌ 신규 데이터를 가져올 수 없어요.")
-                    return
-
-                game_block = manifest.get(game_key, {})
-                version = game_block.get("latest")
-                weapon_ids = game_block.get("new", {}).get(nanoka.WEAPON_ENDPOINT[game_key], [])
-
-                if not weapon_ids:
-                    await interaction.followup.send(f"❌ {game_name} 출시 예정 무기가 없어요.")
-                    return
-
-                weapons = []
-                for wid in weapon_ids[:10]:
-                    url = nanoka.weapon_detail_url(game_key, version, wid)
-                    try:
-                        async with session.get(url) as resp:
-                            if resp.status != 200:
-                                continue
-                            d = await resp.json()
-                        from types import SimpleNamespace
-                        w = SimpleNamespace()
-                        w.id = wid
-                        w.name = d.get('name') or f"{wid}"
-                        if game == Game.ZZZ:
-                            w.name = w.name.replace("Item_Weapon_", "").replace("_Name", "").replace("_", " ")
-                        w.rarity = self._parse_rarity(d.get('rarity'))
-                        w._type_str = self._weapon_type_label(game, d) or "?"
-                        weapons.append(w)
-                    except Exception:
-                        pass
-
-                color = GAME_COLORS.get(game, 0x87CEEB)
-                weapon_term = self._get_weapon_term(game)
-
-                embed = discord.Embed(
-                    title=f"⚔️ {game_name} · 출시 예정 {weapon_term}",
-                    description=f"버전 {version or '?'} · 총 {len(weapon_ids)}개 · 아래 버튼으로 상세 정보를 확인하세요",
-                    color=color,
-                )
-
-                for i, weapon in enumerate(weapons):
-                    val = f"⭐ {getattr(weapon, 'rarity', 4)}성"
-                    t = getattr(weapon, '_type_str', '')
-                    if t and t != '?':
-                        val += f"  ·  {t}"
-                    embed.add_field(name=f"{i+1}.  {weapon.name}", value=val, inline=False)
-                embed.set_footer(text="데이터 출처 · nanoka.cc")
-
-                view = HoyoSelectView(self, weapons, game, game_name, 'weapon')
-                msg = await interaction.followup.send(embed=embed, view=view)
-                view.message = msg
+            manifest = await nanoka.fetch_manifest()
+            if not manifest:
+                await interaction.followup.send("❌ 신규 데이터를 가져올 수 없어요.")
+                return
+
+            game_block = manifest.get(game_key, {})
+            version = game_block.get("latest")
+            weapon_ids = game_block.get("new", {}).get(nanoka.WEAPON_ENDPOINT[game_key], [])
+
+            if not weapon_ids:
+                await interaction.followup.send(f"❌ {game_name} 출시 예정 무기가 없어요.")
+                return
+
+            # 상세 JSON 은 동시에 받는다 (공동 마감 안에 온 것만 표시)
+            shown_ids = weapon_ids[:10]
+            details = await nanoka.fetch_many([nanoka.weapon_detail_url(game_key, version, wid) for wid in shown_ids])
+            weapons = []
+            for wid, d in zip(shown_ids, details):
+                if not isinstance(d, dict):
+                    continue
+                w = SimpleNamespace()
+                w.id = wid
+                w.name = d.get('name') or f"{wid}"
+                if game == Game.ZZZ:
+                    w.name = w.name.replace("Item_Weapon_", "").replace("_Name", "").replace("_", " ")
+                w.rarity = self._parse_rarity(d.get('rarity'))
+                w._type_str = self._weapon_type_label(game, d) or "?"
+                weapons.append(w)
+            missing = len(shown_ids) - len(weapons)
+            if not weapons:
+                await interaction.followup.send(f"❌ {game_name} 출시 예정 정보를 불러올 수 없어요.")
+                return
+
+            color = GAME_COLORS.get(game, 0x87CEEB)
+            weapon_term = self._get_weapon_term(game)
+
+            embed = discord.Embed(
+                title=f"⚔️ {game_name} · 출시 예정 {weapon_term}",
+                description=f"버전 {version or '?'} · 총 {len(weapon_ids)}개 · 아래 버튼으로 상세 정보를 확인하세요",
+                color=color,
+            )
+
+            for i, weapon in enumerate(weapons):
+                val = f"⭐ {getattr(weapon, 'rarity', 4)}성"
+                t = getattr(weapon, '_type_str', '')
+                if t and t != '?':
+                    val += f"  ·  {t}"
+                embed.add_field(name=f"{i+1}.  {weapon.name}", value=val, inline=False)
+            footer = "데이터 출처 · nanoka.cc"
+            if missing:
+                footer += f" · {missing}개는 정보를 불러오지 못했어요"
+            embed.set_footer(text=footer)
+
+            view = HoyoSelectView(self, weapons, game, game_name, 'weapon')
+            msg = await interaction.followup.send(embed=embed, view=view)
+            view.message = msg
         except Exception as e:
             await interaction.followup.send(f"❌ 오류 발생: {e}")
 
@@ -301,13 +248,17 @@ class HoyoWeapons(commands.Cog):
             r = results[0]
             await self._show_weapon_detail_by_id(interaction, r["id"], r["game"], r["game_name"])
         else:
-            embed = discord.Embed(title=f"🎮 '{name}' - 게임 선택", description="여러 게임에서 무기를 찾았어요:", color=0x5865F2)
+            embed = discord.Embed(title=f"🔍 '{name}' - 검색 결과", description="비슷한 이름의 무기를 여러 개 찾았어요:", color=0x5865F2)
             for r in results:
                 embed.add_field(name=r["game_name"], value=r["name"], inline=True)
             view = HoyoSelectView(self, results, results[0]["game"], results[0]["game_name"], 'weapon')
             msg = await interaction.followup.send(embed=embed, view=view)
             view.message = msg
 
+    @slash_weapon.autocomplete("name")
+    async def weapon_name_autocomplete(self, interaction: discord.Interaction, current: str):
+        return autocomplete_choices("weapon", current)
+
     @commands.command(name="무기", aliases=["광추"])
     async def weapon(self, ctx, *, name: str = None):
         if not name:
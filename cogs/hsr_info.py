@@ -6,6 +6,7 @@ import discord
 from discord.ext import commands
 from discord import ui
 import aiohttp
+from utils import governor
 from utils.prydwen_hsr import (
     fetch_character_list, fetch_character_detail,
     fetch_lightcone_list, fetch_lightcone_detail,
@@ -101,7 +102,7 @@ class HSRInfo(commands.Cog):
 
     async def _get_session(self) -> aiohttp.ClientSession:
         if not hasattr(self.bot, '_prydwen_session') or self.bot._prydwen_session.closed:
-            self.bot._prydwen_session = aiohttp.ClientSession()
+            self.bot._prydwen_session = aiohttp.ClientSession(trace_configs=[governor.trace_config()])
         return self.bot._prydwen_session
 
     async def _ensure_char_cache(self):
@@ -1,85 +1,116 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 import aiohttp
+import asyncio
 import re
 from bs4 import BeautifulSoup
-from utils.config import HOYO_GAME_CONFIGS, WUWA_CONFIG, ENDFIELD_CONFIG
-from utils.data import load_sent_codes, save_sent_codes, get_channels_for_type
-from cogs.settings import get_guild_settings
+from utils.config import (
+    HOYO_GAME_CONFIGS, WUWA_CONFIG, ENDFIELD_CONFIG,
+    REDEEM_SOURCE_DEADLINE, REDEEM_SOURCE_DEADLINES, POLL_JOBS, DISPATCH_MESSAGE_LIMIT,
+)
+from utils.data import load_sent_codes, add_sent_codes
+from utils import adaptive, breaker, conditional, dispatch, scheduler, warmstart
+from cogs.settings import get_notify_index
 
 _loaded_codes = load_sent_codes()
 already_sent_codes = {game: _loaded_codes.get(game, set()) for game in HOYO_GAME_CONFIGS}
 already_sent_codes["wuwa"] = _loaded_codes.get("wuwa", set())
 already_sent_codes["endfield"] = _loaded_codes.get("endfield", set())
 
-async def fetch_hoyo_codes(api_url):
+# 코드 목록 받기 실패. 빈 리스트(활성 코드 0개, 정상 응답)나 None(304, 변경 없음)과 구분한다.
+FETCH_FAILED = object()
+
+async def fetch_hoyo_codes(api_url, *, source=None, use_validators=False):
+    """코드 목록을 가져온다. use_validators=True 이고 서버가 304 를 주면 None (변경 없음), 실패하면 FETCH_FAILED.
+    
+    source 를 주면 결과를 그 소스의 차단기(utils/breaker.py)에 기록한다.
+    """
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(api_url, timeout=aiohttp.ClientTimeout(total=30)) as resp:
-                if resp.status != 200:
-                    print(f"코드 가져오기 실패: HTTP {resp.status}")
-                    return []
-                data = await resp.json()
-                return data.get("codes", [])
+        async with conditional.get(api_url, source=source, use_validators=use_validators) as resp:
+            if resp.status == conditional.NOT_MODIFIED:
+                if source:
+                    breaker.success(source)
+                return None
+            if resp.status != 200:
+                print(f"코드 가져오기 실패: HTTP {resp.status}")
+                if source:
+                    breaker.failure(source, f"HTTP {resp.status}")
+                return FETCH_FAILED
+            data = await resp.json()
+        if source:
+            breaker.success(source)
+        return data.get("codes", [])
     except aiohttp.ClientError as e:
         print(f"네트워크 오류: {e}")
-        return []
+        if source:
+            breaker.failure(source, e)
+        return FETCH_FAILED
     except Exception as e:
         print(f"코드 가져오기 중 예외 발생: {e}")
-        return []
+        if source:
+            breaker.failure(source, e)
+        return FETCH_FAILED
 
 async def fetch_wuwa_codes():
     # 명조(WuWa)는 현재 실시간 코드를 제공하는 사이트가 없어 비활성화함.
     # (기존 wutheringwaves 위키가 403으로 차단되어 로그를 도배 → 네트워크 요청 자체를 제거)
-    # 추후 안정적인 소스가 생기면 여기서 다시 구현하면 됨.
+    # 추후 안정적인 소스가 생기면 여기서 다시 구현하면 됨. 다른 소스처럼 breaker.success / failure 를
+    # 기록하면 다시 막혀도 차단기가 요청을 멈춰 준다.
     return []
 
-async def fetch_endfield_codes():
+async def fetch_endfield_codes(*, use_validators=False):
+    """Game8 페이지에서 코드를 긁어온다. use_validators=True 이고 304 면 None (변경 없음), 실패하면 FETCH_FAILED."""
     try:
-        async with aiohttp.ClientSession() as session:
-            headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"}
-            async with session.get(ENDFIELD_CONFIG["url"], timeout=aiohttp.ClientTimeout(total=30), headers=headers) as resp:
-                if resp.status != 200:
-                    print(f"엔드필드 코드 가져오기 실패: HTTP {resp.status}")
-                    return []
-                html = await resp.text()
-                soup = BeautifulSoup(html, 'lxml')
-                
-                codes = []
-                # Game8 structure: Use all elements with class 'a-clipboard__textInput'
-                # These inputs contain the code value.
-                inputs = soup.find_all('input', class_='a-clipboard__textInput')
-                
-                for inp in inputs:
-                    code = inp.get('value', '').strip()
-                    if code and len(code) > 3:
-                        # Try to find rewards in the same table row if possible
-                        # Game8 tables usually have Code in one cell and Reward in another.
-                        reward = "출시 기념 보상"
-                        try:
-                            # Search for reward text in the neighboring cells
-                            parent_td = inp.find_parent('td')
-                            if parent_td:
-                                row = parent_td.find_parent('tr')
-                                if row:
-                                    cells = row.find_all('td')
-                                    if len(cells) >= 2:
-                                        # Usually Reward is in the second or third cell
-                                        reward_text = cells[1].get_text(strip=True)
-                                        if reward_text and reward_text != code:
-                                            reward = reward_text
-                        except:
-                            pass
-                            
-                        codes.append({
-                            "code": code,
-                            "rewards": reward
-                        })
-                
-                return codes
+        headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"}
+        async with conditional.get(ENDFIELD_CONFIG["url"], source="redeem:endfield",
+                                   use_validators=use_validators, headers=headers) as resp:
+            if resp.status == conditional.NOT_MODIFIED:
+                breaker.success("redeem:endfield")
+                return None
+            if resp.status != 200:
+                print(f"엔드필드 코드 가져오기 실패: HTTP {resp.status}")
+                breaker.failure("redeem:endfield", f"HTTP {resp.status}")
+                return FETCH_FAILED
+            html = await resp.text()
+            breaker.success("redeem:endfield")
+            soup = BeautifulSoup(html, 'lxml')
+            
+            codes = []
+            # Game8 structure: Use all elements with class 'a-clipboard__textInput'
+            # These inputs contain the code value.
+            inputs = soup.find_all('input', class_='a-clipboard__textInput')
+            
+            for inp in inputs:
+                code = inp.get('value', '').strip()
+                if code and len(code) > 3:
+                    # Try to find rewards in the same table row if possible
+                    # Game8 tables usually have Code in one cell and Reward in another.
+                    reward = "출시 기념 보상"
+                    try:
+                        # Search for reward text in the neighboring cells
+                        parent_td = inp.find_parent('td')
+                        if parent_td:
+                            row = parent_td.find_parent('tr')
+                            if row:
+                                cells = row.find_all('td')
+                                if len(cells) >= 2:
+                                    # Usually Reward is in the second or third cell
+                                    reward_text = cells[1].get_text(strip=True)
+                                    if reward_text and reward_text != code:
+                                        reward = reward_text
+                    except:
+                        pass
+                        
+                    codes.append({
+                        "code": code,
+                        "rewards": reward
+                    })
+            
+            return codes
     except Exception as e:
         print(f"엔드필드 코드 가져오기 중 예외 발생: {e}")
-        return []
+        breaker.failure("redeem:endfield", e)
+        return FETCH_FAILED
 
 def extract_currency_amount(reward, currency_keyword, currency_name):
     if not reward:
@@ -103,177 +134,205 @@ def extract_currency_amount(reward, currency_keyword, currency_name):
     
     return None
 
+def source_config(source_key):
+    if source_key == "wuwa":
+        return WUWA_CONFIG
+    if source_key == "endfield":
+        return ENDFIELD_CONFIG
+    return HOYO_GAME_CONFIGS[source_key]
+
+def format_code_message(source_key, item):
+    """소스별 알림 메시지 형식."""
+    code = item.get("code")
+    config = source_config(source_key)
+    currency_info = extract_currency_amount(
+        item.get("rewards", ""),
+        config["currency_keyword"],
+        config["currency_name"]
+    )
+
+    if source_key == "wuwa":
+        msg = f"🎁 {code}"
+    elif source_key == "endfield":
+        msg = f"🎁 **{config['name']}**\n코드: `{code}`"
+    else:
+        redeem_url = f"{config['redeem_url']}{code}"
+        msg = f"🎁 [{code}](<{redeem_url}>)"
+
+    if currency_info:
+        msg += f" - {currency_info}"
+    return msg
+
+def build_code_messages(source_keys, new_codes):
+    """한 채널에 보낼 새 코드들을 메시지 하나로 묶는다. 길이 제한을 넘을 때만 여러 개로 나눈다.
+    
+    source_keys: 이 채널이 구독한 소스 (순서대로), new_codes: source_key -> 새 코드 item 목록.
+    소스가 둘 이상이면 게임 이름 줄을 앞에 붙여 구분한다.
+    """
+    lines = []
+    for source_key in source_keys:
+        if len(source_keys) > 1 and source_key != "endfield":
+            lines.append(f"**{source_config(source_key)['name']}**")
+        lines.extend(format_code_message(source_key, item) for item in new_codes[source_key])
+
+    messages, current = [], ""
+    for line in lines:
+        if current and len(current) + 1 + len(line) > DISPATCH_MESSAGE_LIMIT:
+            messages.append(current)
+            current = ""
+        current = f"{current}\n{line}" if current else line
+    if current:
+        messages.append(current)
+    return messages
+
 class Redeem(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.check_codes.start()
+        scheduler.register("redeem", self.check_codes, before=self.before_check_codes,
+                           reschedule=self._next_poll_in, **POLL_JOBS["redeem"])
     
     def cog_unload(self):
-        self.check_codes.cancel()
+        scheduler.unregister("redeem")
+    
+    def _next_poll_in(self):
+        """구독 채널이 있는 소스 중 가장 먼저 차례가 오는 소스까지 남은 초 (스케줄러 다음 실행 시각)."""
+        notify_index = get_notify_index()
+        keys = [*HOYO_GAME_CONFIGS, "wuwa", "endfield"]
+        return adaptive.next_in(f"redeem:{key}" for key in keys if notify_index.has(key))
     
-    @tasks.loop(minutes=5)
     async def check_codes(self):
-        global already_sent_codes
-        codes_updated = False
-        guild_settings = get_guild_settings()
-        
-        for game_key, config in HOYO_GAME_CONFIGS.items():
-            channels = get_channels_for_type(guild_settings, game_key)
-            if not channels:
-                continue
+        # 모든 소스를 동시에 받는다. 소스마다 마감이 따로 있어서 느린 소스(Game8 등)가
+        # 주기 전체를 붙잡지 않는다. 새 코드는 주기 끝에 채널별로 묶어서 한 번에 보낸다.
+        notify_index = get_notify_index()
+        sources = [
+            (game_key, lambda c=config, g=game_key: fetch_hoyo_codes(c["api_url"], source=f"redeem:{g}", use_validators=True))
+            for game_key, config in HOYO_GAME_CONFIGS.items()
+        ]
+        sources.append(("wuwa", fetch_wuwa_codes))
+        sources.append(("endfield", lambda: fetch_endfield_codes(use_validators=True)))
 
-            codes = await fetch_hoyo_codes(config["api_url"])
-            if not codes:
+        jobs = []
+        for source_key, fetch in sources:
+            # 구독 채널이 없는 소스는 요청 자체를 보내지 않는다
+            if not notify_index.has(source_key):
+                adaptive.forget(f"redeem:{source_key}")
                 continue
+            # 소스별 적응형 간격: 이번 회차는 차례가 된 소스만 (다른 소스 차례라서 깨어났을 수 있다)
+            if not adaptive.due(f"redeem:{source_key}"):
+                continue
+            # 계속 실패 중인 소스는 차단기가 열려 있는 동안 요청하지 않는다
+            if not breaker.allow(f"redeem:{source_key}"):
+                continue
+            adaptive.mark_polled(f"redeem:{source_key}")
+            jobs.append(self._poll_source(source_key, fetch))
+        if not jobs:
+            return
 
-            new_list = []
-
-            for item in codes:
-                code = item.get("code")
-                if not code:
-                    continue
-
-                if code not in already_sent_codes[game_key]:
-                    already_sent_codes[game_key].add(code)
-                    new_list.append(item)
-                    codes_updated = True
-
-            for item in new_list:
-                code = item.get("code")
-                reward = item.get("rewards", "")
-
-                currency_info = extract_currency_amount(
-                    reward, 
-                    config["currency_keyword"], 
-                    config["currency_name"]
-                )
-
-                redeem_url = f"{config['redeem_url']}{code}"
-                
-                if currency_info:
-                    msg = f"🎁 [{code}](<{redeem_url}>) - {currency_info}"
-                else:
-                    msg = f"🎁 [{code}](<{redeem_url}>)"
-
-                for channel_id in channels:
-                    channel = self.bot.get_channel(channel_id)
-                    if channel:
-                        try:
-                            await channel.send(msg)
-                        except Exception as e:
-                            print(f"채널 {channel_id}에 메시지 전송 실패: {e}")
-
-            if new_list:
-                print(f"[{config['name']}] 새 코드 전송:", [c.get("code") for c in new_list])
-
-        wuwa_channels = get_channels_for_type(guild_settings, "wuwa")
-        if wuwa_channels:
-            codes = await fetch_wuwa_codes()
-            
-            new_list = []
-            for item in codes:
-                code = item.get("code")
-                if not code:
-                    continue
+        results = await asyncio.gather(*jobs, return_exceptions=True)
+        new_codes = {}
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"[리딤코드] 소스 처리 중 예외: {result}")
+            elif result[1]:
+                new_codes[result[0]] = result[1]
+        if not new_codes:
+            warmstart.flush()
+            return
 
-                if code not in already_sent_codes["wuwa"]:
-                    already_sent_codes["wuwa"].add(code)
-                    new_list.append(item)
-                    codes_updated = True
+        await self._send_batched(new_codes, notify_index)
+        # 새 코드 저장은 주기 끝에 한 번만
+        add_sent_codes({key: [item.get("code") for item in items] for key, items in new_codes.items()})
+        warmstart.flush()
 
-            for item in new_list:
-                code = item.get("code")
-                reward = item.get("rewards", "")
+    async def _send_batched(self, new_codes, notify_index):
+        """채널마다 이번 주기의 새 코드를 메시지 하나(길면 몇 개)로 보낸다.
+        
+        같은 소스 조합을 구독한 채널끼리는 메시지가 같으므로 묶어서 fan-out 한다.
+        코드 3개 × 게임 3개 × 500개 길드여도 전송 수는 채널 수에 비례한다.
+        """
+        channel_sources = {}
+        for source_key in new_codes:
+            for channel_id in notify_index.channels(source_key):
+                channel_sources.setdefault(int(channel_id), []).append(source_key)
 
-                currency_info = extract_currency_amount(
-                    reward, 
-                    WUWA_CONFIG["currency_keyword"], 
-                    WUWA_CONFIG["currency_name"]
-                )
+        groups = {}
+        for channel_id, source_keys in channel_sources.items():
+            groups.setdefault(tuple(source_keys), []).append(channel_id)
 
-                msg = f"🎁 {code}"
-                if currency_info:
-                    msg += f" - {currency_info}"
+        jobs = []
+        for source_keys, channels in groups.items():
+            for content in build_code_messages(source_keys, new_codes):
+                jobs.append(dispatch.fan_out(self.bot, channels, content=content, tag="리딤코드"))
+        sent = sum(await asyncio.gather(*jobs))
+        total = sum(len(items) for items in new_codes.values())
+        print(f"[리딤코드] 새 코드 {total}개 → 채널 {len(channel_sources)}개, 메시지 {sent}건 전송")
 
-                for channel_id in wuwa_channels:
-                    channel = self.bot.get_channel(channel_id)
-                    if channel:
-                        try:
-                            await channel.send(msg)
-                        except Exception as e:
-                            print(f"채널 {channel_id}에 메시지 전송 실패: {e}")
+    async def _poll_source(self, source_key, fetch):
+        """소스 하나를 마감 안에 받아서 새 코드를 골라낸다. 반환: (source_key, 새 코드 item 목록)."""
+        deadline = REDEEM_SOURCE_DEADLINES.get(source_key, REDEEM_SOURCE_DEADLINE)
+        try:
+            codes = await asyncio.wait_for(fetch(), timeout=deadline)
+        except asyncio.TimeoutError:
+            print(f"[리딤코드] {source_key} 응답 지연({deadline}초 초과) — 이번 주기 건너뜀")
+            breaker.failure(f"redeem:{source_key}", f"{deadline}초 초과")
+            return source_key, []
+        if codes is FETCH_FAILED:
+            return source_key, []
+        # 304 또는 정상 응답 (활성 코드 0개여도 정상)
+        warmstart.touch(f"redeem:{source_key}")
+        if not codes:
+            # None = 304 (변경 없음), [] = 활성 코드 없음 → 파싱/중복확인/전송 모두 생략
+            return source_key, []
 
-            if new_list:
-                print(f"[{WUWA_CONFIG['name']}] 새 코드 전송:", [c.get("code") for c in new_list])
-        
-        # === Arknights: Endfield ===
-        endfield_channels = get_channels_for_type(guild_settings, "endfield")
-        if endfield_channels:
-            codes = await fetch_endfield_codes()
-            new_list = []
-            for item in codes:
-                code = item.get("code")
-                if not code: continue
-                if code not in already_sent_codes["endfield"]:
-                    already_sent_codes["endfield"].add(code)
-                    new_list.append(item)
-                    codes_updated = True
-            
-            for item in new_list:
-                code = item.get("code")
-                reward = item.get("rewards", "")
-                currency_info = extract_currency_amount(
-                    reward, 
-                    ENDFIELD_CONFIG["currency_keyword"], 
-                    ENDFIELD_CONFIG["currency_name"]
-                )
-                msg = f"🎁 **{ENDFIELD_CONFIG['name']}**\n코드: `{code}`"
-                if currency_info:
-                    msg += f" - {currency_info}"
-                
-                for channel_id in endfield_channels:
-                    channel = self.bot.get_channel(channel_id)
-                    if channel:
-                        try:
-                            await channel.send(msg)
-                        except Exception as e:
-                            print(f"엔드필드 알림 전송 실패: {e}")
-            if new_list:
-                print(f"[{ENDFIELD_CONFIG['name']}] 새 코드 전송:", [c.get("code") for c in new_list])
+        new_list = []
+        for item in codes:
+            code = item.get("code")
+            if not code:
+                continue
+            if code not in already_sent_codes[source_key]:
+                already_sent_codes[source_key].add(code)
+                new_list.append(item)
+        if not new_list:
+            return source_key, []
 
-        if codes_updated:
-            save_sent_codes(already_sent_codes)
+        adaptive.record_publish(f"redeem:{source_key}")
+        print(f"[{source_config(source_key)['name']}] 새 코드:", [c.get("code") for c in new_list])
+        return source_key, new_list
     
-    @check_codes.before_loop
     async def before_check_codes(self):
         global already_sent_codes
         await self.bot.wait_until_ready()
         
-        print("[리딤코드] 기존 코드 초기화 중...")
+        # 최근까지 정상 확인했던 소스는 DB 의 보낸 코드 목록을 그대로 쓰고 바로 시작한다
+        fetchers = {
+            game_key: (lambda c=config, g=game_key: fetch_hoyo_codes(c["api_url"], source=f"redeem:{g}"))
+            for game_key, config in HOYO_GAME_CONFIGS.items()
+        }
+        # 명조는 소스가 비활성(fetch_wuwa_codes 참고)이라 시딩할 것도, warm/cold 를 따질 것도 없다
+        fetchers["endfield"] = fetch_endfield_codes
+        cold = [source[len("redeem:"):] for source in warmstart.cold_sources(f"redeem:{key}" for key in fetchers)]
+        if not cold:
+            print("[리딤코드] 최근 상태가 남아 있어 초기화 생략 (warm start)")
+            return
         
-        for game_key, config in HOYO_GAME_CONFIGS.items():
-            codes = await fetch_hoyo_codes(config["api_url"])
+        print(f"[리딤코드] 기존 코드 초기화 중... ({', '.join(cold)})")
+        results = await asyncio.gather(*(fetchers[key]() for key in cold), return_exceptions=True)
+        
+        for game_key, codes in zip(cold, results):
+            if isinstance(codes, Exception) or codes is FETCH_FAILED:
+                print(f"  [{source_config(game_key)['name']}] 기존 코드 가져오기 실패"
+                      + (f": {codes}" if isinstance(codes, Exception) else ""))
+                continue
+            codes = codes or []
             for item in codes:
                 code = item.get("code")
                 if code:
                     already_sent_codes[game_key].add(code)
-            print(f"  [{config['name']}] 기존 코드 {len(codes)}개 등록")
-        
-        wuwa_codes = await fetch_wuwa_codes()
-        for item in wuwa_codes:
-            code = item.get("code")
-            if code:
-                already_sent_codes["wuwa"].add(code)
-        print(f"  [{WUWA_CONFIG['name']}] 기존 코드 {len(wuwa_codes)}개 등록")
-        
-        endfield_codes = await fetch_endfield_codes()
-        for item in endfield_codes:
-            code = item.get("code")
-            if code:
-                already_sent_codes["endfield"].add(code)
-        print(f"  [{ENDFIELD_CONFIG['name']}] 기존 코드 {len(endfield_codes)}개 등록")
+            warmstart.touch(f"redeem:{game_key}")
+            print(f"  [{source_config(game_key)['name']}] 기존 코드 {len(codes)}개 등록")
         
-        save_sent_codes(already_sent_codes)
+        add_sent_codes(already_sent_codes)
+        warmstart.flush()
         print("[리딤코드] 초기화 완료! 이후 새 코드만 알림됩니다.")
 
 async def setup(bot):
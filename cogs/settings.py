@@ -2,13 +2,18 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 from utils.config import NOTIFY_TYPES
-from utils.data import load_guild_settings, save_guild_settings
+from utils.data import load_guild_settings, set_guild_notify, delete_guild_notify, NotifyIndex
 
 guild_settings = load_guild_settings()
+# 알림 종류 -> 채널 역색인. guild_settings 를 고치는 곳에서 같이 고친다.
+notify_index = NotifyIndex(guild_settings)
 
 def get_guild_settings():
     return guild_settings
 
+def get_notify_index():
+    return notify_index
+
 class NotifyTypeSelect(discord.ui.Select):
     def __init__(self, channel_id):
         self.channel_id = channel_id
@@ -60,12 +65,12 @@ class NotifyTypeSelect(discord.ui.Select):
         
         for notify_type in selected:
             guild_settings[guild_id][notify_type] = self.channel_id
+            notify_index.set(guild_id, notify_type, self.channel_id)
+            set_guild_notify(guild_id, notify_type, self.channel_id)
             if notify_type in NOTIFY_TYPES:
                 info = NOTIFY_TYPES[notify_type]
                 added.append(f"{info['emoji']} {info['name']}")
         
-        save_guild_settings(guild_settings)
-        
         embed = discord.Embed(
             title="✅ 알림 설정 완료!",
             description=f"<#{self.channel_id}> 채널에 알림이 설정되었어요!",
@@ -112,11 +117,11 @@ class RemoveNotifySelect(discord.ui.Select):
         for notify_type in self.values:
             if notify_type in guild_settings.get(self.guild_id, {}):
                 del guild_settings[self.guild_id][notify_type]
+                notify_index.remove(self.guild_id, notify_type)
+                delete_guild_notify(self.guild_id, notify_type)
                 info = NOTIFY_TYPES[notify_type]
                 removed.append(f"{info['emoji']} {info['name']}")
         
-        save_guild_settings(guild_settings)
-        
         embed = discord.Embed(
             title="🗑️ 알림 해제 완료!",
             description="\n".join(removed) if removed else "해제된 알림이 없어요",
@@ -0,0 +1,179 @@
+import discord
+from discord import app_commands
+from discord.ext import commands
+from utils import adaptive, breaker, conditional, dispatch, governor, nanoka, scheduler, singleflight, warmstart, websub
+from utils.user_store import store as user_store
+from cogs.community import probe_stats
+
+
+def _fmt_bytes(n: int) -> str:
+    if n >= 1024 * 1024:
+        return f"{n / (1024 * 1024):.1f}MB"
+    if n >= 1024:
+        return f"{n / 1024:.1f}KB"
+    return f"{n}B"
+
+
+def build_status_embed() -> discord.Embed:
+    """봇 내부 상태(폴링/캐시 등) 진단 embed."""
+    embed = discord.Embed(
+        title="🩺 봇 상태",
+        description="폴링·네트워크 관련 내부 카운터예요. (봇 재시작 시 초기화)",
+        color=0x5865F2,
+    )
+
+    # 폴링 작업: 다음 실행까지 남은 시간 / 최근 소요 시간 / 건너뛴 회차
+    lines = []
+    for job in scheduler.jobs():
+        next_in = "준비 중" if job["next_in"] is None else f"{job['next_in']:.0f}초 후"
+        running = " · 실행 중" if job["running"] else ""
+        interval = "적응형" if job["adaptive"] else f"{job['interval']:.0f}초"
+        lines.append(f"`{job['name']}` {next_in}{running} · 간격 {interval} · "
+                     f"최근 {job['last_duration']:.1f}초 · {job['runs']}회 (건너뜀 {job['overruns']}, 오류 {job['failures']})")
+    embed.add_field(name="⏱️ 폴링 작업", value="\n".join(lines) or "등록된 작업이 없어요.", inline=False)
+
+    # 시작 방식: 최근 상태로 바로 시작(warm) / 다시 시딩(cold)
+    modes = warmstart.start_modes()
+    if modes:
+        cold = sorted(source for source, mode in modes.items() if mode == "cold")
+        value = f"warm {len(modes) - len(cold)}개 · cold {len(cold)}개"
+        if cold:
+            value += "\n" + ", ".join(f"`{source}`" for source in cold)
+        embed.add_field(name="🔥 시작 방식", value=value[:1024], inline=False)
+
+    # WebSub 푸시: 구독 확인된 채널은 안전망 폴링만 한다
+    push = websub.stats()
+    if push["enabled"]:
+        last = "없음" if push["last_push_ago"] is None else f"{push['last_push_ago'] / 60:.0f}분 전"
+        embed.add_field(
+            name="📨 유튜브 푸시 (WebSub)",
+            value=f"푸시 수신 {push['live']}/{push['channels']}개 채널 · 알림 {push['pushes']}건 (마지막 {last})\n"
+                  f"서명 불일치 {push['rejected']}건 · 구독 요청 {push['requests']}회 (실패 {push['failed_requests']})",
+            inline=False,
+        )
+
+    # 커뮤니티 증분 확인: 맨 위 게시물이 그대로면 응답을 끝까지 받지 않는다
+    if probe_stats["requests"]:
+        embed.add_field(
+            name="📰 커뮤니티 변경 확인",
+            value=f"요청 {probe_stats['requests']}회 · 변경 없음 {probe_stats['unchanged']}회 · "
+                  f"이어보기 {probe_stats['continuations']}회 · 받은 양 {_fmt_bytes(probe_stats['bytes_read'])}",
+            inline=False,
+        )
+
+    # 적응형 폴링: 소스별 현재 간격
+    lines = []
+    for src in adaptive.stats():
+        heat = "기록 부족" if src["heat"] is None else f"heat {src['heat']:.1f}"
+        lines.append(f"`{src['source']}` {src['interval'] / 60:.0f}분 간격 · {heat} ({src['events']}건) · "
+                     f"다음 {src['next_in']:.0f}초 후")
+    if lines:
+        embed.add_field(name="📈 적응형 폴링", value="\n".join(lines)[:1024], inline=False)
+
+    # 호스트별 요청 조절: 동시 요청 / 토큰 대기 / 429·503 차단
+    lines = []
+    for host in governor.stats()[:8]:
+        line = (f"`{host['host']}` {host['requests']}회 · 동시 {host['in_flight']}/{host['concurrency']} · "
+                f"대기 {host['waited']}회(평균 {host['avg_wait']:.1f}초)")
+        if host["throttled"] or host["rejected"]:
+            line += f" · 429/503 {host['throttled']}회 · 거절 {host['rejected']}회"
+        if host["blocked_for"]:
+            line += f" · ⛔ {host['blocked_for']:.0f}초 차단 중"
+        lines.append(line)
+    if lines:
+        embed.add_field(name="🚦 호스트별 요청 조절", value="\n".join(lines)[:1024], inline=False)
+
+    # 소스별 차단기: 열린(또는 시험 중인) 소스만 보여준다
+    lines = []
+    for src in breaker.stats():
+        if src["state"] == breaker.CLOSED:
+            continue
+        state = f"⛔ {src['retry_in']:.0f}초 후 재시도" if src["state"] == breaker.OPEN else "🔎 시험 중"
+        lines.append(f"`{src['source']}` {state} · 연속 실패 {src['failures']}회 · 건너뜀 {src['skipped']}회\n"
+                     f"  └ {src['last_error'][:80]}")
+    embed.add_field(name="🔌 소스 차단기", value="\n".join(lines)[:1024] or "모든 소스 정상이에요.", inline=False)
+
+    # 조건부 GET: source 접두사(redeem/youtube/nanoka)별로 묶어서 보여준다
+    groups = {}
+    for source, stat in conditional.stats().items():
+        group = groups.setdefault(source.split(":", 1)[0], {"polls": 0, "not_modified": 0, "saved_bytes": 0})
+        for key in group:
+            group[key] += stat[key]
+    if groups:
+        lines = []
+        for name, stat in sorted(groups.items()):
+            ratio = stat["not_modified"] / stat["polls"] * 100 if stat["polls"] else 0
+            lines.append(f"`{name}` 304 {stat['not_modified']}/{stat['polls']}회 ({ratio:.0f}%) · "
+                         f"절약 ~{_fmt_bytes(stat['saved_bytes'])}")
+        total = conditional.totals()
+        lines.append(f"**합계** 304 {total['not_modified']}/{total['polls']}회")
+        embed.add_field(name="📡 조건부 GET (ETag/Last-Modified)", value="\n".join(lines), inline=False)
+    else:
+        embed.add_field(name="📡 조건부 GET (ETag/Last-Modified)", value="아직 폴링 기록이 없어요.", inline=False)
+
+    # nanoka 데이터 파일 캐시
+    cache = nanoka.data_cache.stats()
+    lookups = cache["hits_memory"] + cache["hits_disk"] + cache["misses"]
+    hit_ratio = (cache["hits_memory"] + cache["hits_disk"]) / lookups * 100 if lookups else 0
+    embed.add_field(
+        name="🗂️ nanoka 캐시",
+        value=f"메모리 {cache['memory_items']}개 · 디스크 {cache['disk_items']}개 ({_fmt_bytes(cache['disk_bytes'])})\n"
+              f"히트 메모리 {cache['hits_memory']} · 디스크 {cache['hits_disk']} · 미스 {cache['misses']} "
+              f"({hit_ratio:.0f}%)",
+        inline=False,
+    )
+
+    # 신규 항목 미리 받기 (manifest 변경 시): 캐시에 있으면 warm
+    prefetch = nanoka.prefetch_stats()
+    if prefetch:
+        lines = []
+        for game_key, state in sorted(prefetch.items()):
+            mode = "warm" if state["warm"] == state["total"] else "cold"
+            extra = " · 받는 중" if state["running"] else (f" · 실패 {state['failed']}" if state["failed"] else "")
+            lines.append(f"`{game_key}` {state['version']} {mode} ({state['warm']}/{state['total']}){extra}")
+        embed.add_field(name="🔥 nanoka 신규 항목 미리 받기", value="\n".join(lines), inline=False)
+
+    # single-flight: 동시에 들어온 같은 요청을 합친 횟수
+    flights = singleflight.stats()
+    if flights:
+        lines = [f"`{name}` {stat['shared']}/{stat['calls']}회 합침" for name, stat in sorted(flights.items())]
+        lines.append(f"진행 중 {singleflight.inflight()}건")
+        embed.add_field(name="🔗 요청 합치기 (single-flight)", value="\n".join(lines), inline=False)
+
+    # 알림 fan-out
+    sends = dispatch.stats()
+    embed.add_field(
+        name="📨 알림 전송",
+        value=f"성공 {sends['sent']} · 실패 {sends['failed']} · 채널 없음 {sends['missing']} · 재시도 {sends['retried']}\n"
+              f"전송 지연 p50 {sends['p50']:.2f}초 · p99 {sends['p99']:.2f}초",
+        inline=False,
+    )
+
+    # 운세/기원 write-behind
+    users = user_store.stats()
+    embed.add_field(
+        name="💾 유저 기록 저장",
+        value=f"대기 {users['pending']}명 · 내려쓰기 {users['flushes']}회 (마지막 {users['last_flush_ms']:.1f}ms)",
+        inline=False,
+    )
+
+    return embed
+
+
+class Status(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+
+    @app_commands.command(name="봇상태", description="폴링/네트워크 내부 상태를 확인해요 (관리자 전용)")
+    @app_commands.default_permissions(administrator=True)
+    async def slash_status(self, interaction: discord.Interaction):
+        await interaction.response.send_message(embed=build_status_embed(), ephemeral=True)
+
+    @commands.command(name="봇상태")
+    @commands.has_permissions(administrator=True)
+    async def status(self, ctx):
+        await ctx.send(embed=build_status_embed())
+
+
+async def setup(bot):
+    await bot.add_cog(Status(bot))
@@ -1,60 +1,109 @@
 import discord
-from discord.ext import commands, tasks
-import aiohttp
+from discord.ext import commands
 import asyncio
-from datetime import datetime
 from xml.etree import ElementTree
-from utils.config import YOUTUBE_CHANNELS
-from utils.data import load_sent_videos, save_sent_videos, get_channels_for_type
-from cogs.settings import get_guild_settings
+from utils.config import YOUTUBE_CHANNELS, POLL_JOBS, WEBSUB_ENABLED
+from utils import adaptive, breaker, conditional, dispatch, scheduler, warmstart, websub
+from utils.dedupe import SentWindow
+from cogs.settings import get_notify_index
 
-sent_videos = load_sent_videos()
+# 보낸 영상 ID (채널별 최근 것만 보관)
+sent_videos = SentWindow("video")
 
-FIXED_MINUTES = [0, 5, 10, 15, 20, 25, 30, 35, 40, 45, 50, 55]
+_ATOM = "{http://www.w3.org/2005/Atom}"
+_YT = "{http://www.youtube.com/xml/schemas/2015}"
+_RSS_CHUNK = 8192
 
-async def get_videos_via_rss(channel_id, max_results=5):
+async def read_rss_feed(channel_id, max_results=5, *, use_validators=False, known=None):
+    """채널 RSS 에서 최근 영상 목록 (실패하면 예외). use_validators=True 이고 피드가 그대로면(304) None.
+    
+    응답을 조각 단위로 읽으면서 바로 파싱한다(XMLPullParser). known(이미 보낸 ID 집합)을 주면
+    피드(최신순)에서 처음으로 아는 영상이 나오는 순간 파싱을 멈추고 그 앞의 새 영상만 돌려준다.
+    남은 바이트는 파싱 없이 흘려 읽는다 (끝까지 읽어야 keep-alive 연결을 다시 쓸 수 있다).
+    """
     rss_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(rss_url, timeout=aiohttp.ClientTimeout(total=30)) as resp:
-                if resp.status != 200:
-                    print(f"[RSS] 실패: {resp.status}")
-                    return []
-                xml_text = await resp.text()
-        
-        root = ElementTree.fromstring(xml_text)
-        ns = {"atom": "http://www.w3.org/2005/Atom", "yt": "http://www.youtube.com/xml/schemas/2015", "media": "http://search.yahoo.com/mrss/"}
+    async with conditional.get(rss_url, source=f"youtube:{channel_id}", use_validators=use_validators) as resp:
+        if resp.status == conditional.NOT_MODIFIED:
+            return None
+        if resp.status != 200:
+            raise RuntimeError(f"HTTP {resp.status}")
         
+        parser = ElementTree.XMLPullParser(events=("end",))
         videos = []
-        for entry in root.findall("atom:entry", ns)[:max_results]:
-            video_id = entry.find("yt:videoId", ns)
-            title = entry.find("atom:title", ns)
-            published = entry.find("atom:published", ns)
-            
-            if video_id is not None:
-                thumbnail_url = f"https://i.ytimg.com/vi/{video_id.text}/hqdefault.jpg"
-                videos.append({
-                    "video_id": video_id.text,
-                    "title": title.text if title is not None else "제목 없음",
-                    "thumbnail": thumbnail_url,
-                    "published_at": published.text if published is not None else ""
-                })
-        return videos
+        done = False
+        async for chunk in resp.content.iter_chunked(_RSS_CHUNK):
+            if done:
+                continue
+            parser.feed(chunk)
+            for _, elem in parser.read_events():
+                if elem.tag != f"{_ATOM}entry":
+                    continue
+                video_id = elem.findtext(f"{_YT}videoId")
+                if video_id is not None:
+                    if known is not None and video_id in known:
+                        done = True
+                        break
+                    videos.append({
+                        "video_id": video_id,
+                        "title": elem.findtext(f"{_ATOM}title", "제목 없음"),
+                        "thumbnail": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+                        "published_at": elem.findtext(f"{_ATOM}published", ""),
+                    })
+                elem.clear()
+                if len(videos) >= max_results:
+                    done = True
+                    break
+        if not done:
+            parser.close()
+    return videos
+
+async def get_videos_via_rss(channel_id, max_results=5, *, use_validators=False, known=None):
+    """read_rss_feed 와 같지만 실패하면 로그만 남기고 [] 를 돌려준다."""
+    try:
+        return await read_rss_feed(channel_id, max_results, use_validators=use_validators, known=known)
     except Exception as e:
         print(f"[RSS] 오류: {e}")
         return []
 
-async def get_latest_videos(channel_id, max_results=5):
+async def get_latest_videos(channel_id, max_results=5, *, use_validators=False, known=None):
     # RSS 모드 강제 사용 (API 비활성화)
-    return await get_videos_via_rss(channel_id, max_results)
+    return await get_videos_via_rss(channel_id, max_results, use_validators=use_validators, known=known)
 
 class YouTube(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.check_youtube.start()
+        # 푸시와 폴링이 같은 영상을 동시에 보내지 않게
+        self._send_lock = asyncio.Lock()
+        scheduler.register("youtube", self.check_youtube, before=self.before_check_youtube,
+                           reschedule=self._next_poll_in, **POLL_JOBS["youtube"])
+    
+    async def cog_load(self):
+        if WEBSUB_ENABLED:
+            # 푸시 설정이 실패해도(포트 사용 중 등) cog 는 살리고 모든 채널을 RSS 폴링으로 확인한다
+            try:
+                await websub.start(self.on_push, [info["channel_id"] for info in YOUTUBE_CHANNELS.values()])
+            except Exception as e:
+                print(f"[유튜브] WebSub 시작 실패 — RSS 폴링만 사용: {e}")
     
-    def cog_unload(self):
-        self.check_youtube.cancel()
+    async def cog_unload(self):
+        scheduler.unregister("youtube")
+        await websub.stop()
+    
+    def _next_poll_in(self):
+        """가장 먼저 차례가 오는 채널까지 남은 초 (스케줄러 다음 실행 시각). 푸시 채널은 안전망 주기 기준."""
+        notify_index = get_notify_index()
+        waits, polled = [], []
+        for yt_key, yt_info in YOUTUBE_CHANNELS.items():
+            if not notify_index.has(yt_key):
+                continue
+            if websub.is_live(yt_info["channel_id"]):
+                waits.append(websub.safety_in(yt_info["channel_id"]))
+            else:
+                polled.append(f"youtube:{yt_key}")
+        wait = adaptive.next_in(polled)
+        if wait is not None:
+            waits.append(wait)
+        return min(waits) if waits else None
     
     @commands.command(name="영상확인", aliases=["RSS테스트"])
     @commands.has_permissions(administrator=True)
@@ -110,43 +159,72 @@ class YouTube(commands.Cog):
         global sent_videos
         video_id = video["video_id"]
         
-        if video_id in sent_videos:
-            return False
-        
-        url = f"https://www.youtube.com/watch?v={video_id}"
-        yt_info = YOUTUBE_CHANNELS[yt_channel_key]
-        guild_settings = get_guild_settings()
-        
-        discord_channels = get_channels_for_type(guild_settings, yt_channel_key)
-        if not discord_channels:
-            return False
-        
-        for channel_id in discord_channels:
-            channel = self.bot.get_channel(channel_id)
-            if channel:
-                await channel.send(f"{yt_info['emoji']} **{yt_info['name']}** 새 영상!\n{url}")
-        
-        sent_videos.add(video_id)
-        save_sent_videos(sent_videos)
-        return True
+        async with self._send_lock:
+            if video_id in sent_videos:
+                return False
+            
+            url = f"https://www.youtube.com/watch?v={video_id}"
+            yt_info = YOUTUBE_CHANNELS[yt_channel_key]
+            discord_channels = get_notify_index().channels(yt_channel_key)
+            if not discord_channels:
+                return False
+            
+            await dispatch.fan_out(self.bot, discord_channels,
+                                   content=f"{yt_info['emoji']} **{yt_info['name']}** 새 영상!\n{url}", tag="유튜브")
+            
+            sent_videos.add(yt_channel_key, [video_id])
+            return True
+    
+    async def on_push(self, channel_id, videos):
+        """WebSub 푸시로 받은 영상 → 폴링과 같은 알림 경로."""
+        for yt_key, yt_info in YOUTUBE_CHANNELS.items():
+            if yt_info["channel_id"] != channel_id:
+                continue
+            for video in videos:
+                if await self.send_youtube_notification(video, yt_key):
+                    print(f"[유튜브] 📨 {yt_info['name']} 푸시로 새 영상: {video['video_id']}")
+                    adaptive.record_publish(f"youtube:{yt_key}")
     
-    @tasks.loop(minutes=1)
     async def check_youtube(self):
         global sent_videos
         
-        current_minute = datetime.now().minute
-        if current_minute not in FIXED_MINUTES:
-            return
-        
-        print(f"[유튜브] 체크 중... ({current_minute}분, RSS 모드)")
-        guild_settings = get_guild_settings()
+        notify_index = get_notify_index()
+        polled = not_modified = 0
         
         for yt_key, yt_info in YOUTUBE_CHANNELS.items():
-            registered_channels = get_channels_for_type(guild_settings, yt_key)
-            if not registered_channels:
+            source = f"youtube:{yt_key}"
+            if not notify_index.has(yt_key):
+                adaptive.forget(source)
+                continue
+            pushed = websub.is_live(yt_info["channel_id"])
+            if pushed:
+                # 푸시로 받고 있는 채널은 가끔 안전망으로만 확인
+                if not websub.safety_due(yt_info["channel_id"]):
+                    continue
+                websub.mark_polled(yt_info["channel_id"])
+            # 채널별 적응형 간격: 이번 회차는 차례가 된 채널만 (다른 채널 차례라서 깨어났을 수 있다)
+            elif not adaptive.due(source):
                 continue
+            # 계속 실패 중인 채널은 차단기가 열려 있는 동안 요청하지 않는다
+            if not breaker.allow(source):
+                continue
+            adaptive.mark_polled(source)
             
-            videos = await get_latest_videos(yt_info["channel_id"], max_results=5)
+            # 이미 보낸 영상이 나오면 거기서 읽기를 멈추고 새 영상만 받는다
+            try:
+                videos = await read_rss_feed(yt_info["channel_id"], max_results=5, use_validators=True,
+                                             known=sent_videos)
+            except Exception as e:
+                print(f"[RSS] {yt_info['name']} 오류: {e}")
+                breaker.failure(source, e)
+                continue
+            breaker.success(source)
+            polled += 1
+            warmstart.touch(source)
+            if videos is None:
+                # 304: 피드 변경 없음 → 파싱/중복확인/전송 생략
+                not_modified += 1
+                continue
             
             for video in reversed(videos):
                 video_id = video["video_id"]
@@ -154,24 +232,37 @@ class YouTube(commands.Cog):
                 if video_id in sent_videos:
                     continue
                 
-                await self.send_youtube_notification(video, yt_key)
-            
-            await asyncio.sleep(1)
+                if await self.send_youtube_notification(video, yt_key):
+                    adaptive.record_publish(source)
+                    if pushed:
+                        websub.mark_missed(yt_info["channel_id"], video)
+        
+        warmstart.flush()
+        if polled:
+            print(f"[유튜브] 체크 완료: {polled}개 채널 중 {not_modified}개 변경 없음(304)")
     
-    @check_youtube.before_loop
     async def before_check_youtube(self):
         global sent_videos
         await self.bot.wait_until_ready()
         
-        print("[유튜브] 기존 영상 캐싱 중... (RSS 모드)")
+        # 최근까지 정상 확인했던 채널은 DB 의 보낸 영상 목록을 그대로 쓰고 바로 시작한다
+        cold = [source.split(":", 1)[1] for source in warmstart.cold_sources(f"youtube:{key}" for key in YOUTUBE_CHANNELS)]
+        if not cold:
+            print("[유튜브] 최근 상태가 남아 있어 초기화 생략 (warm start)")
+            return
         
-        for yt_key, yt_info in YOUTUBE_CHANNELS.items():
-            videos = await get_latest_videos(yt_info["channel_id"], max_results=5)
-            for video in videos:
-                sent_videos.add(video["video_id"])
-            await asyncio.sleep(0.5)
+        print(f"[유튜브] 기존 영상 캐싱 중... (RSS 모드, {len(cold)}개 채널 동시)")
+        results = await asyncio.gather(
+            *(get_latest_videos(YOUTUBE_CHANNELS[key]["channel_id"], max_results=5) for key in cold),
+            return_exceptions=True,
+        )
+        for yt_key, videos in zip(cold, results):
+            if isinstance(videos, Exception) or not videos:
+                continue
+            sent_videos.add(yt_key, [video["video_id"] for video in videos])
+            warmstart.touch(f"youtube:{yt_key}")
+        warmstart.flush()
         
-        save_sent_videos(sent_videos)
         print(f"[유튜브] 초기화 완료. 기존 영상 {len(sent_videos)}개 캐시됨. 이후 새 영상만 알림됩니다.")
 
 async def setup(bot):
@@ -6,6 +6,7 @@ import discord
 from discord.ext import commands
 from discord import ui
 import aiohttp
+from utils import governor
 from utils.prydwen_zzz import (
     fetch_agent_list, fetch_agent_detail,
     fetch_wengine_list, fetch_disk_list,
@@ -55,7 +56,7 @@ class ZZZInfo(commands.Cog):
 
     async def _get_session(self) -> aiohttp.ClientSession:
         if not hasattr(self.bot, '_prydwen_zzz_session') or self.bot._prydwen_zzz_session.closed:
-            self.bot._prydwen_zzz_session = aiohttp.ClientSession()
+            self.bot._prydwen_zzz_session = aiohttp.ClientSession(trace_configs=[governor.trace_config()])
         return self.bot._prydwen_zzz_session
 
     async def _ensure_agent_cache(self):
@@ -4,6 +4,8 @@ import asyncio
 import sys
 import io
 from utils.config import DISCORD_TOKEN
+from utils import catalog, http_client, scheduler, storage, warmstart, websub
+from utils.user_store import store as user_store
 
 # Windows 콘솔 인코딩 설정 (Cursor 터미널에서는 불필요 - 오히려 출력 차단됨)
 # 일반 CMD/PowerShell에서 이모지가 깨질 경우에만 아래 주석 해제
@@ -25,6 +27,7 @@ COGS = [
     "cogs.chatbot",
     "cogs.enka",
     "cogs.help",
+    "cogs.status",             # !봇상태 (폴링/네트워크 진단)
 
     # "cogs.upcoming", # Deprecated
     # ── nanoka.cc 데이터 (구 hakush.in, 사이트 부활) ──
@@ -69,13 +72,28 @@ async def main():
     
     print("🔄 Cog 로딩 중...")
     await load_cogs()
+    # nanoka 이름 색인(9개 목록)을 로그인과 동시에 미리 받아 둔다 → 재시작 후 첫 검색이 기다리지 않음
+    catalog_task = asyncio.create_task(catalog.refresh())
     
     print("🚀 봇 시작 중...")
     try:
         await bot.start(DISCORD_TOKEN)
     except KeyboardInterrupt:
         print("\n⏹️ 봇 종료 중...")
-        await bot.close()
+    finally:
+        # 폴링 작업 정지
+        catalog_task.cancel()
+        await scheduler.stop()
+        # WebSub 콜백 서버 정리 (켜져 있을 때만)
+        await websub.stop()
+        if not bot.is_closed():
+            await bot.close()
+        # 공용 HTTP 세션(keep-alive 풀) 정리
+        await http_client.close_session()
+        # 밀린 운세/기원 기록·폴링 확인 시각을 내려쓰고 SQLite 연결 정리 (WAL 체크포인트)
+        await user_store.flush()
+        warmstart.flush()
+        storage.close()
 
 if __name__ == "__main__":
     try:
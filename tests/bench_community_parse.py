@@ -0,0 +1,146 @@
+"""
+커뮤니티 browse 응답 파싱 벤치마크: 예전 전체 디코드 vs extract_browse_tabs (탭 객체만 raw_decode).
+
+    python tests/bench_community_parse.py                       # 합성 응답으로
+    python tests/bench_community_parse.py resp1.json resp2.json # 녹화한 응답으로
+    python tests/bench_community_parse.py --record UCcum1rCJ5GJeQ_xv0xrohqg genshin.json  # 응답 녹화
+
+두 방식의 결과가 같은지 확인하고, 응답별 평균 파싱 시간과 tracemalloc 최대 메모리를 출력한다.
+"""
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cogs.community import extract_browse_tabs, posts_from_tabs
+
+ROUNDS = 200
+
+
+def legacy_parse(body: bytes) -> list:
+    """예전 방식: resp.json() 처럼 본문 전체를 디코드한 뒤 탭을 찾는다."""
+    data = json.loads(body)
+    tabs = data.get("contents", {}).get("twoColumnBrowseResultsRenderer", {}).get("tabs", [])
+    return posts_from_tabs(tabs)
+
+
+def targeted_parse(body: bytes) -> list:
+    return posts_from_tabs(extract_browse_tabs(body))
+
+
+# ─── 합성 응답 (실제 응답과 비슷한 구조/크기) ──────────────────
+def _runs(n):
+    return {"runs": [{
+        "text": "텍스트 " * random.randint(3, 20),
+        "navigationEndpoint": {
+            "clickTrackingParams": "x" * 60,
+            "commandMetadata": {"webCommandMetadata": {"url": "/x", "webPageType": "WEB_PAGE_TYPE_UNKNOWN", "rootVe": 83769}},
+            "urlEndpoint": {"url": "https://www.youtube.com/redirect?q=" + "y" * 80},
+        },
+    } for _ in range(n)]}
+
+
+def _thumbs():
+    return {"thumbnails": [{"url": "https://yt3.ggpht.com/" + "z" * 120 + f"=s{w}", "width": w, "height": w}
+                           for w in (288, 400, 640, 1080, 1280, 1920)]}
+
+
+def _post(i):
+    post_id = f"Ugkx{i:020d}"
+    return {"backstagePostThreadRenderer": {"post": {"backstagePostRenderer": {
+        "postId": post_id,
+        "authorText": _runs(1),
+        "authorThumbnail": _thumbs(),
+        "contentText": _runs(random.randint(2, 8)),
+        "backstageAttachment": {"backstageImageRenderer": {"image": _thumbs(), "trackingParams": "t" * 40}},
+        "publishedTimeText": {"runs": [{"text": f"{i}일 전"}]},
+        "voteCount": {"accessibility": {"accessibilityData": {"label": "좋아요 1.2천개"}}, "simpleText": "1.2천"},
+        "actionButtons": {"commentActionButtonsRenderer": {"likeButton": {"toggleButtonRenderer": {
+            "defaultIcon": {"iconType": "LIKE"},
+            "defaultServiceEndpoint": {"likeEndpoint": {"status": "LIKE", "target": {"postId": post_id}, "likeParams": "l" * 200}},
+        }}}},
+        "trackingParams": "t" * 40,
+    }}}}
+
+
+def synthetic_response() -> bytes:
+    random.seed(1)
+    tabs = [{"tabRenderer": {"title": title, "endpoint": {"browseEndpoint": {"browseId": "UC", "params": "p" * 30}},
+                             "trackingParams": "t" * 40}}
+            for title in ("홈", "동영상", "Shorts", "라이브", "재생목록")]
+    tabs.append({"tabRenderer": {"title": "게시물", "selected": True, "content": {"sectionListRenderer": {"contents": [
+        {"itemSectionRenderer": {"contents": [_post(i) for i in range(10)] + [
+            {"continuationItemRenderer": {"continuationEndpoint": {"continuationCommand": {"token": "4qmF" + "k" * 300}}}}
+        ]}}
+    ]}}}})
+    data = {
+        "responseContext": {"serviceTrackingParams": [
+            {"service": s, "params": [{"key": f"k{j}", "value": "v" * 50} for j in range(20)]}
+            for s in ("GFEEDBACK", "CSI", "GUIDED_HELP", "ECATCHER")
+        ]},
+        "contents": {"twoColumnBrowseResultsRenderer": {"tabs": tabs}},
+        "header": {"pageHeaderRenderer": {"pageTitle": "원신", "content": {"image": _thumbs(), "banner": _thumbs()}}},
+        "metadata": {"channelMetadataRenderer": {"title": "원신", "description": "설명 " * 200, "avatar": _thumbs(),
+                                                 "availableCountryCodes": ["KR"] * 250}},
+        "topbar": {"desktopTopbarRenderer": {"logo": _thumbs(), "hotkeyDialog": {"sections": [_runs(10) for _ in range(6)]}}},
+        "microformat": {"microformatDataRenderer": {"description": "설명 " * 200, "thumbnail": _thumbs(),
+                                                    "availableCountries": ["KR"] * 250}},
+        "frameworkUpdates": {"entityBatchUpdate": {"mutations": [
+            {"entityKey": f"E{i:040d}", "payload": {"likeState": "TOGGLE_STATE_OFF", "extra": _runs(2)}} for i in range(80)
+        ]}},
+    }
+    return json.dumps(data, ensure_ascii=False).encode()
+
+
+# ─── 측정 ──────────────────────────────────────────────
+def measure(func, body: bytes) -> tuple[float, int]:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        func(body)
+    elapsed = (time.perf_counter() - start) / ROUNDS * 1000
+
+    tracemalloc.start()
+    func(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+async def record(channel_id: str, path: str):
+    """실제 browse 응답을 파일로 저장 (get_community_posts 와 같은 요청)."""
+    from utils import http_client
+    payload = {
+        "context": {"client": {"clientName": "WEB", "clientVersion": "2.20241216.00.00", "hl": "ko", "gl": "KR"}},
+        "browseId": channel_id,
+        "params": "Egljb21tdW5pdHnyBgQKAkoA",
+    }
+    async with http_client.post("https://www.youtube.com/youtubei/v1/browse", json=payload) as resp:
+        body = await resp.read()
+    await http_client.close_session()
+    with open(path, "wb") as f:
+        f.write(body)
+    print(f"{path}: {len(body)} bytes")
+
+
+def main(paths: list[str]):
+    samples = [(path, open(path, "rb").read()) for path in paths] or [("(합성 응답)", synthetic_response())]
+    for name, body in samples:
+        assert legacy_parse(body) == targeted_parse(body), f"{name}: 결과가 다름"
+        legacy_ms, legacy_peak = measure(legacy_parse, body)
+        targeted_ms, targeted_peak = measure(targeted_parse, body)
+        print(f"{name} ({len(body) / 1024:.0f}KB, 게시물 {len(targeted_parse(body))}개)")
+        print(f"  전체 디코드  {legacy_ms:7.3f}ms  최대 {legacy_peak / 1024:7.0f}KB")
+        print(f"  탭만 디코드  {targeted_ms:7.3f}ms  최대 {targeted_peak / 1024:7.0f}KB  "
+              f"({legacy_ms / targeted_ms:.1f}배 빠름)")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--record":
+        asyncio.run(record(sys.argv[2], sys.argv[3]))
+    else:
+        main(sys.argv[1:])
@@ -0,0 +1,167 @@
+"""
+이름 검색 벤치마크: 예전 선형 부분 문자열 검색 vs utils/search.py 색인 (세 게임 캐릭터/무기/성유물 전체).
+
+    python tests/bench_search.py              # nanoka 목록(디스크 캐시 또는 네트워크)으로, 없으면 합성 목록으로
+    python tests/bench_search.py --synthetic  # 항상 합성 목록으로
+
+질의 종류(완전 일치 / 앞부분 / 초성 / 오타 / 영문)별로 예전 방식이 찾았는지, 색인 1위가 정답인지와
+질의당 p50 / p99 시간, 색인 생성 시간을 출력한다. 자동완성 트라이는 이름을 한 글자씩 쳐 나갈 때의 응답 시간을 잰다.
+"""
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from utils import catalog, http_client
+from utils.search import PrefixTrie, SearchIndex, chosung, normalize
+
+ROUNDS = 20
+SYLLABLES = "가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허고노도로모보소오조초코토포호구누두루무부수우주추쿠투푸후리미비시이지키티피히예에애레메베세"
+
+
+def legacy_search(lists: dict, query: str) -> list:
+    """예전 방식: 게임마다 이름 dict 를 돌며 양방향 부분 문자열, 처음 걸린 것에서 멈춤."""
+    query = query.lower()
+    results = []
+    for game_key in catalog.GAMES:
+        for name, item_id in lists.get(game_key, {}).items():
+            if query in name or name in query:
+                results.append((game_key, item_id))
+                break
+    return results
+
+
+def synthetic_lists() -> dict:
+    """{kind: {game: {id: (이름, 영문명)}}} — 실제 목록과 비슷한 크기."""
+    random.seed(7)
+    sizes = {"character": 110, "weapon": 230, "artifact": 60}
+    lists = {}
+    for kind, size in sizes.items():
+        lists[kind] = {}
+        for g, game_key in enumerate(catalog.GAMES):
+            entries = {}
+            for i in range(size):
+                name = "".join(random.choice(SYLLABLES) for _ in range(random.randint(2, 4)))
+                if kind != "character" and random.random() < 0.6:
+                    name += " " + "".join(random.choice(SYLLABLES) for _ in range(random.randint(2, 4)))
+                english = "".join(random.choice("abcdefghiklmnoprstuvy") for _ in range(random.randint(5, 12))).title()
+                entries[str(10000 * (g + 1) + i)] = (name, english)
+            lists[kind][game_key] = entries
+    return lists
+
+
+async def real_lists() -> dict | None:
+    await catalog.refresh()
+    await http_client.close_session()
+    if not catalog.stats()["lists"]:
+        return None
+    lists = {}
+    for kind in catalog.KINDS:
+        lists[kind] = {}
+        for game_key in catalog.GAMES:
+            aliases = catalog._aliases.get((kind, game_key), {})
+            lists[kind][game_key] = {
+                item_id: (name, next(iter(aliases.get(item_id, [])), ""))
+                for item_id, name in catalog._by_id.get((kind, game_key), {}).items()
+            }
+    return lists
+
+
+def typo(name: str) -> str:
+    """한 글자를 비슷한 글자로 바꾼다 (모음 ㅔ/ㅐ, ㅖ/ㅔ 혼동처럼)."""
+    chars = list(name.replace(" ", ""))
+    i = random.randrange(len(chars))
+    code = ord(chars[i]) - 0xAC00
+    if 0 <= code < 11172:
+        jung = code % 588 // 28
+        swap = {5: 1, 1: 5, 7: 5, 20: 18, 18: 20}.get(jung, (jung + 1) % 21)
+        chars[i] = chr(0xAC00 + code - jung * 28 + swap * 28)
+    return "".join(chars)
+
+
+def make_queries(lists: dict, kind: str) -> dict:
+    random.seed(11)
+    pool = [(game_key, item_id, name, english) for game_key, entries in lists[kind].items()
+            for item_id, (name, english) in entries.items() if len(normalize(name)) >= 2]
+    sample = random.sample(pool, min(50, len(pool)))
+    return {
+        "완전 일치": [(name, (g, i)) for g, i, name, _ in sample],
+        "앞부분": [(normalize(name)[:2], (g, i)) for g, i, name, _ in sample],
+        "초성": [(chosung(normalize(name)), (g, i)) for g, i, name, _ in sample],
+        "오타": [(typo(name), (g, i)) for g, i, name, _ in sample if len(normalize(name)) >= 3],
+        "영문": [(english, (g, i)) for g, i, _, english in sample if english],
+    }
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def main(lists: dict, label: str):
+    total = sum(len(entries) for per_game in lists.values() for entries in per_game.values())
+    print(f"{label}: 항목 {total}개")
+    for kind, per_game in lists.items():
+        started = time.perf_counter()
+        index = SearchIndex()
+        for game_key, entries in per_game.items():
+            for item_id, (name, english) in entries.items():
+                index.add((game_key, item_id), name, [english] if english else [])
+        build_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        trie = PrefixTrie()
+        for game_key, entries in per_game.items():
+            for item_id, (name, english) in entries.items():
+                trie.add((game_key, item_id), name, [english] if english else [])
+        trie_ms = (time.perf_counter() - started) * 1000
+        legacy_lists = {game_key: {name.lower(): item_id for item_id, (name, _) in entries.items()}
+                        for game_key, entries in per_game.items()}
+
+        print(f"\n[{kind}] 색인 {len(index)}개, 생성 {build_ms:.1f}ms (트라이 {trie_ms:.1f}ms)")
+        print(f"  {'질의':<8} {'예전 적중':>8} {'색인 1위':>8} {'색인 5위 안':>9} {'예전 p50/p99 µs':>16} {'색인 p50/p99 µs':>16}")
+        for query_kind, queries in make_queries(lists, kind).items():
+            if not queries:
+                continue
+            legacy_hit = top1 = top5 = 0
+            legacy_times, index_times = [], []
+            for query, answer in queries:
+                for _ in range(ROUNDS):
+                    t = time.perf_counter()
+                    legacy = legacy_search(legacy_lists, query)
+                    legacy_times.append((time.perf_counter() - t) * 1e6)
+                    t = time.perf_counter()
+                    hits = index.search(query)
+                    index_times.append((time.perf_counter() - t) * 1e6)
+                legacy_hit += answer in legacy
+                keys = [hit["key"] for hit in hits]
+                top1 += keys[:1] == [answer]
+                top5 += answer in keys[:5]
+            n = len(queries)
+            print(f"  {query_kind:<8} {legacy_hit / n:>8.0%} {top1 / n:>8.0%} {top5 / n:>9.0%} "
+                  f"{statistics.median(legacy_times):>7.0f}/{percentile(legacy_times, 0.99):<8.0f} "
+                  f"{statistics.median(index_times):>7.0f}/{percentile(index_times, 0.99):<8.0f}")
+
+        # 자동완성: 이름을 한 글자씩 입력하는 동안의 매 키 입력
+        keystroke_times, found = [], 0
+        queries = make_queries(lists, kind)["완전 일치"]
+        for query, answer in queries:
+            typed = normalize(query)
+            for end in range(1, len(typed) + 1):
+                t = time.perf_counter()
+                hits = trie.complete(typed[:end])
+                keystroke_times.append((time.perf_counter() - t) * 1e6)
+            found += answer in [key for key, _ in hits]
+        print(f"  자동완성 키 입력 {len(keystroke_times)}회: p50 {statistics.median(keystroke_times):.1f}µs / "
+              f"p99 {percentile(keystroke_times, 0.99):.1f}µs, 다 쳤을 때 후보에 있음 {found / len(queries):.0%}")
+
+
+if __name__ == "__main__":
+    lists = None if "--synthetic" in sys.argv else asyncio.run(real_lists())
+    if lists:
+        main(lists, "nanoka 목록")
+    else:
+        main(synthetic_lists(), "(합성 목록)")
@@ -0,0 +1,132 @@
+"""
+utils/websub.py 를 로컬 가짜 허브로 확인한다 (외부 네트워크 없이).
+
+    python tests/verify_websub_local.py
+
+1. 가짜 허브가 구독 요청을 받고, 콜백으로 challenge 확인 GET 을 보낸다
+2. 올바른 서명의 새 영상 알림 → on_push 로 전달되어야 함
+3. 서명이 틀린 알림 / 오래된 영상(제목 수정) 알림 → 무시되어야 함
+4. mark_missed → 폴링으로 돌아가고 다음 renew 에서 재구독
+5. 요청하지 않은 구독 확인 / 해지 GET → 404, 구독 상태 그대로 (lease 는 요청한 길이를 넘지 않음)
+"""
+import asyncio
+import hashlib
+import hmac
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from aiohttp import web
+
+from utils import http_client, scheduler, websub
+
+HUB_PORT = 18091
+CALLBACK_PORT = 18092
+CALLBACK_URL = f"http://127.0.0.1:{CALLBACK_PORT}/websub/youtube"
+CHANNEL_ID = "UCtestchannel000000000"
+
+secrets_by_topic = {}
+
+
+def atom(video_id: str, published: datetime) -> bytes:
+    return f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns="http://www.w3.org/2005/Atom">
+  <link rel="hub" href="https://pubsubhubbub.appspot.com"/>
+  <link rel="self" href="{websub.TOPIC_URL.format(CHANNEL_ID)}"/>
+  <title>YouTube video feed</title>
+  <entry>
+    <id>yt:video:{video_id}</id>
+    <yt:videoId>{video_id}</yt:videoId>
+    <yt:channelId>{CHANNEL_ID}</yt:channelId>
+    <title>테스트 영상 {video_id}</title>
+    <published>{published.isoformat()}</published>
+    <updated>{published.isoformat()}</updated>
+  </entry>
+</feed>""".encode()
+
+
+async def hub_subscribe(request: web.Request) -> web.Response:
+    form = await request.post()
+    topic = form["hub.topic"]
+    secrets_by_topic[topic] = form["hub.secret"]
+
+    async def verify():
+        await asyncio.sleep(0.05)
+        params = {"hub.mode": form["hub.mode"], "hub.topic": topic,
+                  "hub.challenge": "challenge-123", "hub.lease_seconds": "3600"}
+        async with http_client.get(form["hub.callback"], params=params) as resp:
+            body = await resp.text()
+            print(f"  허브 확인 응답: {resp.status} {body!r}")
+            assert body == "challenge-123"
+
+    asyncio.get_running_loop().create_task(verify())
+    return web.Response(status=202)
+
+
+async def push(body: bytes, secret: str):
+    signature = hmac.new(secret.encode(), body, hashlib.sha1).hexdigest()
+    async with http_client.post(CALLBACK_URL, data=body,
+                                headers={"X-Hub-Signature": f"sha1={signature}",
+                                         "Content-Type": "application/atom+xml"}) as resp:
+        return resp.status
+
+
+async def main():
+    app = web.Application()
+    app.router.add_post("/subscribe", hub_subscribe)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", HUB_PORT).start()
+
+    received = []
+
+    async def on_push(channel_id, videos):
+        received.extend((channel_id, v["video_id"]) for v in videos)
+
+    await websub.start(on_push, [CHANNEL_ID], host="127.0.0.1", port=CALLBACK_PORT,
+                       callback_url=CALLBACK_URL, hub_url=f"http://127.0.0.1:{HUB_PORT}/subscribe")
+    await asyncio.sleep(0.3)
+    assert websub.is_live(CHANNEL_ID), "구독 확인 후 live 여야 함"
+    print("1. 구독 확인 OK")
+
+    secret = secrets_by_topic[websub.TOPIC_URL.format(CHANNEL_ID)]
+    now = datetime.now(timezone.utc)
+    await push(atom("NEWVIDEO001", now), secret)
+    await asyncio.sleep(0.1)
+    assert received == [(CHANNEL_ID, "NEWVIDEO001")], received
+    print("2. 서명된 알림 전달 OK")
+
+    await push(atom("FORGED00001", now), "wrong-secret")
+    await push(atom("OLDVIDEO001", now - timedelta(days=3)), secret)
+    await asyncio.sleep(0.1)
+    assert received == [(CHANNEL_ID, "NEWVIDEO001")], received
+    print("3. 위조/오래된 알림 무시 OK")
+
+    websub.mark_missed(CHANNEL_ID, {"video_id": "MISSED00001",
+                                    "published_at": (now - timedelta(hours=1)).isoformat()})
+    assert not websub.is_live(CHANNEL_ID)
+    await websub.renew()
+    await asyncio.sleep(0.3)
+    assert websub.is_live(CHANNEL_ID), "재구독 후 다시 live 여야 함"
+    print("4. 누락 → 폴링 전환 → 재구독 OK")
+
+    expires_at = websub._subs[CHANNEL_ID].expires_at
+    for mode in ("subscribe", "unsubscribe"):
+        params = {"hub.mode": mode, "hub.topic": websub.TOPIC_URL.format(CHANNEL_ID),
+                  "hub.challenge": "forged", "hub.lease_seconds": str(10 ** 9)}
+        async with http_client.get(CALLBACK_URL, params=params) as resp:
+            assert resp.status == 404, (mode, resp.status)
+    assert websub.is_live(CHANNEL_ID) and websub._subs[CHANNEL_ID].expires_at == expires_at
+    print("5. 요청하지 않은 확인/해지 무시 OK")
+
+    print(websub.stats())
+    await websub.stop()
+    await scheduler.stop()
+    await runner.cleanup()
+    await http_client.close_session()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
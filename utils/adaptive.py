@@ -0,0 +1,163 @@
+"""
+소스별 적응형 폴링 간격.
+
+소스마다 실제로 새 글/코드가 올라오는 빈도는 크게 다르다. 주 1회 올리는 채널도 있고,
+호요 코드는 특별 방송 전후에 몰린다. 소스별로 "새 항목을 발견한 시각"을 기록해 두고
+지금이 그 소스에게 뜨거운 시간대면 자주, 차가운 시간대면 드물게 확인한다.
+
+    if adaptive.due("youtube:genshin_yt"):
+        adaptive.mark_polled("youtube:genshin_yt")
+        ... 새 영상이 있으면 adaptive.record_publish("youtube:genshin_yt")
+
+스케줄러 작업(POLL_JOBS)은 회차가 끝날 때 next_in(활성 소스들) 으로 다음 실행 시각을 다시 잡는다
+(scheduler.register 의 reschedule). 그래서 가장 먼저 차례가 오는 소스 시각에만 깨어나고,
+그 회차에서 due() 인 소스만 요청한다. 차가운 소스는 실제 폴링 사이에 깨우는 비용이 없다.
+
+간격 계산 (ADAPTIVE_INTERVALS 의 kind 별 min / base / max):
+- 최근 ADAPTIVE_BURST_HOURS 시간 안에 새 항목이 있었으면 min (방송 직후 코드 연속 공개 등)
+- 기록이 ADAPTIVE_MIN_EVENTS 개 미만이면 base
+- 아니면 과거 기록 중 "지금 시각(KST) ±1시간"·"오늘 요일" 비중이 균등 분포 대비 몇 배인지(heat)로
+  base / heat 를 [min, max] 안으로 자른다
+- 모든 소스의 시간당 요청 수 합이 ADAPTIVE_BUDGET_PER_HOUR 를 넘으면 전체 간격을 같은 비율로 늘린다
+
+ADAPTIVE_POLLING = False 면 항상 base 간격(예전 고정 주기)으로 돈다.
+"""
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+from utils import breaker, storage
+from utils.config import (
+    ADAPTIVE_POLLING, ADAPTIVE_INTERVALS, ADAPTIVE_BUDGET_PER_HOUR,
+    ADAPTIVE_HISTORY, ADAPTIVE_MIN_EVENTS, ADAPTIVE_BURST_HOURS, ADAPTIVE_MIN_WAKEUP,
+)
+
+KST = timezone(timedelta(hours=9))
+
+# source -> deque[발견 시각(epoch)]
+_history: dict[str, deque] | None = None
+# source -> 마지막 폴링 시각 (time.monotonic)
+_last_poll: dict[str, float] = {}
+# source -> 최근 계산된 간격 (예산 반영 전)
+_wanted: dict[str, float] = {}
+
+
+def _load():
+    global _history
+    if _history is not None:
+        return
+    _history = {}
+    for source, ts in storage.query("SELECT source, ts FROM publish_history ORDER BY ts"):
+        _history.setdefault(source, deque(maxlen=ADAPTIVE_HISTORY)).append(ts)
+
+
+def _kind(source: str) -> str:
+    return source.split(":", 1)[0]
+
+
+def record_publish(source: str, ts: float | None = None):
+    """source 에서 새 항목을 발견했음을 기록한다."""
+    _load()
+    ts = ts or time.time()
+    history = _history.setdefault(source, deque(maxlen=ADAPTIVE_HISTORY))
+    history.append(ts)
+    with storage.transaction() as conn:
+        conn.execute("INSERT INTO publish_history VALUES (?, ?)", (source, ts))
+        # 오래된 기록은 ADAPTIVE_HISTORY 개만 남기고 정리
+        conn.execute(
+            "DELETE FROM publish_history WHERE source = ? AND ts < ?",
+            (source, history[0]),
+        )
+
+
+def heat(source: str, now: float | None = None) -> float | None:
+    """지금 시간대가 이 소스에게 얼마나 뜨거운지 (1 = 평균). 기록이 부족하면 None."""
+    _load()
+    history = _history.get(source)
+    if not history or len(history) < ADAPTIVE_MIN_EVENTS:
+        return None
+    current = datetime.fromtimestamp(now or time.time(), KST)
+    same_hours = same_weekday = 0
+    for ts in history:
+        moment = datetime.fromtimestamp(ts, KST)
+        if min((moment.hour - current.hour) % 24, (current.hour - moment.hour) % 24) <= 1:
+            same_hours += 1
+        if moment.weekday() == current.weekday():
+            same_weekday += 1
+    total = len(history)
+    # 균등하게 퍼져 있으면 ±1시간(3/24), 같은 요일(1/7) 비중이 되어야 한다
+    hour_ratio = (same_hours / total) / (3 / 24)
+    weekday_ratio = (same_weekday / total) / (1 / 7)
+    return (hour_ratio * weekday_ratio) ** 0.5
+
+
+def _interval_for(source: str, now: float) -> float:
+    low, base, high = (ADAPTIVE_INTERVALS[_kind(source)][k] for k in ("min", "base", "max"))
+    if not ADAPTIVE_POLLING:
+        return base
+    history = (_history or {}).get(source)
+    if history and now - history[-1] < ADAPTIVE_BURST_HOURS * 3600:
+        return low
+    h = heat(source, now)
+    if h is None:
+        return base
+    return min(high, max(low, base / max(h, 1e-3)))
+
+
+def interval(source: str) -> float:
+    """예산을 반영한 현재 폴링 간격(초)."""
+    _load()
+    now = time.time()
+    _wanted[source] = _interval_for(source, now)
+    # 예산 확인: 활성 소스들이 원하는 간격으로 돌면 시간당 몇 번 요청하는지
+    per_hour = sum(3600 / seconds for seconds in _wanted.values())
+    scale = max(1.0, per_hour / ADAPTIVE_BUDGET_PER_HOUR) if ADAPTIVE_POLLING else 1.0
+    return _wanted[source] * scale
+
+
+def due(source: str) -> bool:
+    """지금 폴링할 차례인지."""
+    last = _last_poll.get(source)
+    return last is None or time.monotonic() - last >= interval(source)
+
+
+def mark_polled(source: str):
+    _last_poll[source] = time.monotonic()
+
+
+def next_in(sources) -> float | None:
+    """sources 중 가장 먼저 폴링 차례가 오는 소스까지 남은 초 (스케줄러 다음 실행 시각용). 소스가 없으면 None.
+
+    차단기가 열린 소스는 시험 요청 시각까지 기다린다. 시험 요청이 다른 곳에서 진행 중이면
+    남은 시간이 0 으로 나오므로 ADAPTIVE_MIN_WAKEUP 초 아래로는 당기지 않는다.
+    """
+    now = time.monotonic()
+    waits = []
+    for source in sources:
+        last = _last_poll.get(source)
+        remaining = 0.0 if last is None else last + interval(source) - now
+        waits.append(max(remaining, breaker.retry_in(source)))
+    return max(ADAPTIVE_MIN_WAKEUP, min(waits)) if waits else None
+
+
+def forget(source: str):
+    """구독이 없어져 더 이상 폴링하지 않는 소스는 예산 계산에서 뺀다."""
+    _wanted.pop(source, None)
+
+
+def stats() -> list[dict]:
+    """소스별 현재 간격 / heat / 기록 수 / 다음 폴링까지 남은 시간."""
+    _load()
+    now = time.monotonic()
+    result = []
+    for source in sorted(_wanted):
+        seconds = interval(source)
+        last = _last_poll.get(source)
+        result.append({
+            "source": source,
+            "interval": seconds,
+            "heat": heat(source),
+            "events": len(_history.get(source, ())),
+            "next_in": 0.0 if last is None else max(0.0, last + seconds - now),
+        })
+    return result
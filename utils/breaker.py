@@ -0,0 +1,134 @@
+"""
+외부 소스별 차단기 (circuit breaker).
+
+Game8 / 유튜브 innertube / enka.network 같은 소스가 죽으면 예전에는 매 틱마다 계속 요청하고
+실패마다 오류 줄을 찍었다 (명조 위키는 그래서 아예 소스를 지웠다). 소스마다 상태를 두고:
+
+- closed    평소. BREAKER_THRESHOLD 번 연속 실패하면 open
+- open      요청하지 않는다. 대기 시간은 BREAKER_BASE_DELAY × 2^(연속으로 열린 횟수-1),
+            최대 BREAKER_MAX_DELAY, ±BREAKER_JITTER 만큼 흔든다 (여러 소스가 동시에 재시도하지 않게)
+- half_open 대기가 끝나면 한 번만 시험 요청. 성공하면 closed, 실패하면 더 길게 다시 open
+
+    if not breaker.allow("redeem:endfield"):
+        return                              # 열려 있음 → 요청 생략
+    try:
+        ...
+        breaker.success("redeem:endfield")
+    except Exception as e:
+        breaker.failure("redeem:endfield", e)
+
+로그는 상태가 바뀔 때만 찍는다. !봇상태 에서 열린 소스와 남은 시간을 볼 수 있다.
+"""
+import random
+import time
+
+from utils.governor import HostThrottled
+from utils.config import (
+    BREAKER_THRESHOLD, BREAKER_BASE_DELAY, BREAKER_MAX_DELAY, BREAKER_JITTER, BREAKER_TRIAL_TIMEOUT,
+)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class BreakerOpen(Exception):
+    """차단기가 열려 있어 요청하지 않았다."""
+
+
+class _Breaker:
+    def __init__(self, source: str):
+        self.source = source
+        self.state = CLOSED
+        self.failures = 0        # 연속 실패 수
+        self.trips = 0           # 연속으로 열린 횟수 (대기 시간 지수)
+        self.open_until = 0.0    # time.monotonic
+        self.trial_started = 0.0
+        self.last_error = ""
+        self.total_failures = 0
+        self.skipped = 0         # 열려 있어서 건너뛴 요청 수
+
+
+_breakers: dict[str, _Breaker] = {}
+
+
+def _get(source: str) -> _Breaker:
+    breaker = _breakers.get(source)
+    if breaker is None:
+        breaker = _breakers[source] = _Breaker(source)
+    return breaker
+
+
+def allow(source: str) -> bool:
+    """지금 source 로 요청해도 되는지. half_open 에서는 시험 요청 하나만 True."""
+    breaker = _get(source)
+    if breaker.state == CLOSED:
+        return True
+    now = time.monotonic()
+    if breaker.state == OPEN and now >= breaker.open_until:
+        breaker.state = HALF_OPEN
+        breaker.trial_started = now
+        print(f"[차단기] {source} 시험 요청")
+        return True
+    if breaker.state == HALF_OPEN and now - breaker.trial_started >= BREAKER_TRIAL_TIMEOUT:
+        # 시험 요청 결과가 안 돌아왔다 (취소 등) → 한 번 더 시험
+        breaker.trial_started = now
+        return True
+    breaker.skipped += 1
+    return False
+
+
+def check(source: str):
+    """allow 와 같지만 막혀 있으면 BreakerOpen 을 낸다 (유저 명령 쪽에서 메시지로 쓰기 좋게)."""
+    if not allow(source):
+        raise BreakerOpen(f"{source} 가 계속 실패해서 잠시 요청을 멈췄어요 (약 {retry_in(source) / 60:.0f}분 후 재시도)")
+
+
+def success(source: str):
+    breaker = _get(source)
+    if breaker.state != CLOSED:
+        print(f"[차단기] {source} 복구됨 (실패 {breaker.failures}회 후)")
+    breaker.state = CLOSED
+    breaker.failures = 0
+    breaker.trips = 0
+
+
+def failure(source: str, error=None):
+    if isinstance(error, HostThrottled):
+        return  # 우리 쪽 요청 조절로 안 보낸 것 — 소스 실패가 아니다
+    breaker = _get(source)
+    breaker.failures += 1
+    breaker.total_failures += 1
+    breaker.last_error = str(error or "")[:200]
+    if breaker.state == HALF_OPEN or breaker.failures >= BREAKER_THRESHOLD:
+        breaker.trips += 1
+        delay = min(BREAKER_MAX_DELAY, BREAKER_BASE_DELAY * 2 ** (breaker.trips - 1))
+        delay *= random.uniform(1 - BREAKER_JITTER, 1 + BREAKER_JITTER)
+        breaker.state = OPEN
+        breaker.open_until = time.monotonic() + delay
+        print(f"[차단기] {source} 차단 — {breaker.failures}회 연속 실패 ({breaker.last_error}), {delay:.0f}초 후 재시도")
+
+
+def retry_in(source: str) -> float:
+    """열려 있으면 시험 요청까지 남은 초, 아니면 0."""
+    breaker = _breakers.get(source)
+    if breaker is None or breaker.state != OPEN:
+        return 0.0
+    return max(0.0, breaker.open_until - time.monotonic())
+
+
+def state(source: str) -> str:
+    breaker = _breakers.get(source)
+    return breaker.state if breaker else CLOSED
+
+
+def stats() -> list[dict]:
+    """소스별 상태 (closed 가 아닌 것 먼저)."""
+    result = [{
+        "source": b.source,
+        "state": b.state,
+        "failures": b.failures,
+        "total_failures": b.total_failures,
+        "skipped": b.skipped,
+        "retry_in": retry_in(b.source),
+        "last_error": b.last_error,
+    } for b in _breakers.values()]
+    return sorted(result, key=lambda r: (r["state"] == CLOSED, r["source"]))
@@ -0,0 +1,189 @@
+"""
+nanoka 캐릭터 / 무기 / 성유물 목록의 공용 이름 색인.
+
+예전에는 HoyoCharacters / HoyoWeapons / HoyoArtifacts 가 각자 게임별 이름→ID dict 를 들고
+첫 검색 때 세 게임 목록을 하나씩 차례로 받았고, enka cog 도 원신 캐릭터 목록을 따로 들고 있었다.
+여기서 (종류, 게임) 9개 목록을 한 번에 동시에 받아 한 곳에 둔다.
+
+    await catalog.refresh()                       # 시작 시 / manifest 가 바뀌었을 때
+    catalog.names("weapon", "hsr")                # {소문자 이름: id}
+    catalog.name_of("character", "gi", 10000089)  # id → 이름
+    catalog.search("character", "ㄴㅂㅇㅌ")        # 세 게임 통틀어 순위 매긴 후보 (utils/search.py)
+    catalog.complete("character", "느비")           # 자동완성 (메모리만 본다, 네트워크 없음)
+
+refresh 는 manifest 의 게임별 latest 버전이 색인을 만든 버전과 다른 목록만 다시 받는다.
+목록 받기에 실패하면 직전 색인을 그대로 두고 다음 refresh 에서 다시 시도한다.
+"""
+import asyncio
+import time
+
+from utils import nanoka, singleflight
+from utils.config import AUTOCOMPLETE_LIMIT, AVATAR_ID_TO_KR, CHARACTER_NAME_TO_ENKA, SEARCH_RESULT_LIMIT
+from utils.search import PrefixTrie, SearchIndex
+
+GAMES = ("gi", "hsr", "zzz")
+KINDS = ("character", "weapon", "artifact")
+
+_LIST_URL = {
+    "character": nanoka.char_list_url,
+    "weapon": nanoka.weapon_list_url,
+    "artifact": nanoka.artifact_list_url,
+}
+
+# (kind, game) -> {소문자 이름: id}, {id: 이름}, 색인을 만든 데이터 버전
+_names: dict[tuple[str, str], dict[str, str]] = {}
+_by_id: dict[tuple[str, str], dict[str, str]] = {}
+_versions: dict[tuple[str, str], str] = {}
+_aliases: dict[tuple[str, str], dict[str, list[str]]] = {}   # (kind, game) -> {id: [영문명, 별칭...]}
+# kind -> 세 게임 이름을 모은 검색 색인 / 자동완성 트라이. 목록이 바뀔 때마다 통째로 새로 만든다.
+_indexes: dict[str, SearchIndex] = {}
+_tries: dict[str, PrefixTrie] = {}
+_built_at = 0.0
+
+# 원신 캐릭터 별칭: 영문명 → 짧은 한글 이름 (config 의 enka 매핑표 재사용)
+_GI_SHORT_NAMES: dict[str, list[str]] = {}
+for _short, _english in CHARACTER_NAME_TO_ENKA.items():
+    _GI_SHORT_NAMES.setdefault(_english.lower(), []).append(_short)
+
+
+def _entry_name(kind: str, game_key: str, entry: dict) -> str | None:
+    """목록 JSON 항목 하나에서 표시 이름을 꺼낸다 (게임/종류마다 스키마가 다르다)."""
+    if kind == "artifact":
+        if game_key == "gi":
+            first = next(iter(entry.get('set', {}).values()), {})
+            nm = first.get('name', {}) if isinstance(first, dict) else {}
+            return nm.get('ko') or nm.get('en')
+        if game_key == "zzz":
+            ko = entry.get('ko', {})
+            return ko.get('name') if isinstance(ko, dict) else None
+    name = entry.get('ko') or entry.get('en')
+    if name and kind == "weapon" and game_key == "zzz":
+        name = name.replace("Item_Weapon_", "").replace("_Name", "").replace("_", " ")
+    return name
+
+
+def _entry_aliases(kind: str, game_key: str, item_id: str, entry: dict, name: str) -> list[str]:
+    """검색용 다른 이름: 영문명 + (원신 캐릭터) 하드코딩 한글 이름/줄임말."""
+    aliases = []
+    english = entry.get('en')
+    if isinstance(english, str) and english != name:
+        aliases.append(english)
+    if kind == "character" and game_key == "gi":
+        if isinstance(english, str):
+            aliases.extend(_GI_SHORT_NAMES.get(english.lower(), []))
+        try:
+            kr = AVATAR_ID_TO_KR.get(int(item_id))
+        except ValueError:
+            kr = None
+        if kr and kr != name:
+            aliases.append(kr)
+    return aliases
+
+
+async def _load(kind: str, game_key: str, version: str) -> bool:
+    data = await nanoka.fetch_json(_LIST_URL[kind](game_key, version))
+    if not isinstance(data, dict):
+        return False
+    names, by_id, aliases = {}, {}, {}
+    for item_id, entry in data.items():
+        if not isinstance(entry, dict):
+            continue
+        name = _entry_name(kind, game_key, entry)
+        if name:
+            names[name.lower()] = str(item_id)
+            by_id[str(item_id)] = name
+            aliases[str(item_id)] = _entry_aliases(kind, game_key, str(item_id), entry, name)
+    _names[(kind, game_key)] = names
+    _by_id[(kind, game_key)] = by_id
+    _aliases[(kind, game_key)] = aliases
+    _versions[(kind, game_key)] = version
+    return True
+
+
+async def _refresh():
+    global _built_at
+    manifest = await nanoka.fetch_manifest()
+    if not manifest:
+        return
+    targets = []
+    for game_key in GAMES:
+        version = manifest.get(game_key, {}).get("latest")
+        if not version:
+            continue
+        targets.extend((kind, game_key, version) for kind in KINDS if _versions.get((kind, game_key)) != version)
+    if not targets:
+        return
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(_load(*t) for t in targets), return_exceptions=True)
+    failed = [f"{kind}/{game_key}" for (kind, game_key, _), ok in zip(targets, results) if ok is not True]
+    for (kind, game_key, _), result in zip(targets, results):
+        if isinstance(result, Exception):
+            print(f"[카탈로그] {game_key} {kind} 목록 로드 실패: {result}")
+    for kind in {kind for kind, _, _ in targets}:
+        _indexes[kind], _tries[kind] = _build_index(kind)
+    _built_at = time.time()
+    print(f"[카탈로그] 목록 {len(targets) - len(failed)}/{len(targets)}개 갱신 "
+          f"({(time.perf_counter() - started) * 1000:.0f}ms)" + (f" — 실패: {', '.join(failed)}" if failed else ""))
+
+
+def _build_index(kind: str) -> tuple[SearchIndex, PrefixTrie]:
+    entries = []
+    for game_key in GAMES:
+        aliases = _aliases.get((kind, game_key), {})
+        entries.extend(((game_key, item_id), name, aliases.get(item_id, ()))
+                       for item_id, name in _by_id.get((kind, game_key), {}).items())
+    # 트라이는 먼저 넣은 항목이 후보 앞에 오므로 짧은 이름부터 넣는다
+    entries.sort(key=lambda e: (len(e[1]), e[1]))
+    index, trie = SearchIndex(), PrefixTrie()
+    for key, name, aliases in entries:
+        index.add(key, name, aliases)
+        trie.add(key, name, aliases)
+    return index, trie
+
+
+async def refresh():
+    """manifest 버전이 바뀐(또는 아직 없는) 목록만 동시에 다시 받는다. 동시 호출은 한 번으로 합친다."""
+    await singleflight.do("catalog:refresh", _refresh)
+
+
+def names(kind: str, game_key: str) -> dict[str, str]:
+    """{소문자 이름: id}. 아직 못 받았으면 빈 dict."""
+    return _names.get((kind, game_key), {})
+
+
+def name_of(kind: str, game_key: str, item_id) -> str | None:
+    """id → 이름 (원래 대소문자). 없으면 None."""
+    return _by_id.get((kind, game_key), {}).get(str(item_id))
+
+
+def search(kind: str, query: str, limit: int = SEARCH_RESULT_LIMIT) -> list[dict]:
+    """세 게임 통틀어 순위를 매긴 후보. 각 결과: {"game", "id", "name", "tier", "score"} (tier 는 utils/search.py)."""
+    index = _indexes.get(kind)
+    if index is None:
+        return []
+    return [{"game": hit["key"][0], "id": hit["key"][1], "name": hit["name"], "tier": hit["tier"], "score": hit["score"]}
+            for hit in index.search(query, limit)]
+
+
+def complete(kind: str, prefix: str, limit: int = AUTOCOMPLETE_LIMIT) -> list[dict]:
+    """자동완성 후보 {"game", "id", "name"}. 앞부분 일치가 없으면 (초성·오타) 검색 색인으로 채운다.
+
+    메모리의 색인만 본다. 아직 목록을 못 받았으면 빈 목록.
+    """
+    trie = _tries.get(kind)
+    if trie is None:
+        return []
+    hits = [{"game": key[0], "id": key[1], "name": name} for key, name in trie.complete(prefix)[:limit]]
+    if not hits:
+        hits = [{"game": hit["game"], "id": hit["id"], "name": hit["name"]} for hit in search(kind, prefix, limit)]
+    return hits
+
+
+def stats() -> dict:
+    """(kind, game) 별 항목 수와 버전, 마지막 갱신 시각."""
+    return {
+        "lists": {f"{kind}/{game_key}": {"items": len(_names[(kind, game_key)]), "version": _versions[(kind, game_key)]}
+                  for kind, game_key in _names},
+        "built_at": _built_at,
+    }
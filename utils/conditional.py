@@ -0,0 +1,102 @@
+"""
+조건부 GET (ETag / If-Modified-Since) 헬퍼.
+
+주기적으로 같은 URL 을 폴링하는 곳(리딤코드, 유튜브 RSS, nanoka manifest 등)에서 쓴다.
+URL 별로 마지막 응답의 ETag / Last-Modified 를 DB(http_validators)에 저장해 두고 다음 요청에 실어 보낸다.
+바뀐 URL 한 줄만 스레드에서 upsert 한다.
+서버가 304 를 주면 호출 쪽은 파싱·중복확인·알림 전송을 통째로 건너뛰면 된다.
+
+    async with conditional.get(url, source="redeem:genshin") as resp:
+        if resp.status == conditional.NOT_MODIFIED:
+            return None
+        data = await resp.json()
+
+▶ 검증값은 with 블록이 예외 없이 끝났을 때만 저장한다.
+  (본문 파싱이 실패했는데 ETag 만 저장되면 다음 폴링에서 304 로 그 내용을 영영 놓친다.)
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+from utils import http_client, storage
+
+NOT_MODIFIED = 304
+
+# url -> {"etag": str, "last_modified": str, "size": 본문 바이트}. 처음 쓸 때 DB 에서 읽는다.
+_validators: dict | None = None
+# source -> {"polls": 폴링 수, "not_modified": 304 수, "saved_bytes": 304 로 아낀 추정 바이트}
+_stats: dict[str, dict] = {}
+
+
+def _load() -> dict:
+    global _validators
+    if _validators is None:
+        _validators = {
+            url: {"etag": etag, "last_modified": last_modified, "size": size}
+            for url, etag, last_modified, size in storage.query(
+                "SELECT url, etag, last_modified, size FROM http_validators")
+        }
+    return _validators
+
+
+def request_headers(url: str) -> dict:
+    """저장된 검증값으로 만든 조건부 요청 헤더."""
+    entry = _load().get(url) or {}
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+async def _record(url: str, source: str, resp):
+    validators = _load()
+    stat = _stats.setdefault(source, {"polls": 0, "not_modified": 0, "saved_bytes": 0})
+    stat["polls"] += 1
+
+    if resp.status == NOT_MODIFIED:
+        stat["not_modified"] += 1
+        stat["saved_bytes"] += (validators.get(url) or {}).get("size", 0)
+        return
+    if resp.status != 200:
+        return
+
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    if not etag and not last_modified:
+        # 검증값을 안 주는 서버 — 예전 값이 남아 있으면 지운다
+        if validators.pop(url, None) is not None:
+            await asyncio.to_thread(storage.execute, "DELETE FROM http_validators WHERE url = ?", (url,))
+        return
+
+    # 호출 쪽이 실제로 받은 (압축 푼) 본문 크기. content_length 는 chunked 면 없고 gzip 이면 압축 크기다.
+    entry = {"etag": etag, "last_modified": last_modified, "size": resp.content.total_bytes}
+    if validators.get(url) != entry:
+        validators[url] = entry
+        await asyncio.to_thread(storage.execute, "INSERT OR REPLACE INTO http_validators VALUES (?, ?, ?, ?)",
+                                (url, etag, last_modified, entry["size"]))
+
+
+@asynccontextmanager
+async def get(url: str, *, source: str | None = None, use_validators: bool = True, **kwargs):
+    """공용 세션으로 조건부 GET. use_validators=False 면 검증값 없이 전체를 받는다(저장은 함)."""
+    headers = dict(kwargs.pop("headers", None) or {})
+    if use_validators:
+        headers.update(request_headers(url))
+    async with http_client.get(url, headers=headers, **kwargs) as resp:
+        yield resp
+        await _record(url, source or url, resp)
+
+
+def stats() -> dict:
+    """source 별 폴링/304 카운터 (복사본)."""
+    return {k: dict(v) for k, v in _stats.items()}
+
+
+def totals() -> dict:
+    """전체 합계: polls / not_modified / saved_bytes."""
+    total = {"polls": 0, "not_modified": 0, "saved_bytes": 0}
+    for stat in _stats.values():
+        for key in total:
+            total[key] += stat[key]
+    return total
@@ -15,6 +15,115 @@ SENT_CODES_FILE = "data/sent_codes.json"
 GUILD_SETTINGS_FILE = "data/guild_settings.json"
 UID_DATA_FILE = "data/uid_data.json"
 SENT_VIDEOS_FILE = "data/sent_videos.json"
+# 위 JSON 파일들은 처음 한 번 DB 로 가져온 뒤에는 백업 내보내기 형식으로만 쓴다 (utils/storage.py)
+DB_FILE = "data/bot.db"
+USER_STORE_FLUSH_DELAY = 5  # 운세/기원 기록을 모아서 DB 에 쓰는 간격(초)
+# 보낸 영상/커뮤니티 게시물 ID 보관 범위 (utils/dedupe.py)
+SENT_WINDOW_DAYS = 30                  # 이보다 오래된 ID 는 정리
+SENT_WINDOW_PER_CHANNEL = 200          # 유튜브 채널당 최대 보관 수
+SENT_WINDOW_KEEP_MIN = 30              # 기간이 지나도 채널당 최근 이만큼은 남김
+SENT_WINDOW_PRUNE_INTERVAL = 6 * 3600  # 정리 주기(초)
+
+# ── 공용 HTTP 클라이언트 (utils/http_client.py) ──
+HTTP_POOL_LIMIT = 100            # 전체 동시 연결 수
+HTTP_POOL_LIMIT_PER_HOST = 10    # 호스트당 동시 연결 수
+HTTP_DNS_CACHE_TTL = 300         # DNS 조회 결과 캐시(초)
+HTTP_KEEPALIVE_TIMEOUT = 60      # 유휴 keep-alive 연결 유지 시간(초)
+HTTP_DEFAULT_TIMEOUT = 30        # 아래 표에 없는 호스트의 요청 타임아웃(초)
+HTTP_HOST_TIMEOUTS = {
+    "static.nanoka.cc": 15,
+    "enka.network": 20,
+    "sg-hk4e-api.hoyoverse.com": 15,
+    "sg-hkrpg-api.hoyoverse.com": 15,
+    "hoyo-codes.seria.moe": 30,
+    "game8.co": 30,
+    "www.youtube.com": 30,
+}
+# 호스트별 요청 조절 (utils/governor.py). concurrency: 동시 요청 수, rate: 초당 요청 수, burst: 몰아서 보낼 수 있는 수
+GOVERNOR_DEFAULT = {"concurrency": 4, "rate": 5.0, "burst": 10}
+GOVERNOR_HOSTS = {
+    "www.youtube.com": {"concurrency": 4, "rate": 2.0, "burst": 8},   # RSS + 커뮤니티 browse
+    "enka.network": {"concurrency": 2, "rate": 1.0, "burst": 3},
+    "static.nanoka.cc": {"concurrency": 8, "rate": 10.0, "burst": 20},
+    "hoyo-codes.seria.moe": {"concurrency": 2, "rate": 1.0, "burst": 3},
+    "game8.co": {"concurrency": 1, "rate": 0.5, "burst": 2},
+    "pubsubhubbub.appspot.com": {"concurrency": 4, "rate": 2.0, "burst": 10},
+}
+GOVERNOR_MAX_WAIT = 10            # 이보다 오래 기다려야 하면 요청하지 않고 실패 처리(초)
+GOVERNOR_THROTTLE_BACKOFF = 30    # 429/503 에 Retry-After 가 없을 때 멈추는 시간(초)
+# 소스별 차단기 (utils/breaker.py). 연속 실패하면 지수 백오프로 요청을 멈췄다가 한 번씩 시험한다.
+BREAKER_THRESHOLD = 3          # 이만큼 연속 실패하면 차단
+BREAKER_BASE_DELAY = 60        # 첫 차단 시간(초). 다시 실패할 때마다 두 배
+BREAKER_MAX_DELAY = 3600       # 최대 차단 시간(초)
+BREAKER_JITTER = 0.2           # 차단 시간 ±20% 흔들기
+BREAKER_TRIAL_TIMEOUT = 120    # 시험 요청 결과가 이 시간 안에 안 오면 다시 시험(초)
+# 예전 URL 별 ETag / Last-Modified 파일. 지금은 DB(http_validators)에 두고, DB 를 만들 때 한 번 가져온다.
+HTTP_VALIDATORS_FILE = "data/http_validators.json"
+
+# 폴링 작업 (utils/scheduler.py). interval 초마다 + 0~jitter 초. priority 가 작을수록 먼저.
+# redeem/youtube/community/hakushin 은 회차가 끝날 때 가장 먼저 차례가 오는 소스 시각으로
+# 다음 실행을 다시 잡는다 (소스별 간격은 아래 ADAPTIVE_*). interval 은 구독 소스가 하나도 없을 때의 주기.
+POLL_JOBS = {
+    "redeem":    {"interval": 300,  "jitter": 10, "priority": 0},
+    "youtube":   {"interval": 300,  "jitter": 15, "priority": 1},
+    "community": {"interval": 300,  "jitter": 15, "priority": 2},
+    "hakushin":  {"interval": 1800, "jitter": 60, "priority": 3},
+    "websub":    {"interval": 300,  "jitter": 30, "priority": 5},  # 구독 갱신 (WebSub 켰을 때만)
+}
+
+# 적응형 폴링 (utils/adaptive.py). 새 항목 발견 기록으로 소스별 간격(초)을 min~max 사이에서 조절.
+ADAPTIVE_POLLING = True  # False 면 항상 base 간격
+ADAPTIVE_INTERVALS = {
+    "redeem":    {"min": 120, "base": 300,  "max": 1800},
+    "youtube":   {"min": 180, "base": 300,  "max": 3600},
+    "community": {"min": 180, "base": 300,  "max": 3600},
+    "nanoka":    {"min": 900, "base": 1800, "max": 3600},
+}
+ADAPTIVE_BUDGET_PER_HOUR = 240  # 모든 소스 합계 시간당 최대 요청 수
+ADAPTIVE_HISTORY = 200          # 소스별로 기억하는 발견 시각 수
+ADAPTIVE_MIN_EVENTS = 8         # 이보다 기록이 적으면 base 간격
+ADAPTIVE_BURST_HOURS = 2        # 마지막 발견 후 이 시간 동안은 min 간격
+ADAPTIVE_MIN_WAKEUP = 30        # 적응형 작업을 다시 깨우기까지 최소 초 (차단기 시험 요청 대기 중 헛돌기 방지)
+
+# 재시작 시, 마지막 정상 확인이 이 시간(초) 이내인 소스는 기존 목록 시딩을 건너뛴다 (utils/warmstart.py)
+WARM_START_FRESHNESS = 6 * 3600
+
+# 유튜브 WebSub(PubSubHubbub) 푸시 수신 (utils/websub.py). WEBSUB_CALLBACK_URL 이 있으면 켜진다.
+# 허브가 접근할 수 있는 공개 주소여야 한다 (예: https://bot.example.com/websub/youtube).
+WEBSUB_CALLBACK_URL = os.environ.get("WEBSUB_CALLBACK_URL")
+WEBSUB_ENABLED = bool(WEBSUB_CALLBACK_URL)
+WEBSUB_HOST = os.environ.get("WEBSUB_HOST", "0.0.0.0")     # 내장 HTTP 서버 바인드 주소
+WEBSUB_PORT = int(os.environ.get("WEBSUB_PORT", "8080"))
+WEBSUB_SECRET = os.environ.get("WEBSUB_SECRET")            # 없으면 실행마다 새로 만든다
+WEBSUB_HUB = "https://pubsubhubbub.appspot.com/subscribe"
+WEBSUB_LEASE_SECONDS = 5 * 86400    # 요청하는 구독 기간
+WEBSUB_RENEW_MARGIN = 12 * 3600     # 만료 이만큼 전에 다시 구독
+WEBSUB_VERIFY_TIMEOUT = 600         # 구독 요청 후 허브 확인이 이 시간 안에 안 오면 재요청
+WEBSUB_SAFETY_POLL = 3600           # 푸시가 살아 있는 채널도 이 간격으로 RSS 를 한 번씩 확인
+WEBSUB_MAX_AGE = 86400              # 게시 시각이 이보다 오래된 항목 푸시(제목 수정 등)는 무시
+WEBSUB_PUSH_GRACE = 600             # 게시 후 이 시간이 지나도 푸시가 안 온 영상이면 "누락"으로 본다
+
+# 알림 fan-out (utils/dispatch.py)
+DISPATCH_CONCURRENCY = 16        # 동시에 진행할 채널 전송 수
+DISPATCH_MAX_RETRIES = 2         # 429 / 5xx 재시도 횟수
+DISPATCH_LATENCY_SAMPLES = 1000  # p50/p99 계산에 쓰는 최근 전송 기록 수
+DISPATCH_MESSAGE_LIMIT = 2000    # 디스코드 메시지 본문 최대 길이 (여러 알림을 묶을 때 이 안에서 나눈다)
+
+# nanoka 데이터 파일 캐시 (버전별로 불변 → 디스크에 보관, utils/content_cache.py)
+NANOKA_CACHE_DIR = "data/nanoka_cache"
+NANOKA_CACHE_MAX_BYTES = 200 * 1024 * 1024
+NANOKA_CACHE_MEMORY_ITEMS = 256
+# 신캐/신무기 목록의 상세 JSON 을 동시에 받을 때: 최대 동시 요청 수, 전체 마감(초)
+NANOKA_DETAIL_CONCURRENCY = 5
+NANOKA_DETAIL_DEADLINE = 8
+# manifest 의 new 블록이 바뀌면 신규 항목 상세를 백그라운드로 미리 받아 둔다 (천천히, 마감 넉넉히)
+NANOKA_PREFETCH_CONCURRENCY = 2
+NANOKA_PREFETCH_DEADLINE = 300
+
+# 이름 검색 색인 (/캐릭터 /무기 /성유물, utils/search.py)
+SEARCH_RESULT_LIMIT = 10   # 한 번에 보여 줄 최대 후보 수
+SEARCH_FUZZY_MIN = 0.45    # 오타 허용 검색의 최소 3-gram 유사도 (Dice, 0~1)
+AUTOCOMPLETE_LIMIT = 25    # 슬래시 명령 자동완성 후보 수 (디스코드 최대 25)
 
 HOYO_GAME_CONFIGS = {
     "genshin": {
@@ -58,6 +167,12 @@ ENDFIELD_CONFIG = {
     "currency_name": "오로베릴",
 }
 
+# 리딤코드 소스별 마감 시간(초). 모든 소스를 동시에 받되, 마감을 넘긴 소스는 이번 주기만 건너뛴다.
+REDEEM_SOURCE_DEADLINE = 20
+REDEEM_SOURCE_DEADLINES = {
+    "endfield": 25,  # Game8 HTML 스크래핑은 응답이 느린 편
+}
+
 YOUTUBE_CHANNELS = {
     "genshin_yt": {
         "channel_id": "UCcum1rCJ5GJeQ_xv0xrohqg",
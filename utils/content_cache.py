@@ -0,0 +1,200 @@
+"""
+버전 주소 기반 콘텐츠 캐시 (메모리 LRU + 디스크).
+
+static.nanoka.cc/{game}/{version}/... 아래 파일은 같은 버전이면 내용이 절대 바뀌지 않는다.
+그래서 (game, version, path) 를 키로 한 번 받은 JSON 을 디스크에 저장해 두고 재사용한다.
+
+    data/nanoka_cache/{game}/{version}/{path}
+
+- 메모리: 파싱된 객체를 최근 사용 순으로 mem_items 개까지 보관 (히트 시 네트워크·파싱 없음)
+- 디스크: 전체 크기가 max_bytes 를 넘으면 가장 오래 안 쓴 파일부터 삭제 (파일 mtime = 최근 사용 시각)
+- manifest 의 latest 버전이 바뀌면 retire() 로 그 게임의 옛 버전 폴더를 통째로 지운다
+
+▶ 디스크 접근 메서드(load/store/retire)는 동기 함수다. 이벤트 루프에서는 asyncio.to_thread 로 부른다.
+"""
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+
+
+class ContentCache:
+    def __init__(self, root: str, *, max_bytes: int, mem_items: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.mem_items = mem_items
+        self._mem: OrderedDict = OrderedDict()
+        self._disk: dict | None = None  # (game, version, path) -> [size, last_used]
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+
+    # ─── 경로 ───────────────────────────────────────────
+    @staticmethod
+    def _valid(game: str, version: str, path: str) -> bool:
+        parts = [game, version, *path.split("/")]
+        return all(p and p not in (".", "..") and "\\" not in p for p in parts)
+
+    def _file(self, game: str, version: str, path: str) -> str:
+        return os.path.join(self.root, game, version, *path.split("/"))
+
+    def _scan(self):
+        """최초 디스크 접근 시 캐시 폴더를 훑어 크기/최근 사용 시각 표를 만든다."""
+        self._disk = {}
+        self._disk_bytes = 0
+        if not os.path.isdir(self.root):
+            return
+        for dirpath, _, files in os.walk(self.root):
+            rel = os.path.relpath(dirpath, self.root).split(os.sep)
+            if len(rel) < 2 or rel[0] == ".":
+                continue
+            game, version, sub = rel[0], rel[1], rel[2:]
+            for name in files:
+                full = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(full)
+                except OSError:
+                    continue
+                key = (game, version, "/".join([*sub, name]))
+                self._disk[key] = [st.st_size, st.st_mtime]
+                self._disk_bytes += st.st_size
+
+    # ─── 메모리 ─────────────────────────────────────────
+    def get_memory(self, game: str, version: str, path: str):
+        key = (game, version, path)
+        with self._lock:
+            if key in self._mem:
+                self._mem.move_to_end(key)
+                self.hits_memory += 1
+                return self._mem[key]
+        return None
+
+    def _remember(self, key, obj):
+        """_lock 을 잡은 상태에서 호출."""
+        self._mem[key] = obj
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.mem_items:
+            self._mem.popitem(last=False)
+
+    def contains(self, game: str, version: str, path: str, *, scan: bool = True) -> bool:
+        """메모리나 디스크에 있는지만 본다 (히트/미스로 집계하지 않음). 처음 부르면 디스크를 훑는다.
+
+        scan=False 면 디스크를 훑지도 잠금을 기다리지도 않고 이미 아는 항목만 본다 (이벤트 루프에서 불러도 된다).
+        """
+        key = (game, version, path)
+        if not scan:
+            disk = self._disk
+            return key in self._mem or (disk is not None and key in disk)
+        with self._lock:
+            if key in self._mem:
+                return True
+            if not self._valid(*key):
+                return False
+            if self._disk is None:
+                self._scan()
+            return key in self._disk
+
+    # ─── 디스크 (동기) ──────────────────────────────────
+    def load(self, game: str, version: str, path: str):
+        """디스크에서 읽어 파싱. 없으면 None (miss 로 집계)."""
+        key = (game, version, path)
+        if not self._valid(*key):
+            return None
+        with self._lock:
+            if self._disk is None:
+                self._scan()
+            entry = self._disk.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        full = self._file(*key)
+        try:
+            with open(full, "rb") as f:
+                obj = json.loads(f.read())
+            now = time.time()
+            os.utime(full, (now, now))
+        except (OSError, ValueError):
+            with self._lock:
+                self._forget(key)
+            self.misses += 1
+            return None
+        with self._lock:
+            entry[1] = now
+            self.hits_disk += 1
+            self._remember(key, obj)
+        return obj
+
+    def store(self, game: str, version: str, path: str, raw: bytes, obj):
+        """받은 원본 바이트를 디스크에 쓰고 파싱 객체는 메모리에 둔다. 용량 초과 시 LRU 삭제."""
+        key = (game, version, path)
+        with self._lock:
+            self._remember(key, obj)
+        if not self._valid(*key):
+            return
+        full = self._file(*key)
+        try:
+            os.makedirs(os.path.dirname(full), exist_ok=True)
+            tmp = f"{full}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(raw)
+            os.replace(tmp, full)
+        except OSError as e:
+            print(f"[캐시] 디스크 저장 실패 ({path}): {e}")
+            return
+        with self._lock:
+            if self._disk is None:
+                self._scan()
+            self._forget(key)
+            self._disk[key] = [len(raw), time.time()]
+            self._disk_bytes += len(raw)
+            self._evict()
+
+    def _forget(self, key):
+        entry = self._disk.pop(key, None)
+        if entry:
+            self._disk_bytes -= entry[0]
+
+    def _evict(self):
+        if self._disk_bytes <= self.max_bytes:
+            return
+        for key, _ in sorted(self._disk.items(), key=lambda kv: kv[1][1]):
+            if self._disk_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(self._file(*key))
+            except OSError:
+                pass
+            self._forget(key)
+            self._mem.pop(key, None)
+
+    def retire(self, game: str, keep_version: str):
+        """game 의 keep_version 이외 버전을 메모리/디스크에서 모두 지운다."""
+        game_dir = os.path.join(self.root, game)
+        with self._lock:
+            for key in [k for k in self._mem if k[0] == game and k[1] != keep_version]:
+                del self._mem[key]
+            if not os.path.isdir(game_dir):
+                return
+            if self._disk is None:
+                self._scan()
+            for version in os.listdir(game_dir):
+                if version == keep_version:
+                    continue
+                shutil.rmtree(os.path.join(game_dir, version), ignore_errors=True)
+                for key in [k for k in self._disk if k[0] == game and k[1] == version]:
+                    self._forget(key)
+                print(f"[캐시] {game} {version} 버전 캐시 정리")
+
+    def stats(self) -> dict:
+        return {
+            "memory_items": len(self._mem),
+            "disk_items": len(self._disk or {}),
+            "disk_bytes": self._disk_bytes,
+            "hits_memory": self.hits_memory,
+            "hits_disk": self.hits_disk,
+            "misses": self.misses,
+        }
@@ -1,66 +1,95 @@
-import json
-from utils.config import DATA_FILE, SENT_CODES_FILE, GUILD_SETTINGS_FILE, UID_DATA_FILE, SENT_VIDEOS_FILE
+import time
+from utils import storage
+from utils.user_store import store as user_store
 
-def load_data():
-    try:
-        with open(DATA_FILE, "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {"fortune_dates": {}, "gacha_pity": {}}
+# 저장은 전부 data/bot.db (utils/storage.py). 바뀐 행만 쓴다.
 
-def save_data(data):
-    with open(DATA_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+# ─── 운세 / 기원 ───────────────────────────────────────
+# 메모리가 원본이고 DB 에는 모아서 나중에 쓴다 (utils/user_store.py)
+def get_fortune_date(user_id):
+    return user_store.get_fortune_date(user_id)
 
+def set_fortune_date(user_id, day):
+    user_store.set_fortune_date(user_id, day)
+
+def get_gacha_pity(user_id):
+    """유저의 천장/누적 기록 dict (사본). 기록이 없으면 None."""
+    return user_store.get_gacha_pity(user_id)
+
+def set_gacha_pity(user_id, record):
+    user_store.set_gacha_pity(user_id, record)
+
+def delete_gacha_pity(user_id):
+    user_store.delete_gacha_pity(user_id)
+
+# ─── 이미 보낸 코드 (영상/게시물은 utils/dedupe.py) ─────
 def load_sent_codes():
-    try:
-        with open(SENT_CODES_FILE, "r") as f:
-            data = json.load(f)
-            return {k: set(v) for k, v in data.items()}
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
-
-def save_sent_codes(codes_dict):
-    data = {k: list(v) for k, v in codes_dict.items()}
-    with open(SENT_CODES_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+    codes = {}
+    for namespace, key in storage.query("SELECT namespace, key FROM sent_keys WHERE namespace LIKE 'code:%'"):
+        codes.setdefault(namespace[5:], set()).add(key)
+    return codes
+
+def add_sent_codes(codes_by_game):
+    """{game: [code, ...]} 의 새 코드만 한 트랜잭션으로 추가한다."""
+    now = time.time()
+    rows = [(f"code:{game}", code, now) for game, codes in codes_by_game.items() for code in codes]
+    if rows:
+        storage.executemany("INSERT OR IGNORE INTO sent_keys VALUES (?, ?, ?)", rows)
 
+# ─── 길드 알림 설정 ─────────────────────────────────────
 def load_guild_settings():
-    try:
-        with open(GUILD_SETTINGS_FILE, "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
-
-def save_guild_settings(settings):
-    with open(GUILD_SETTINGS_FILE, "w") as f:
-        json.dump(settings, f, indent=2)
-
-def load_uid_data():
-    try:
-        with open(UID_DATA_FILE, "r") as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
-
-def save_uid_data(data):
-    with open(UID_DATA_FILE, "w") as f:
-        json.dump(data, f, indent=2)
-
-def load_sent_videos():
-    try:
-        with open(SENT_VIDEOS_FILE, "r") as f:
-            return set(json.load(f))
-    except:
-        return set()
-
-def save_sent_videos(sent_videos):
-    with open(SENT_VIDEOS_FILE, "w") as f:
-        json.dump(list(sent_videos), f)
-
-def get_channels_for_type(guild_settings, notify_type):
-    channels = []
-    for guild_id, settings in guild_settings.items():
-        if notify_type in settings:
-            channels.append(settings[notify_type])
-    return channels
+    settings = {}
+    for guild_id, notify_type, channel_id in storage.query("SELECT guild_id, notify_type, channel_id FROM guild_notify"):
+        settings.setdefault(guild_id, {})[notify_type] = channel_id
+    return settings
+
+def set_guild_notify(guild_id, notify_type, channel_id):
+    storage.execute("INSERT OR REPLACE INTO guild_notify VALUES (?, ?, ?)", (str(guild_id), notify_type, int(channel_id)))
+
+def delete_guild_notify(guild_id, notify_type):
+    storage.execute("DELETE FROM guild_notify WHERE guild_id = ? AND notify_type = ?", (str(guild_id), notify_type))
+
+# ─── UID ───────────────────────────────────────────────
+def get_uid(user_id):
+    row = storage.query_one("SELECT uid FROM uid_bindings WHERE user_id = ?", (user_id,))
+    return row[0] if row else None
+
+def set_uid(user_id, uid):
+    storage.execute("INSERT OR REPLACE INTO uid_bindings VALUES (?, ?)", (user_id, uid))
+
+class NotifyIndex:
+    """알림 종류 -> 채널 ID 역색인.
+
+    폴러는 매 주기 게임/채널마다 구독 채널을 찾는다. 길드 설정을 매번 훑지 않도록
+    설정이 바뀔 때만 색인을 고치고 조회는 O(1) 로 한다.
+    길드당 알림 종류마다 채널이 하나라서 내부는 notify_type -> {guild_id: channel_id} 로 둔다.
+    """
+
+    def __init__(self, guild_settings=None):
+        self._index = {}
+        for guild_id, settings in (guild_settings or {}).items():
+            for notify_type, channel_id in settings.items():
+                self.set(guild_id, notify_type, channel_id)
+
+    def set(self, guild_id, notify_type, channel_id):
+        """길드의 notify_type 채널을 등록(이미 있으면 교체)."""
+        self._index.setdefault(notify_type, {})[str(guild_id)] = channel_id
+
+    def remove(self, guild_id, notify_type):
+        subscribers = self._index.get(notify_type)
+        if subscribers is None:
+            return
+        subscribers.pop(str(guild_id), None)
+        if not subscribers:
+            del self._index[notify_type]
+
+    def has(self, notify_type):
+        """구독 채널이 하나라도 있는지. 없으면 폴러는 upstream 요청 자체를 건너뛴다."""
+        return notify_type in self._index
+
+    def channels(self, notify_type):
+        return list(self._index.get(notify_type, {}).values())
+
+    def counts(self):
+        """notify_type -> 구독 채널 수."""
+        return {notify_type: len(subscribers) for notify_type, subscribers in self._index.items()}
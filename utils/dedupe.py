@@ -0,0 +1,90 @@
+"""
+보낸 영상/게시물 ID 의 기간 제한 중복 확인 집합.
+
+예전 sent_videos / sent_community_posts 는 ID 가 계속 쌓이기만 했고, 하나 추가될 때마다
+목록 전체를 JSON 으로 다시 썼다. 여기서는 채널(group)별로 최근 ID 만 보관한다.
+
+    sent = SentWindow("video")
+    if video_id not in sent: ...
+    sent.add("genshin_yt", [video_id])
+
+- 저장: sent_keys 테이블에 "{kind}:{group}" 네임스페이스로 한 줄씩 추가만 한다 (append).
+- 정리: SENT_WINDOW_PRUNE_INTERVAL 마다 메모리/DB 에서 오래된 ID 를 지운다 (compaction).
+    · 채널당 SENT_WINDOW_PER_CHANNEL 개를 넘으면 오래된 것부터
+    · SENT_WINDOW_DAYS 일 지난 것. 단 채널별 최근 SENT_WINDOW_KEEP_MIN 개는 남긴다.
+      (글이 뜸한 채널은 한 달 넘은 글이 아직 피드 상단에 있을 수 있다. 지우면 다시 알림이 간다.)
+"""
+import time
+from collections import OrderedDict
+
+from utils import storage
+from utils.config import (
+    SENT_WINDOW_DAYS, SENT_WINDOW_PER_CHANNEL, SENT_WINDOW_KEEP_MIN, SENT_WINDOW_PRUNE_INTERVAL,
+)
+
+
+class SentWindow:
+    def __init__(self, kind: str):
+        self.kind = kind
+        # group -> OrderedDict(key -> 보낸 시각), 오래된 순
+        self._groups: dict[str, OrderedDict] = {}
+        self._owner: dict[str, str] = {}  # key -> group
+        self._last_prune = 0.0
+
+        # 그룹 없이 저장된 예전 데이터("video")는 group "" 로 읽는다
+        rows = storage.query(
+            "SELECT namespace, key, created_at FROM sent_keys "
+            "WHERE namespace = ? OR namespace LIKE ? ORDER BY created_at",
+            (kind, f"{kind}:%"),
+        )
+        for namespace, key, created_at in rows:
+            self._remember(namespace[len(kind) + 1:], key, created_at)
+        self.prune()
+
+    def _namespace(self, group: str) -> str:
+        return f"{self.kind}:{group}" if group else self.kind
+
+    def _remember(self, group: str, key: str, ts: float):
+        if key in self._owner:
+            return
+        self._groups.setdefault(group, OrderedDict())[key] = ts
+        self._owner[key] = group
+
+    def __contains__(self, key) -> bool:
+        return key in self._owner
+
+    def __len__(self) -> int:
+        return len(self._owner)
+
+    def add(self, group: str, keys):
+        """group(유튜브 채널 키 등)에 보낸 ID 를 추가한다. 이미 있는 ID 는 무시."""
+        now = time.time()
+        rows = []
+        for key in keys:
+            if key not in self._owner:
+                self._remember(group, key, now)
+                rows.append((self._namespace(group), key, now))
+        if rows:
+            storage.executemany("INSERT OR IGNORE INTO sent_keys VALUES (?, ?, ?)", rows)
+        if now - self._last_prune >= SENT_WINDOW_PRUNE_INTERVAL:
+            self.prune()
+
+    def prune(self):
+        """기간/개수 제한을 넘은 ID 를 메모리와 DB 에서 지운다."""
+        self._last_prune = now = time.time()
+        horizon = now - SENT_WINDOW_DAYS * 86400
+        expired = []
+        for group, entries in self._groups.items():
+            removable = len(entries) - SENT_WINDOW_KEEP_MIN
+            over_cap = len(entries) - SENT_WINDOW_PER_CHANNEL
+            for key, ts in list(entries.items()):
+                if removable <= 0 or (over_cap <= 0 and ts >= horizon):
+                    break
+                del entries[key]
+                del self._owner[key]
+                expired.append((self._namespace(group), key))
+                removable -= 1
+                over_cap -= 1
+        if expired:
+            storage.executemany("DELETE FROM sent_keys WHERE namespace = ? AND key = ?", expired)
+            print(f"[중복확인] {self.kind}: 오래된 ID {len(expired)}개 정리 (남은 {len(self)}개)")
@@ -0,0 +1,101 @@
+"""
+알림 fan-out 엔진.
+
+새 코드/영상/게시물 알림을 등록된 모든 채널에 동시에 보낸다.
+채널을 하나씩 `await channel.send()` 하면 길드가 수백 개일 때 마지막 길드까지 몇 분이 걸린다.
+
+    sent = await dispatch.fan_out(self.bot, channel_ids, content=msg, tag="리딤코드")
+
+- 동시 전송은 DISPATCH_CONCURRENCY 개까지 (전역 세마포어 — 모든 cog 가 같은 풀을 쓴다)
+- 메시지 전송 rate limit 버킷은 채널 단위다. 같은 채널로는 한 번에 하나씩만 보내서
+  한 버킷에 요청을 몰아넣지 않는다.
+- 429 는 Retry-After 만큼 쉬었다가, 5xx 는 잠깐 쉬었다가 재시도. 403/404 는 바로 포기.
+- 전송마다 "fan_out 호출 ~ 전송 완료" 시간을 기록해 p50/p99 를 낸다 (!봇상태).
+"""
+import asyncio
+import time
+import weakref
+from collections import deque
+
+import discord
+
+from utils.config import DISPATCH_CONCURRENCY, DISPATCH_MAX_RETRIES, DISPATCH_LATENCY_SAMPLES
+
+_pool = asyncio.Semaphore(DISPATCH_CONCURRENCY)
+# channel_id -> Lock (채널별 버킷). 보내거나 기다리는 쪽이 없으면 사라진다 (채널 수만큼 쌓이지 않게).
+_channel_locks: "weakref.WeakValueDictionary[int, asyncio.Lock]" = weakref.WeakValueDictionary()
+# 최근 전송 지연(초)
+_latencies: deque = deque(maxlen=DISPATCH_LATENCY_SAMPLES)
+_stats = {"sent": 0, "failed": 0, "missing": 0, "retried": 0}
+
+
+def _retry_after(e: discord.HTTPException) -> float:
+    """429 응답의 Retry-After(초). 헤더가 없으면 1초."""
+    headers = getattr(e.response, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After", 1))
+    except (TypeError, ValueError):
+        return 1.0
+
+
+async def _deliver(channel, started: float, tag: str, content, embed) -> bool:
+    lock = _channel_locks.get(channel.id)
+    if lock is None:
+        lock = _channel_locks[channel.id] = asyncio.Lock()
+    async with lock:
+        for attempt in range(DISPATCH_MAX_RETRIES + 1):
+            try:
+                # 재시도 대기 중에는 풀 자리를 다른 채널에 양보한다
+                async with _pool:
+                    await channel.send(content=content, embed=embed)
+                _latencies.append(time.monotonic() - started)
+                _stats["sent"] += 1
+                return True
+            except (discord.Forbidden, discord.NotFound) as e:
+                print(f"[{tag}] 채널 {channel.id} 전송 불가: {e}")
+                break
+            except discord.HTTPException as e:
+                if attempt == DISPATCH_MAX_RETRIES or (e.status != 429 and e.status < 500):
+                    print(f"[{tag}] 채널 {channel.id} 전송 실패: {e}")
+                    break
+                _stats["retried"] += 1
+                await asyncio.sleep(_retry_after(e) if e.status == 429 else 1 + attempt)
+            except Exception as e:
+                print(f"[{tag}] 채널 {channel.id} 전송 실패: {e}")
+                break
+    _stats["failed"] += 1
+    return False
+
+
+async def fan_out(bot, channel_ids, *, content: str | None = None, embed: discord.Embed | None = None,
+                  tag: str = "알림") -> int:
+    """channel_ids 모두에 같은 메시지를 동시에 보낸다. 반환: 전송 성공한 채널 수.
+
+    같은 채널 ID 가 여러 번 들어 있어도 한 번만 보낸다.
+    """
+    started = time.monotonic()
+    jobs = []
+    for channel_id in dict.fromkeys(int(c) for c in channel_ids):
+        channel = bot.get_channel(channel_id)
+        if channel is None:
+            _stats["missing"] += 1
+            print(f"[{tag}] 채널을 찾을 수 없음: {channel_id}")
+            continue
+        jobs.append(_deliver(channel, started, tag, content, embed))
+    if not jobs:
+        return 0
+    results = await asyncio.gather(*jobs)
+    return sum(results)
+
+
+def _percentile(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def stats() -> dict:
+    """sent / failed / missing / retried 카운터 + 최근 전송 지연 p50 / p99 (초)."""
+    recent = list(_latencies)
+    return {**_stats, "p50": _percentile(recent, 0.50), "p99": _percentile(recent, 0.99)}
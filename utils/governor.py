@@ -0,0 +1,167 @@
+"""
+호스트별 요청 조절기 (동시 요청 수 제한 + 토큰 버킷).
+
+유튜브 RSS / 커뮤니티, nanoka, enka 등 여러 cog 가 같은 호스트를 각자 두드린다. 예전에는
+폴러마다 `asyncio.sleep` 으로 간격을 띄웠지만 cog 끼리는 서로 몰랐고, 유저 명령이 몰리면 그대로 나갔다.
+여기서는 aiohttp TraceConfig 로 세션의 모든 요청 시작 시점에 끼어들어 호스트별로
+- 초당 rate 개(최대 burst 개까지 모아 둠)의 토큰이 있을 때만 보내고
+- 응답 헤더를 받기 전까지의 동시 요청을 concurrency 개로 제한하고
+- 429 / 503 을 받으면 Retry-After 동안 그 호스트로 가는 요청을 모두 멈춘다.
+
+    aiohttp.ClientSession(trace_configs=[governor.trace_config()])
+
+http_client 의 공용 세션에는 이미 붙어 있다. 호스트별 값은 config 의 GOVERNOR_HOSTS (없으면 GOVERNOR_DEFAULT).
+기다려야 하는 시간이 GOVERNOR_MAX_WAIT 초를 넘으면 기다리지 않고 HostThrottled 를 낸다
+(요청 타임아웃에 대기 시간도 포함되므로, 어차피 못 보낼 요청을 붙잡아 두지 않는다).
+"""
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+
+import aiohttp
+
+from utils.config import GOVERNOR_DEFAULT, GOVERNOR_HOSTS, GOVERNOR_MAX_WAIT, GOVERNOR_THROTTLE_BACKOFF
+
+
+class HostThrottled(aiohttp.ClientError):
+    """호스트가 Retry-After 로 막혀 있거나 대기열이 너무 길어서 요청을 보내지 않았다."""
+
+
+class _Host:
+    def __init__(self, name: str, concurrency: int, rate: float, burst: int):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.refilled = time.monotonic()
+        self.reserved = 0          # 토큰을 기다리는 중인 요청 수 (대기 시간 계산용)
+        self.slots = asyncio.Semaphore(concurrency)
+        self.concurrency = concurrency
+        self.in_flight = 0
+        self.blocked_until = 0.0   # Retry-After 로 막힌 시각 (monotonic)
+        self.requests = 0
+        self.waited = 0            # 토큰/슬롯 때문에 기다린 요청 수
+        self.wait_total = 0.0
+        self.throttled = 0         # 받은 429 / 503 수
+        self.rejected = 0          # HostThrottled 로 거절한 수
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.refilled) * self.rate)
+        self.refilled = now
+
+    async def acquire(self):
+        started = now = time.monotonic()
+        self._refill(now)
+        # 이번 요청까지 토큰이 돌아오는 데 걸리는 시간 + Retry-After 로 막힌 시간
+        deficit = self.reserved + 1 - self.tokens
+        wait = max(self.blocked_until - now, deficit / self.rate if deficit > 0 else 0.0)
+        if wait > GOVERNOR_MAX_WAIT:
+            self.rejected += 1
+            raise HostThrottled(f"{self.name}: {wait:.0f}초 대기 필요 (요청 조절 중)")
+
+        self.reserved += 1
+        try:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                elif self.tokens < 1:
+                    await asyncio.sleep((1 - self.tokens) / self.rate)
+                else:
+                    self.tokens -= 1
+                    break
+        finally:
+            self.reserved -= 1
+        await self.slots.acquire()
+        self.in_flight += 1
+
+        self.requests += 1
+        waited = time.monotonic() - started
+        if waited > 0.001:
+            self.waited += 1
+            self.wait_total += waited
+
+    def release(self):
+        self.in_flight -= 1
+        self.slots.release()
+
+    def block(self, seconds: float):
+        self.throttled += 1
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        print(f"[요청조절] {self.name} 429/503 — {seconds:.0f}초 동안 요청 중지")
+
+
+_hosts: dict[str, _Host] = {}
+
+
+def _host(name: str) -> _Host:
+    host = _hosts.get(name)
+    if host is None:
+        limits = {**GOVERNOR_DEFAULT, **GOVERNOR_HOSTS.get(name, {})}
+        host = _hosts[name] = _Host(name, limits["concurrency"], limits["rate"], limits["burst"])
+    return host
+
+
+def retry_after(headers) -> float:
+    """Retry-After 헤더(초 또는 HTTP 날짜) → 초. 없거나 이상하면 GOVERNOR_THROTTLE_BACKOFF."""
+    value = headers.get("Retry-After")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+    return GOVERNOR_THROTTLE_BACKOFF
+
+
+async def _on_request_start(session, ctx, params):
+    host = _host(params.url.host or "")
+    await host.acquire()
+    # 슬롯을 잡은 뒤에는 await 하지 않는다 (여기서 취소되면 end/exception 이 오지 않아 슬롯이 샌다)
+    ctx.governed = host
+
+
+async def _on_request_end(session, ctx, params):
+    host = getattr(ctx, "governed", None)
+    if host is None:
+        return
+    ctx.governed = None
+    host.release()
+    if params.response.status in (429, 503):
+        host.block(retry_after(params.response.headers))
+
+
+async def _on_request_exception(session, ctx, params):
+    host = getattr(ctx, "governed", None)
+    if host is not None:
+        ctx.governed = None
+        host.release()
+
+
+def trace_config() -> aiohttp.TraceConfig:
+    """세션에 붙일 TraceConfig. 같은 호스트 상태를 모든 세션이 공유한다."""
+    config = aiohttp.TraceConfig()
+    config.on_request_start.append(_on_request_start)
+    config.on_request_end.append(_on_request_end)
+    config.on_request_exception.append(_on_request_exception)
+    return config
+
+
+def stats() -> list[dict]:
+    """호스트별 요청 수 / 현재 동시 요청 / 기다린 요청과 평균 대기 / 429·503 / 거절 / 남은 차단 시간."""
+    now = time.monotonic()
+    return [{
+        "host": host.name,
+        "requests": host.requests,
+        "in_flight": host.in_flight,
+        "concurrency": host.concurrency,
+        "waited": host.waited,
+        "avg_wait": host.wait_total / host.waited if host.waited else 0.0,
+        "throttled": host.throttled,
+        "rejected": host.rejected,
+        "blocked_for": max(0.0, host.blocked_until - now),
+    } for host in sorted(_hosts.values(), key=lambda h: -h.requests)]
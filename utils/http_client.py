@@ -0,0 +1,69 @@
+"""
+봇 전역 공용 HTTP 클라이언트.
+
+요청마다 aiohttp.ClientSession 을 새로 만들면 매번 TCP/TLS 핸드셰이크와 DNS 조회를
+다시 하게 된다. 세션 하나를 봇 수명 동안 공유해서 호스트별 keep-alive 풀을 재사용한다.
+
+▶ cog / utils 는 세션을 직접 만들지 말고 get() / post() / get_session() 을 쓴다.
+  세션을 닫는 건 main.py 의 종료 처리(close_session)만 한다.
+"""
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from utils import governor
+from utils.config import (
+    HTTP_POOL_LIMIT, HTTP_POOL_LIMIT_PER_HOST, HTTP_DNS_CACHE_TTL,
+    HTTP_KEEPALIVE_TIMEOUT, HTTP_DEFAULT_TIMEOUT, HTTP_HOST_TIMEOUTS,
+)
+
+_session: aiohttp.ClientSession | None = None
+
+
+def _build_connector() -> aiohttp.TCPConnector:
+    return aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        use_dns_cache=True,
+        ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+    )
+
+
+def get_session() -> aiohttp.ClientSession:
+    """공용 세션을 반환. 아직 없거나 닫혔으면 새로 만든다(이벤트 루프 안에서 호출)."""
+    global _session
+    if _session is None or _session.closed:
+        _session = aiohttp.ClientSession(
+            connector=_build_connector(),
+            timeout=aiohttp.ClientTimeout(total=HTTP_DEFAULT_TIMEOUT),
+            # 호스트별 동시 요청 수 / 속도 제한 (utils/governor.py)
+            trace_configs=[governor.trace_config()],
+        )
+    return _session
+
+
+def timeout_for(url: str) -> aiohttp.ClientTimeout:
+    """URL 의 호스트에 맞는 요청 타임아웃 (HTTP_HOST_TIMEOUTS, 없으면 기본값)."""
+    host = urlsplit(url).hostname or ""
+    return aiohttp.ClientTimeout(total=HTTP_HOST_TIMEOUTS.get(host, HTTP_DEFAULT_TIMEOUT))
+
+
+def get(url: str, **kwargs):
+    """공용 세션으로 GET. `async with http_client.get(url) as resp:` 형태로 쓴다."""
+    kwargs.setdefault("timeout", timeout_for(url))
+    return get_session().get(url, **kwargs)
+
+
+def post(url: str, **kwargs):
+    """공용 세션으로 POST."""
+    kwargs.setdefault("timeout", timeout_for(url))
+    return get_session().post(url, **kwargs)
+
+
+async def close_session():
+    """봇 종료 시 호출. 풀에 남은 연결을 정리한다."""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
@@ -7,8 +7,17 @@ URL 구조가 바뀌었고(버전 세그먼트 추가), 응답 JSON 키도 소
 ▶ 사이트가 또 옮겨가면 이 파일의 BASE_URL / 경로 규칙만 고치면 된다.
   각 cog 는 직접 URL 을 만들지 않고 여기 함수만 호출한다.
 """
+import asyncio
+import json
+import os
 import time
-import aiohttp
+
+from utils import breaker, conditional, http_client, singleflight
+from utils.config import (
+    NANOKA_CACHE_DIR, NANOKA_CACHE_MAX_BYTES, NANOKA_CACHE_MEMORY_ITEMS,
+    NANOKA_DETAIL_CONCURRENCY, NANOKA_DETAIL_DEADLINE, NANOKA_PREFETCH_CONCURRENCY, NANOKA_PREFETCH_DEADLINE,
+)
+from utils.content_cache import ContentCache
 
 BASE_URL = "https://static.nanoka.cc"
 MANIFEST_URL = f"{BASE_URL}/manifest.json"
@@ -25,36 +34,236 @@ NEW_CHAR_KEY = "character"
 NEW_ARTIFACT_KEY = ARTIFACT_ENDPOINT
 
 # manifest 는 버전 정보가 자주 안 바뀌므로 프로세스 전역으로 캐싱한다.
-_manifest_cache = {"data": None, "ts": 0.0}
+# TTL 만료 순간 동시에 몰린 호출은 singleflight 로 요청 한 번에 합친다.
+# generation 은 캐시에 새 본문이 들어올 때마다 1씩 오른다. 누가 받아 왔든 폴러는 이 값으로 변경을 알아챈다.
+_manifest_cache = {"data": None, "ts": 0.0, "generation": 0}
 _MANIFEST_TTL = 3600  # 1시간
+# 마지막으로 받은 manifest 사본. nanoka 가 죽은 상태로 재시작해도 버전을 알아내서 캐시를 쓰기 위함.
+_MANIFEST_SNAPSHOT = os.path.join(NANOKA_CACHE_DIR, "manifest.json")
 
+# {game}/{version}/... 데이터 파일 캐시
+data_cache = ContentCache(NANOKA_CACHE_DIR, max_bytes=NANOKA_CACHE_MAX_BYTES, mem_items=NANOKA_CACHE_MEMORY_ITEMS)
+# 게임별 신규 항목 미리 받기 상태: {"version", "urls", "fetched", "failed", "running", "finished_at"}
+_prefetch: dict[str, dict] = {}
 
-async def fetch_manifest(session: aiohttp.ClientSession, *, force: bool = False) -> dict | None:
-    """전체 manifest.json 을 가져온다(캐싱). 게임별 latest 버전과 신규 ID 목록을 담고 있다."""
+
+def _save_manifest_snapshot(raw: bytes):
+    os.makedirs(NANOKA_CACHE_DIR, exist_ok=True)
+    tmp = f"{_MANIFEST_SNAPSHOT}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(raw)
+    os.replace(tmp, _MANIFEST_SNAPSHOT)
+
+
+def _load_manifest_snapshot() -> dict | None:
+    try:
+        with open(_MANIFEST_SNAPSHOT, "rb") as f:
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _retire_old_versions(old: dict | None, new: dict):
+    """manifest 의 latest 가 바뀐(또는 처음 본) 게임은 이전 버전 캐시를 정리한다."""
+    for game_key, block in new.items():
+        if not isinstance(block, dict) or not block.get("latest"):
+            continue
+        old_block = (old or {}).get(game_key)
+        old_latest = old_block.get("latest") if isinstance(old_block, dict) else None
+        if old_latest != block["latest"]:
+            data_cache.retire(game_key, block["latest"])
+
+
+def _set_manifest(data: dict | None):
+    if data is not None:
+        _manifest_cache["data"] = data
+        _manifest_cache["generation"] += 1
+
+
+async def _download_manifest() -> tuple[dict | None, bool]:
+    """manifest.json 을 받아 캐시에 넣는다. 반환: (manifest, 변경 여부).
+
+    캐시가 있으면 조건부 GET 으로 요청해서, 304 면 파싱 없이 기존 캐시를 그대로 쓴다.
+    """
     now = time.time()
-    if not force and _manifest_cache["data"] and now - _manifest_cache["ts"] < _MANIFEST_TTL:
-        return _manifest_cache["data"]
+    use_validators = _manifest_cache["data"] is not None
+    # 계속 실패 중이면 요청하지 않고 직전 캐시로 버틴다
+    if not breaker.allow("nanoka:manifest"):
+        if _manifest_cache["data"] is None:
+            _set_manifest(_load_manifest_snapshot())
+        return _manifest_cache["data"], False
     try:
-        async with session.get(MANIFEST_URL, timeout=aiohttp.ClientTimeout(total=15)) as resp:
-            if resp.status == 200:
-                data = await resp.json()
-                _manifest_cache["data"] = data
+        async with conditional.get(MANIFEST_URL, source="nanoka:manifest", use_validators=use_validators) as resp:
+            if resp.status == conditional.NOT_MODIFIED:
+                breaker.success("nanoka:manifest")
                 _manifest_cache["ts"] = now
-                return data
+                return _manifest_cache["data"], False
+            if resp.status != 200:
+                breaker.failure("nanoka:manifest", f"HTTP {resp.status}")
+            else:
+                raw = await resp.read()
+                data = json.loads(raw)
+                previous = _manifest_cache["data"] or _load_manifest_snapshot()
+                _set_manifest(data)
+                _manifest_cache["ts"] = now
+                await asyncio.to_thread(_save_manifest_snapshot, raw)
+                await asyncio.to_thread(_retire_old_versions, previous, data)
+                return data, True
     except Exception as e:
         print(f"[nanoka] manifest 요청 실패: {e}")
-    # 실패 시 직전 캐시라도 반환(있으면)
-    return _manifest_cache["data"]
+        breaker.failure("nanoka:manifest", e)
+    # 실패 시 직전 캐시라도 반환(있으면). 메모리에 없으면 디스크 사본 사용.
+    if _manifest_cache["data"] is None:
+        _set_manifest(_load_manifest_snapshot())
+    return _manifest_cache["data"], False
+
 
+async def fetch_manifest(*, force: bool = False) -> dict | None:
+    """전체 manifest.json 을 가져온다(캐싱). 게임별 latest 버전과 신규 ID 목록을 담고 있다."""
+    now = time.time()
+    if not force and _manifest_cache["data"] and now - _manifest_cache["ts"] < _MANIFEST_TTL:
+        return _manifest_cache["data"]
+    data, _ = await singleflight.do("nanoka:manifest", _download_manifest)
+    return data
 
-async def get_version(session: aiohttp.ClientSession, game_key: str) -> str | None:
+
+async def refresh_manifest() -> tuple[dict | None, int]:
+    """업데이트 폴링용: TTL 무시하고 다시 확인. 반환: (manifest, generation).
+
+    새 본문은 검색·상태 명령 등 다른 호출자가 먼저 받아 갈 수도 있다 (그 뒤 폴러는 304).
+    그래서 "이번 요청이 200 이었나" 대신, 지난번 비교한 generation 과 다른지로 변경을 판단한다.
+    """
+    await singleflight.do("nanoka:manifest", _download_manifest)
+    return _manifest_cache["data"], _manifest_cache["generation"]
+
+
+async def get_version(game_key: str) -> str | None:
     """게임의 최신(latest) 데이터 버전 문자열을 반환. URL 경로에 끼워 넣는 용도."""
-    manifest = await fetch_manifest(session)
+    manifest = await fetch_manifest()
     if not manifest:
         return None
     return manifest.get(game_key, {}).get("latest")
 
 
+def _cache_key(url: str) -> tuple[str, str, str] | None:
+    """'{BASE_URL}/{game}/{version}/{path}' -> (game, version, path). 버전 경로가 아니면 None."""
+    if not url.startswith(f"{BASE_URL}/"):
+        return None
+    parts = url[len(BASE_URL) + 1:].split("/", 2)
+    if len(parts) < 3 or parts[0] not in WEAPON_ENDPOINT:
+        return None
+    return parts[0], parts[1], parts[2]
+
+
+async def fetch_json(url: str):
+    """nanoka 데이터 JSON 을 가져온다. 버전 경로는 메모리/디스크 캐시를 먼저 본다. 실패 시 None.
+
+    각 cog 는 *_url() 로 만든 주소를 이 함수에 넘기면 된다.
+    """
+    key = _cache_key(url)
+    if key:
+        data = data_cache.get_memory(*key)
+        if data is None:
+            data = await asyncio.to_thread(data_cache.load, *key)
+        if data is not None:
+            return data
+    return await singleflight.do(f"nanoka:{url}", lambda: _download_json(url, key))
+
+
+async def fetch_many(urls: list[str], *, limit: int = NANOKA_DETAIL_CONCURRENCY,
+                     deadline: float = NANOKA_DETAIL_DEADLINE) -> list:
+    """여러 JSON 을 동시에(최대 limit 개씩) 받는다. 반환은 urls 순서대로, 실패/마감 초과는 None.
+
+    전체가 deadline 초 안에 끝나지 않으면 끝난 것만 돌려준다. 마감에 걸린 요청도
+    singleflight 안에서는 끝까지 받아 캐시에 넣으므로 다음 호출은 바로 나온다.
+    """
+    slots = asyncio.Semaphore(limit)
+
+    async def one(url):
+        async with slots:
+            return await fetch_json(url)
+
+    tasks = [asyncio.ensure_future(one(url)) for url in urls]
+    if not tasks:
+        return []
+    _, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+    if pending:
+        print(f"[nanoka] 상세 {len(pending)}/{len(tasks)}개가 {deadline}초 안에 안 와서 건너뜀")
+    return [task.result() if task.done() and not task.cancelled() and task.exception() is None else None
+            for task in tasks]
+
+
+def new_item_urls(game_key: str, version: str, new_block: dict) -> list[str]:
+    """manifest new 블록의 신규 캐릭터/무기 상세 + 그걸 보여 줄 때 쓰는 목록 JSON 주소.
+
+    성유물류는 상세 파일이 없고 목록 JSON 에 세트 효과까지 들어 있으므로 목록만 받는다.
+    """
+    urls = [char_detail_url(game_key, version, cid) for cid in new_block.get(NEW_CHAR_KEY, [])]
+    urls += [weapon_detail_url(game_key, version, wid) for wid in new_block.get(WEAPON_ENDPOINT[game_key], [])]
+    urls.append(char_list_url(game_key, version))
+    if new_block.get(NEW_ARTIFACT_KEY[game_key]):
+        urls.append(artifact_list_url(game_key, version))
+    return urls
+
+
+async def prefetch_new(game_key: str, version: str, new_block: dict):
+    """신규 항목 상세를 데이터 캐시에 미리 받아 둔다. 패치 직후 첫 /신캐 · /캐릭터 가 캐시에서 바로 나오게.
+
+    이미 캐시에 있는 파일은 건너뛰고, 유저 요청과 겹치지 않게 동시 요청 수를 낮게 잡는다.
+    """
+    urls = new_item_urls(game_key, version, new_block)
+    state = _prefetch[game_key] = {"version": version, "urls": urls, "fetched": 0, "failed": 0,
+                                   "running": True, "finished_at": None}
+    cold = [url for url in urls if not await asyncio.to_thread(_is_cached, url)]
+    try:
+        if cold:
+            results = await fetch_many(cold, limit=NANOKA_PREFETCH_CONCURRENCY, deadline=NANOKA_PREFETCH_DEADLINE)
+            state["fetched"] = sum(r is not None for r in results)
+            state["failed"] = len(cold) - state["fetched"]
+            print(f"[nanoka] {game_key} {version} 신규 항목 미리 받기: {state['fetched']}/{len(cold)}개 "
+                  f"(이미 캐시 {len(urls) - len(cold)}개)")
+    finally:
+        state["running"] = False
+        state["finished_at"] = time.time()
+
+
+def _is_cached(url: str, *, scan: bool = True) -> bool:
+    key = _cache_key(url)
+    return key is not None and data_cache.contains(*key, scan=scan)
+
+
+def prefetch_stats() -> dict:
+    """게임별 {"version", "warm", "total", "running", "failed"}. warm 은 지금 캐시에 있는 수 (밀려났으면 줄어든다).
+
+    이벤트 루프에서 부르므로 디스크는 보지 않고 캐시가 이미 아는 항목만 센다
+    (prefetch_new 가 시작할 때 디스크 색인을 만들어 둔다).
+    """
+    return {game_key: {
+        "version": state["version"],
+        "warm": sum(_is_cached(url, scan=False) for url in state["urls"]),
+        "total": len(state["urls"]),
+        "running": state["running"],
+        "failed": state["failed"],
+    } for game_key, state in _prefetch.items()}
+
+
+async def _download_json(url: str, key: tuple[str, str, str] | None):
+    try:
+        async with http_client.get(url) as resp:
+            if resp.status != 200:
+                return None
+            raw = await resp.read()
+        data = json.loads(raw)
+    except Exception as e:
+        print(f"[nanoka] 요청 실패 ({url}): {e}")
+        return None
+    if key:
+        await asyncio.to_thread(data_cache.store, *key, raw, data)
+    return data
+
+
 def weapon_list_url(game_key: str, version: str) -> str:
     """무기/광추 전체 목록 JSON (id -> 간단정보)."""
     return f"{BASE_URL}/{game_key}/{version}/{WEAPON_ENDPOINT[game_key]}.json"
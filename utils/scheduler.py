@@ -0,0 +1,198 @@
+"""
+폴러 공용 스케줄러 (min-heap).
+
+예전에는 cog 마다 tasks.loop 를 따로 돌렸고, 유튜브/커뮤니티는 1분마다 깨어나
+`datetime.now().minute` 가 정해진 분인지 보고 그냥 돌아가기를 반복했다.
+여기서는 작업을 "다음 실행 시각" 힙 하나에 넣고, 가장 이른 작업 시각까지 잠든다.
+
+    scheduler.register("redeem", self.check_codes, interval=300, jitter=30, priority=0,
+                       before=self.before_check_codes)
+
+- interval: 실행 간격(초). 다음 실행은 "직전 예정 시각 + interval" 기준이라 실행 시간만큼 밀리지 않는다.
+- jitter:   매 실행에 0~jitter 초를 더한다. 여러 작업이 정각에 몰려 같은 호스트를 두드리지 않게.
+- priority: 같은 시각에 겹치면 숫자가 작은 작업부터 시작.
+- max_concurrency: 이전 실행이 아직 안 끝났을 때 겹쳐 돌 수 있는 수. 넘으면 이번 회차는 건너뛰고 overrun 으로 센다.
+- before:   첫 실행 전에 한 번 await 할 코루틴 함수 (tasks.loop 의 before_loop 역할).
+- reschedule: 회차가 끝날 때마다 불러 다음 실행까지 남은 초를 받는 함수 (적응형 폴링).
+            None 을 돌려주거나 지정하지 않으면 interval 고정 주기로 돈다.
+
+!봇상태 에서 작업별 다음 실행까지 남은 시간 / 최근 소요 시간 / overrun 을 볼 수 있다.
+"""
+import asyncio
+import heapq
+import itertools
+import random
+import time
+
+
+class Job:
+    def __init__(self, name, func, *, interval, jitter, priority, max_concurrency, before, reschedule):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.jitter = jitter
+        self.priority = priority
+        self.max_concurrency = max_concurrency
+        self.before = before
+        self.reschedule = reschedule
+        self.base = 0.0       # jitter 를 빼고 계산한 예정 시각 (monotonic)
+        self.next_run = None  # 실제 예정 시각 (monotonic). before 대기 중이면 None
+        self.seq = 0          # 힙에 남은 옛 항목을 걸러내는 번호
+        self.running = 0
+        self.runs = 0
+        self.overruns = 0
+        self.failures = 0
+        self.last_duration = 0.0
+        self.tasks: set[asyncio.Task] = set()
+
+
+_jobs: dict[str, Job] = {}
+_heap: list = []  # (next_run, priority, seq, name)
+_counter = itertools.count()
+_wakeup: asyncio.Event | None = None
+_runner: asyncio.Task | None = None
+
+
+def _push(job: Job, when: float):
+    job.base = when
+    job.next_run = when + (random.uniform(0, job.jitter) if job.jitter else 0)
+    job.seq = next(_counter)
+    heapq.heappush(_heap, (job.next_run, job.priority, job.seq, job.name))
+    _wakeup.set()
+
+
+def _ensure_runner():
+    global _wakeup, _runner
+    if _wakeup is None:
+        _wakeup = asyncio.Event()
+    if _runner is None or _runner.done():
+        _runner = asyncio.get_running_loop().create_task(_run_loop())
+
+
+def register(name: str, func, *, interval: float, jitter: float = 0, priority: int = 10,
+             max_concurrency: int = 1, before=None, reschedule=None) -> Job:
+    """작업 등록 (이벤트 루프 안에서 호출). 같은 이름이 있으면 교체한다."""
+    _ensure_runner()
+    unregister(name)
+    job = Job(name, func, interval=interval, jitter=jitter, priority=priority,
+              max_concurrency=max_concurrency, before=before, reschedule=reschedule)
+    _jobs[name] = job
+    if before is None:
+        _push(job, time.monotonic())
+    else:
+        task = asyncio.get_running_loop().create_task(_run_before(job))
+        job.tasks.add(task)
+        task.add_done_callback(job.tasks.discard)
+    return job
+
+
+async def _run_before(job: Job):
+    try:
+        await job.before()
+    except Exception as e:
+        print(f"[스케줄러] {job.name} 준비 작업 실패: {e}")
+    if _jobs.get(job.name) is job:
+        _push(job, time.monotonic())
+
+
+def unregister(name: str):
+    """작업 제거. 실행 중인 회차도 취소한다."""
+    job = _jobs.pop(name, None)
+    if job is None:
+        return
+    for task in list(job.tasks):
+        task.cancel()
+
+
+async def _execute(job: Job):
+    job.running += 1
+    started = time.monotonic()
+    try:
+        await job.func()
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        job.failures += 1
+        print(f"[스케줄러] {job.name} 실행 중 오류: {e}")
+    finally:
+        job.running -= 1
+        job.runs += 1
+        job.last_duration = time.monotonic() - started
+    if job.reschedule is not None and _jobs.get(job.name) is job:
+        # 적응형 작업: 발송 시점에 잡아 둔 고정 주기 회차를 "다음 소스 차례" 시각으로 바꾼다
+        try:
+            delay = job.reschedule()
+        except Exception as e:
+            print(f"[스케줄러] {job.name} 다음 실행 시각 계산 실패: {e}")
+            delay = None
+        if delay is not None:
+            _push(job, time.monotonic() + delay)
+
+
+async def _run_loop():
+    while True:
+        if not _heap:
+            _wakeup.clear()
+            await _wakeup.wait()
+            continue
+
+        when, _, seq, name = _heap[0]
+        delay = when - time.monotonic()
+        if delay > 0:
+            _wakeup.clear()
+            try:
+                await asyncio.wait_for(_wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            continue
+
+        heapq.heappop(_heap)
+        job = _jobs.get(name)
+        if job is None or job.seq != seq:
+            continue  # 제거됐거나 다시 잡힌 작업의 옛 항목
+
+        if job.running >= job.max_concurrency:
+            job.overruns += 1
+            print(f"[스케줄러] {job.name} 이전 실행이 아직 진행 중 — 이번 회차 건너뜀")
+        else:
+            task = asyncio.get_running_loop().create_task(_execute(job))
+            job.tasks.add(task)
+            task.add_done_callback(job.tasks.discard)
+
+        # 예정 시각 기준으로 다음 회차. 너무 밀렸으면 지금부터 다시.
+        now = time.monotonic()
+        _push(job, max(job.base + job.interval, now))
+
+
+async def stop():
+    """모든 작업과 스케줄러 루프를 멈춘다 (봇 종료 시)."""
+    global _runner
+    for name in list(_jobs):
+        unregister(name)
+    _heap.clear()
+    if _runner is not None:
+        _runner.cancel()
+        try:
+            await _runner
+        except asyncio.CancelledError:
+            pass
+        _runner = None
+
+
+def jobs() -> list[dict]:
+    """작업별 상태 (다음 실행 이른 순)."""
+    now = time.monotonic()
+    result = []
+    for job in _jobs.values():
+        result.append({
+            "name": job.name,
+            "interval": job.interval,
+            "adaptive": job.reschedule is not None,
+            "next_in": None if job.next_run is None else max(0.0, job.next_run - now),
+            "running": job.running,
+            "runs": job.runs,
+            "overruns": job.overruns,
+            "failures": job.failures,
+            "last_duration": job.last_duration,
+        })
+    return sorted(result, key=lambda j: float("inf") if j["next_in"] is None else j["next_in"])
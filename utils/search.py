@@ -0,0 +1,199 @@
+"""
+이름 검색 색인 (한글 자모 분해 + 초성 + n-gram).
+
+예전 검색은 캐시된 이름을 전부 돌며 양방향 부분 문자열 검사를 하고, 게임마다 처음 걸린 것 하나에서 멈췄다.
+그래서 결과가 dict 순서에 따라 달라졌고 오타("느비에트")나 초성("ㄴㅂㅇㅌ")은 찾지 못했다.
+
+- 이름은 공백/기호를 빼고 소문자로 바꾼 뒤 자모로 분해한다 ("느비" → "ㄴㅡㅂㅣ").
+  입력 중인 글자("느빙" → "ㄴㅡㅂㅣㅇ")도 앞부분 일치로 잡힌다.
+- 자모 문자열의 3-gram 색인으로 후보를 고르고, 초성 질의는 초성 문자열의 2-gram 색인으로 고른다.
+- 후보마다 등급을 매긴다: 완전 일치 3 > 앞부분 일치 2 > 부분 일치 1 > 오타 허용(3-gram Dice) 0.
+  같은 등급 안에서는 길이 차이가 작을수록, 본 이름이 별칭보다 앞선다.
+
+    index = SearchIndex()
+    index.add(("gi", "10000087"), "느비예트", aliases=["Neuvillette"])
+    index.search("ㄴㅂㅇㅌ")  # [{"key": ("gi", "10000087"), "name": "느비예트", "tier": 3, "score": ...}]
+
+슬래시 명령 자동완성은 키 입력마다 불리므로 PrefixTrie 로 따로 답한다. 노드마다 상위 후보를
+미리 담아 두어 한 번 찾는 데 입력 길이만큼만 내려가면 된다.
+"""
+import heapq
+import re
+from collections import defaultdict
+
+from utils.config import AUTOCOMPLETE_LIMIT, SEARCH_FUZZY_MIN, SEARCH_RESULT_LIMIT
+
+_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ", "ㄿ", "ㅀ",
+         "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+_CHO_SET = frozenset(_CHO)
+_STRIP = re.compile(r"[\W_]+")
+
+# n-gram 경계 표시 (앞쪽 두 칸을 채워서 한 글자 질의도 앞부분 일치 후보를 찾게 한다)
+_START, _END = "\x02", "\x03"
+
+EXACT, PREFIX, SUBSTRING, FUZZY = 3, 2, 1, 0
+
+
+def normalize(text: str) -> str:
+    """소문자 + 공백/기호 제거."""
+    return _STRIP.sub("", text.lower())
+
+
+def decompose(text: str) -> str:
+    """한글 음절을 호환 자모로 푼다. 한글이 아닌 글자는 그대로."""
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(_CHO[code // 588])
+            out.append(_JUNG[code % 588 // 28])
+            out.append(_JONG[code % 28])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def chosung(text: str) -> str:
+    """한글 음절은 초성만, 나머지 글자는 그대로."""
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        out.append(_CHO[code // 588] if 0 <= code < 11172 else ch)
+    return "".join(out)
+
+
+def is_chosung_query(text: str) -> bool:
+    return bool(text) and all(ch in _CHO_SET for ch in text)
+
+
+def _trigrams(jamo: str) -> set[str]:
+    padded = f"{_START}{_START}{jamo}{_END}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _bigrams(text: str) -> set[str]:
+    padded = f"{_START}{text}"
+    return {padded[i:i + 2] for i in range(len(padded) - 1)}
+
+
+class SearchIndex:
+    """항목(key, 표시 이름, 별칭들)을 넣고 이름으로 찾는 색인. 항목은 추가만 한다 (바뀌면 새로 만든다)."""
+
+    def __init__(self):
+        self._items: list[tuple] = []          # item -> (key, name)
+        self._keys: list[tuple] = []           # 검색어 하나 -> (item, jamo, chosung, 본이름 여부, 3-gram 수)
+        self._grams: dict[str, list[int]] = defaultdict(list)
+        self._cho_grams: dict[str, list[int]] = defaultdict(list)
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, key, name: str, aliases=()):
+        item = len(self._items)
+        self._items.append((key, name))
+        seen = set()
+        for primary, text in [(True, name)] + [(False, alias) for alias in aliases]:
+            norm = normalize(text or "")
+            if not norm or norm in seen:
+                continue
+            seen.add(norm)
+            jamo, cho = decompose(norm), chosung(norm)
+            grams = _trigrams(jamo)
+            idx = len(self._keys)
+            self._keys.append((item, jamo, cho, primary, len(grams)))
+            for gram in grams:
+                self._grams[gram].append(idx)
+            for gram in _bigrams(cho):
+                self._cho_grams[gram].append(idx)
+
+    def search(self, query: str, limit: int = SEARCH_RESULT_LIMIT) -> list[dict]:
+        """등급/점수 순 상위 limit 개. 각 결과: {"key", "name", "tier", "score"}."""
+        norm = normalize(query)
+        if not norm:
+            return []
+        best: dict[int, tuple[int, float]] = {}
+
+        def offer(item, tier, score):
+            if (tier, score) > best.get(item, (-1, 0.0)):
+                best[item] = (tier, score)
+
+        if is_chosung_query(norm):
+            candidates = None
+            for gram in _bigrams(norm):
+                posting = self._cho_grams.get(gram, ())
+                candidates = set(posting) if candidates is None else candidates.intersection(posting)
+                if not candidates:
+                    break
+            for idx in candidates or ():
+                item, _, cho, primary, _ = self._keys[idx]
+                tier = EXACT if cho == norm else PREFIX if cho.startswith(norm) else SUBSTRING if norm in cho else None
+                if tier is not None:
+                    offer(item, tier, self._closeness(len(cho), len(norm), primary))
+        else:
+            jamo_query = decompose(norm)
+            query_grams = _trigrams(jamo_query)
+            shared: dict[int, int] = defaultdict(int)
+            for gram in query_grams:
+                for idx in self._grams.get(gram, ()):
+                    shared[idx] += 1
+            for idx, count in shared.items():
+                item, jamo, _, primary, gram_count = self._keys[idx]
+                if jamo == jamo_query:
+                    offer(item, EXACT, self._closeness(0, 0, primary))
+                elif jamo.startswith(jamo_query):
+                    offer(item, PREFIX, self._closeness(len(jamo), len(jamo_query), primary))
+                elif jamo_query in jamo or (len(jamo) >= 6 and jamo in jamo_query):
+                    offer(item, SUBSTRING, self._closeness(len(jamo), len(jamo_query), primary))
+                else:
+                    dice = 2 * count / (gram_count + len(query_grams))
+                    if dice >= SEARCH_FUZZY_MIN:
+                        offer(item, FUZZY, dice * (1.0 if primary else 0.98))
+
+        top = heapq.nlargest(limit, best.items(), key=lambda kv: (kv[1], -len(self._items[kv[0]][1])))
+        return [{"key": self._items[item][0], "name": self._items[item][1], "tier": tier, "score": round(score, 3)}
+                for item, (tier, score) in top]
+
+    @staticmethod
+    def _closeness(length: int, query_length: int, primary: bool) -> float:
+        """같은 등급 안의 순위: 길이 차이가 작을수록, 별칭보다 본 이름이 높다."""
+        return 1.0 / (1 + abs(length - query_length)) * (1.0 if primary else 0.98)
+
+
+class PrefixTrie:
+    """자모 단위 앞부분 일치 트라이. 노드마다 그 접두사로 시작하는 항목을 limit 개까지 미리 담아 둔다.
+
+    먼저 add 한 항목이 앞에 온다 (호출하는 쪽에서 짧은 이름 순 등으로 정렬해서 넣는다).
+    """
+
+    def __init__(self, limit: int = AUTOCOMPLETE_LIMIT):
+        self.limit = limit
+        self._root = ({}, [])      # (자식 {자모: 노드}, 항목 목록)
+        self._items: list[tuple] = []
+
+    def __len__(self):
+        return len(self._items)
+
+    def add(self, key, name: str, aliases=()):
+        item = len(self._items)
+        self._items.append((key, name))
+        for text in (name, *aliases):
+            node = self._root
+            for ch in decompose(normalize(text or "")):
+                node = node[0].setdefault(ch, ({}, []))
+                items = node[1]
+                if len(items) < self.limit and (not items or items[-1] != item):
+                    items.append(item)
+
+    def complete(self, prefix: str) -> list[tuple]:
+        """prefix 로 시작하는 (key, name) 목록. 빈 입력이면 빈 목록."""
+        jamo = decompose(normalize(prefix))
+        if not jamo:
+            return []
+        node = self._root
+        for ch in jamo:
+            node = node[0].get(ch)
+            if node is None:
+                return []
+        return [self._items[item] for item in node[1]]
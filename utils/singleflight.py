@@ -0,0 +1,51 @@
+"""
+single-flight: 같은 키로 동시에 들어온 요청을 하나로 합친다.
+
+새 패치 직후 여러 명이 동시에 `/캐릭터 신캐` · `/이벤트 원신` 을 치면 똑같은 upstream 요청이
+사람 수만큼 나간다. 같은 키의 요청이 이미 진행 중이면 새로 보내지 않고 그 결과를 같이 기다린다.
+
+    data = await singleflight.do(f"nanoka:{url}", lambda: _download(url))
+
+- 키의 ':' 앞부분(nanoka/events 등)별로 호출 수 / 합쳐진 수를 집계한다 (!봇상태).
+- 결과(예외 포함)는 기다리던 호출자 모두에게 똑같이 전달된다. 결과 객체는 공유되므로 수정하지 말 것.
+- 기다리던 쪽 하나가 취소돼도 진행 중인 요청은 끝까지 간다(다른 호출자가 기다릴 수 있으므로).
+"""
+import asyncio
+
+# key -> 진행 중인 Task
+_inflight: dict[str, asyncio.Task] = {}
+# 키 접두사 -> {"calls": 전체 호출 수, "shared": 진행 중인 요청에 합쳐진 수}
+_stats: dict[str, dict] = {}
+
+
+def _done(key: str, task: asyncio.Task):
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    # 기다리는 쪽이 모두 취소돼 예외를 아무도 안 꺼내가도 경고가 뜨지 않게 한다
+    if not task.cancelled():
+        task.exception()
+
+
+async def do(key: str, coro_fn):
+    """key 로 진행 중인 요청이 있으면 그 결과를, 없으면 coro_fn() 을 실행해 결과를 반환."""
+    stat = _stats.setdefault(key.split(":", 1)[0], {"calls": 0, "shared": 0})
+    stat["calls"] += 1
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(coro_fn())
+        _inflight[key] = task
+        task.add_done_callback(lambda t: _done(key, t))
+    else:
+        stat["shared"] += 1
+    return await asyncio.shield(task)
+
+
+def stats() -> dict:
+    """접두사별 calls / shared 카운터 (복사본)."""
+    return {k: dict(v) for k, v in _stats.items()}
+
+
+def inflight() -> int:
+    """지금 진행 중인 요청 수."""
+    return len(_inflight)
@@ -0,0 +1,266 @@
+"""
+SQLite(WAL) 저장소.
+
+예전에는 data/*.json 을 통째로 읽고 통째로 다시 썼다. 유저 한 명의 운세/천장만 바뀌어도
+모든 유저 기록을 다시 썼다. 이제 행 단위 upsert 로 바뀐 줄만 쓴다.
+
+    data/bot.db
+      guild_notify   (guild_id, notify_type) -> channel_id   길드 알림 설정
+      sent_keys      (namespace, key)        -> created_at   이미 보낸 코드/영상/게시물 ID
+      publish_history (source, ts)                          새 항목 발견 시각 (적응형 폴링)
+      poll_state     source -> checked_at                   마지막 정상 확인 시각 (warm start)
+      http_validators url -> etag / last_modified / size      조건부 GET 검증값 (utils/conditional.py)
+      uid_bindings   user_id -> uid                          /uid 등록
+      fortune_dates  user_id -> day                          /운세 마지막 날짜
+      gacha_pity     user_id -> 천장/누적 기록                 /기원
+
+- DB 를 처음 만들 때 기존 JSON 파일이 있으면 한 번 가져온다 (import_json). 원본 JSON 은 지우지 않는다.
+- 백업용으로 예전과 같은 형식의 JSON 으로 내보낼 수 있다 (export_json).
+      python -m utils.storage export [폴더]
+- cog 는 이 모듈을 직접 쓰지 말고 utils/data.py 의 함수를 쓴다.
+
+▶ 연결 하나를 여러 스레드(asyncio.to_thread)에서 같이 쓰므로 모든 접근은 _lock 안에서 한다.
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from utils.config import (
+    DB_FILE, DATA_FILE, SENT_CODES_FILE, GUILD_SETTINGS_FILE, UID_DATA_FILE, SENT_VIDEOS_FILE,
+    HTTP_VALIDATORS_FILE,
+)
+
+PITY_FIELDS = ("pity_5star", "pity_4star", "total_pulls", "total_4star", "total_columbina", "total_qiqi", "guaranteed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS guild_notify (
+    guild_id    TEXT NOT NULL,
+    notify_type TEXT NOT NULL,
+    channel_id  INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, notify_type)
+);
+CREATE TABLE IF NOT EXISTS sent_keys (
+    namespace  TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE TABLE IF NOT EXISTS publish_history (
+    source TEXT NOT NULL,
+    ts     REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS publish_history_source ON publish_history (source, ts);
+CREATE TABLE IF NOT EXISTS poll_state (
+    source     TEXT PRIMARY KEY,
+    checked_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS http_validators (
+    url           TEXT PRIMARY KEY,
+    etag          TEXT,
+    last_modified TEXT,
+    size          INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS uid_bindings (
+    user_id TEXT PRIMARY KEY,
+    uid     TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fortune_dates (
+    user_id TEXT PRIMARY KEY,
+    day     TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS gacha_pity (
+    user_id         TEXT PRIMARY KEY,
+    pity_5star      INTEGER NOT NULL DEFAULT 0,
+    pity_4star      INTEGER NOT NULL DEFAULT 0,
+    total_pulls     INTEGER NOT NULL DEFAULT 0,
+    total_4star     INTEGER NOT NULL DEFAULT 0,
+    total_columbina INTEGER NOT NULL DEFAULT 0,
+    total_qiqi      INTEGER NOT NULL DEFAULT 0,
+    guaranteed      INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+_conn: sqlite3.Connection | None = None
+_lock = threading.RLock()
+
+
+def _connect() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        os.makedirs(os.path.dirname(DB_FILE) or ".", exist_ok=True)
+        conn = sqlite3.connect(DB_FILE, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        _conn = conn
+        if _get_meta("json_imported") is None:
+            import_json()
+    return _conn
+
+
+def execute(sql: str, params=()):
+    """쓰기 한 건 (autocommit)."""
+    with _lock:
+        _connect().execute(sql, params)
+
+
+@contextmanager
+def transaction():
+    """with storage.transaction() as conn: ... — 블록 안의 쓰기를 한 트랜잭션으로."""
+    with _lock:
+        conn = _connect()
+        conn.execute("BEGIN")
+        try:
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+
+def executemany(sql: str, rows):
+    """여러 행을 한 트랜잭션으로."""
+    with transaction() as conn:
+        conn.executemany(sql, rows)
+
+
+def query(sql: str, params=()) -> list:
+    with _lock:
+        return _connect().execute(sql, params).fetchall()
+
+
+def query_one(sql: str, params=()):
+    with _lock:
+        return _connect().execute(sql, params).fetchone()
+
+
+def _get_meta(key: str):
+    row = _conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def close():
+    global _conn
+    with _lock:
+        if _conn is not None:
+            _conn.close()
+            _conn = None
+
+
+# ─── JSON 가져오기 / 내보내기 ─────────────────────────────
+def _read_json(path: str, default):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return default
+
+
+def import_json():
+    """기존 data/*.json 을 DB 로 가져온다. DB 생성 시 한 번만 자동 실행된다."""
+    now = time.time()
+    guild_settings = _read_json(GUILD_SETTINGS_FILE, {})
+    sent_codes = _read_json(SENT_CODES_FILE, {})
+    sent_videos = _read_json(SENT_VIDEOS_FILE, [])
+    uid_data = _read_json(UID_DATA_FILE, {})
+    user_data = _read_json(DATA_FILE, {})
+    validators = _read_json(HTTP_VALIDATORS_FILE, {})
+
+    with _lock:
+        conn = _conn
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT OR REPLACE INTO guild_notify VALUES (?, ?, ?)",
+            [(str(g), t, int(c)) for g, settings in guild_settings.items() for t, c in settings.items()],
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO sent_keys VALUES (?, ?, ?)",
+            [(f"code:{game}", code, now) for game, codes in sent_codes.items() for code in codes]
+            + [("video", video_id, now) for video_id in sent_videos],
+        )
+        conn.executemany("INSERT OR REPLACE INTO uid_bindings VALUES (?, ?)",
+                         [(str(u), str(uid)) for u, uid in uid_data.items()])
+        conn.executemany("INSERT OR REPLACE INTO fortune_dates VALUES (?, ?)",
+                         list((user_data.get("fortune_dates") or {}).items()))
+        conn.executemany(
+            f"INSERT OR REPLACE INTO gacha_pity VALUES (?, {', '.join('?' * len(PITY_FIELDS))})",
+            [(u, *(int(rec.get(f, 0)) for f in PITY_FIELDS)) for u, rec in (user_data.get("gacha_pity") or {}).items()],
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO http_validators VALUES (?, ?, ?, ?)",
+            [(url, v.get("etag"), v.get("last_modified"), int(v.get("size") or 0))
+             for url, v in validators.items() if isinstance(v, dict)],
+        )
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('json_imported', ?)", (str(now),))
+        conn.execute("COMMIT")
+
+    if guild_settings or sent_codes or sent_videos or uid_data or user_data:
+        print(f"[저장소] 기존 JSON 데이터를 {DB_FILE} 로 가져왔어요")
+
+
+def pity_row_to_dict(row) -> dict:
+    record = dict(zip(PITY_FIELDS, row))
+    record["guaranteed"] = bool(record["guaranteed"])
+    return record
+
+
+def _write_json(path: str, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def export_json(directory: str) -> list[str]:
+    """DB 내용을 예전 JSON 파일 형식으로 directory 에 내보낸다. 반환: 쓴 파일 경로 목록."""
+    guild_settings = {}
+    for guild_id, notify_type, channel_id in query("SELECT guild_id, notify_type, channel_id FROM guild_notify"):
+        guild_settings.setdefault(guild_id, {})[notify_type] = channel_id
+
+    sent_codes, sent_videos = {}, []
+    for namespace, key in query("SELECT namespace, key FROM sent_keys ORDER BY created_at"):
+        if namespace.startswith("code:"):
+            sent_codes.setdefault(namespace[5:], []).append(key)
+        elif namespace == "video" or namespace.startswith("video:"):
+            sent_videos.append(key)
+
+    uid_data = dict(query("SELECT user_id, uid FROM uid_bindings"))
+    user_data = {
+        "fortune_dates": dict(query("SELECT user_id, day FROM fortune_dates")),
+        "gacha_pity": {
+            row[0]: pity_row_to_dict(row[1:])
+            for row in query(f"SELECT user_id, {', '.join(PITY_FIELDS)} FROM gacha_pity")
+        },
+    }
+
+    written = []
+    for source, data in (
+        (GUILD_SETTINGS_FILE, guild_settings),
+        (SENT_CODES_FILE, sent_codes),
+        (SENT_VIDEOS_FILE, sent_videos),
+        (UID_DATA_FILE, uid_data),
+        (DATA_FILE, user_data),
+    ):
+        path = os.path.join(directory, os.path.basename(source))
+        _write_json(path, data)
+        written.append(path)
+    return written
+
+
+if __name__ == "__main__":
+    # python -m utils.storage export [폴더]
+    if len(sys.argv) >= 2 and sys.argv[1] == "export":
+        target = sys.argv[2] if len(sys.argv) >= 3 else os.path.join("data", "backup")
+        for path in export_json(target):
+            print(path)
+    else:
+        print("사용법: python -m utils.storage export [폴더]")
@@ -0,0 +1,133 @@
+"""
+운세 / 기원 기록 write-behind 저장소.
+
+/운세 · /기원 은 호출마다 DB 를 동기로 읽고 써서 이벤트 루프를 잠깐씩 붙잡는다.
+처음 한 번 전체를 메모리로 읽어 두고(이후 메모리가 원본), 바뀐 유저만 표시해 뒀다가
+USER_STORE_FLUSH_DELAY 초 뒤에 한 번에 모아 스레드에서 DB 에 쓴다.
+/기원 을 연타해도 DB 쓰기는 지연 시간마다 한 트랜잭션이다.
+
+- cog 는 utils/data.py 의 get/set_fortune_date, get/set/delete_gacha_pity 를 쓴다 (내부적으로 이 store).
+- 봇 종료 시 main.py 가 flush() 를 불러 남은 변경을 내려쓴다.
+- 실행 중인 이벤트 루프가 없으면(스크립트 등) 변경 즉시 동기로 쓴다.
+"""
+import asyncio
+import time
+
+from utils import storage
+from utils.config import USER_STORE_FLUSH_DELAY
+from utils.storage import PITY_FIELDS
+
+
+class UserStore:
+    def __init__(self, flush_delay: float):
+        self.flush_delay = flush_delay
+        self._fortune_dates: dict | None = None
+        self._gacha_pity: dict | None = None
+        self._dirty_fortune: set = set()
+        self._dirty_pity: set = set()
+        self._flush_task: asyncio.Task | None = None
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+
+    def _load(self):
+        if self._fortune_dates is not None:
+            return
+        self._fortune_dates = dict(storage.query("SELECT user_id, day FROM fortune_dates"))
+        self._gacha_pity = {
+            row[0]: storage.pity_row_to_dict(row[1:])
+            for row in storage.query(f"SELECT user_id, {', '.join(PITY_FIELDS)} FROM gacha_pity")
+        }
+
+    # ─── 조회 / 변경 (메모리) ────────────────────────────
+    def get_fortune_date(self, user_id):
+        self._load()
+        return self._fortune_dates.get(user_id)
+
+    def set_fortune_date(self, user_id, day):
+        self._load()
+        self._fortune_dates[user_id] = day
+        self._dirty_fortune.add(user_id)
+        self._schedule()
+
+    def get_gacha_pity(self, user_id):
+        """기록 사본 (없으면 None). 수정하려면 set_gacha_pity 로 다시 넣는다."""
+        self._load()
+        record = self._gacha_pity.get(user_id)
+        return dict(record) if record is not None else None
+
+    def set_gacha_pity(self, user_id, record):
+        self._load()
+        self._gacha_pity[user_id] = {field: record.get(field, 0) for field in PITY_FIELDS}
+        self._dirty_pity.add(user_id)
+        self._schedule()
+
+    def delete_gacha_pity(self, user_id):
+        self._load()
+        self._gacha_pity.pop(user_id, None)
+        self._dirty_pity.add(user_id)
+        self._schedule()
+
+    def pending(self) -> int:
+        """아직 DB 에 안 쓴 유저 수."""
+        return len(self._dirty_fortune) + len(self._dirty_pity)
+
+    # ─── 내려쓰기 ────────────────────────────────────────
+    def _schedule(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write(*self._take_dirty())
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_delay)
+        await self.flush()
+
+    def _take_dirty(self):
+        """바뀐 행 스냅샷을 뜨고 dirty 표시를 비운다 (이벤트 루프 스레드에서 호출)."""
+        fortune = [(u, self._fortune_dates[u]) for u in self._dirty_fortune if u in self._fortune_dates]
+        pity_upserts = [
+            (u, *(int(self._gacha_pity[u][f]) for f in PITY_FIELDS))
+            for u in self._dirty_pity if u in self._gacha_pity
+        ]
+        pity_deletes = [(u,) for u in self._dirty_pity if u not in self._gacha_pity]
+        self._dirty_fortune.clear()
+        self._dirty_pity.clear()
+        return fortune, pity_upserts, pity_deletes
+
+    def _write(self, fortune, pity_upserts, pity_deletes):
+        started = time.perf_counter()
+        with storage.transaction() as conn:
+            conn.executemany("INSERT OR REPLACE INTO fortune_dates VALUES (?, ?)", fortune)
+            conn.executemany(
+                f"INSERT OR REPLACE INTO gacha_pity (user_id, {', '.join(PITY_FIELDS)}) "
+                f"VALUES (?, {', '.join('?' * len(PITY_FIELDS))})",
+                pity_upserts,
+            )
+            conn.executemany("DELETE FROM gacha_pity WHERE user_id = ?", pity_deletes)
+        self.flushes += 1
+        self.last_flush_ms = (time.perf_counter() - started) * 1000
+
+    async def flush(self):
+        """밀린 변경을 스레드에서 한 트랜잭션으로 DB 에 쓴다."""
+        if not self.pending():
+            return
+        fortune, pity_upserts, pity_deletes = self._take_dirty()
+        try:
+            await asyncio.to_thread(self._write, fortune, pity_upserts, pity_deletes)
+        except Exception as e:
+            print(f"[저장소] 유저 기록 저장 실패, 다음에 다시 시도: {e}")
+            self._dirty_fortune.update(u for u, _ in fortune)
+            self._dirty_pity.update(row[0] for row in pity_upserts + pity_deletes)
+            # _flush_later 안에서 실패했으면 _flush_task 가 아직 이 task 라서 _schedule 이 새로 잡지 않는다
+            if self._flush_task is asyncio.current_task():
+                self._flush_task = None
+            self._schedule()
+
+    def stats(self) -> dict:
+        return {"pending": self.pending(), "flushes": self.flushes, "last_flush_ms": self.last_flush_ms}
+
+
+store = UserStore(USER_STORE_FLUSH_DELAY)
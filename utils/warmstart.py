@@ -0,0 +1,69 @@
+"""
+재시작 시 "초기화 폭풍" 건너뛰기 (warm start).
+
+예전에는 봇이 켜질 때마다 리딤코드/유튜브/커뮤니티 before 훅이 모든 소스를 하나씩
+(채널 사이에 sleep 까지 넣어서) 다시 받아 "이미 보낸 것" 집합을 채웠다. 첫 폴링이 수십 초 늦어졌다.
+
+보낸 코드/영상/게시물 ID 는 이미 DB 에 남아 있으므로, 소스별로 "마지막으로 정상 확인한 시각"만
+poll_state 테이블에 기록해 둔다 (매 틱 끝 + 종료 시).
+
+- 마지막 확인이 WARM_START_FRESHNESS 초 이내인 소스 → 다시 받지 않고 바로 폴링 시작 (warm)
+  꺼져 있던 사이 올라온 새 항목은 첫 폴링에서 정상적으로 알림이 간다.
+- 오래됐거나 기록이 없는 소스 → 예전처럼 현재 목록을 "이미 보낸 것"으로 채운다 (cold).
+  오래 꺼져 있다 켜졌을 때 쌓인 항목이 한꺼번에 알림으로 쏟아지지 않게. cold 소스끼리는 동시에 받는다.
+
+    cold = warmstart.cold_sources(["youtube:genshin_yt", ...])
+    ... cold 만 시딩 ...
+    warmstart.touch("youtube:genshin_yt")   # 정상 확인할 때마다
+"""
+import time
+
+from utils import storage
+from utils.config import WARM_START_FRESHNESS
+
+# source -> 마지막 정상 확인 시각(epoch)
+_state: dict[str, float] | None = None
+_dirty: set = set()
+# 이번 실행의 시작 방식: source -> "warm" / "cold"
+_start_mode: dict[str, str] = {}
+
+
+def _load():
+    global _state
+    if _state is None:
+        _state = dict(storage.query("SELECT source, checked_at FROM poll_state"))
+
+
+def touch(source: str):
+    """source 를 방금 정상적으로 확인했다고 표시 (DB 반영은 flush 에서)."""
+    _load()
+    _state[source] = time.time()
+    _dirty.add(source)
+
+
+def flush():
+    """touch 된 소스를 DB 에 쓴다. 폴러는 틱 끝에, main.py 는 종료 시 부른다."""
+    if not _dirty:
+        return
+    rows = [(source, _state[source]) for source in _dirty]
+    _dirty.clear()
+    storage.executemany("INSERT OR REPLACE INTO poll_state VALUES (?, ?)", rows)
+
+
+def cold_sources(sources) -> list:
+    """시딩이 필요한(마지막 확인이 오래됐거나 없는) 소스만 골라 반환. 시작 방식도 기록한다."""
+    _load()
+    now = time.time()
+    cold = []
+    for source in sources:
+        if now - _state.get(source, 0) <= WARM_START_FRESHNESS:
+            _start_mode[source] = "warm"
+        else:
+            _start_mode[source] = "cold"
+            cold.append(source)
+    return cold
+
+
+def start_modes() -> dict:
+    """이번 실행에서 소스별 시작 방식 (warm / cold)."""
+    return dict(_start_mode)
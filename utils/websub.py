@@ -0,0 +1,342 @@
+"""
+유튜브 WebSub(PubSubHubbub) 푸시 수신.
+
+RSS 폴링은 새 영상 알림이 최대 폴링 간격만큼 늦고, 영상이 없어도 채널마다 계속 요청한다.
+WebSub 를 켜면 유튜브 허브에 채널별로 구독해 두고, 새 영상이 올라오면 허브가 내장 HTTP 서버로
+Atom 조각을 바로 보내 준다.
+
+    await websub.start(on_push, [channel_id, ...])   # cog_load 에서
+    ...
+    async def on_push(channel_id, videos): ...       # videos 는 get_videos_via_rss 와 같은 형식
+
+- 구독: 허브에 hub.mode=subscribe 요청 → 허브가 GET 으로 challenge 를 보내 확인 → 그대로 돌려준다.
+  확인된 구독은 lease 가 끝나기 WEBSUB_RENEW_MARGIN 전에 "websub" 스케줄러 작업이 다시 구독한다.
+- 수신: POST 본문을 hub.secret 으로 만든 HMAC(X-Hub-Signature)으로 검증한다. 서명이 틀리면
+  2xx 로 답하되 내용은 버린다 (명세대로. 4xx 를 주면 허브가 재전송한다).
+- 폴백: 푸시가 살아 있는(is_live) 채널은 RSS 를 WEBSUB_SAFETY_POLL 간격으로만 확인한다.
+  그 확인에서 푸시로 안 온 영상이 나오면 mark_missed() → 그 채널은 다시 구독이 확인될 때까지
+  평소 폴링으로 돌아간다. 구독이 확인되지 않았거나 lease 가 끝난 채널도 평소대로 폴링한다.
+
+WEBSUB_CALLBACK_URL 이 없으면(기본) 아무것도 하지 않고 예전처럼 RSS 폴링만 한다.
+"""
+import asyncio
+import hashlib
+import hmac
+import secrets
+import time
+from datetime import datetime, timezone
+from urllib.parse import parse_qs, urlsplit
+from xml.etree import ElementTree
+
+from aiohttp import web
+
+from utils import http_client, scheduler
+from utils.config import (
+    WEBSUB_CALLBACK_URL, WEBSUB_HOST, WEBSUB_PORT, WEBSUB_SECRET, WEBSUB_HUB,
+    WEBSUB_LEASE_SECONDS, WEBSUB_RENEW_MARGIN, WEBSUB_VERIFY_TIMEOUT,
+    WEBSUB_SAFETY_POLL, WEBSUB_MAX_AGE, WEBSUB_PUSH_GRACE, POLL_JOBS,
+)
+
+TOPIC_URL = "https://www.youtube.com/xml/feeds/videos.xml?channel_id={}"
+_NS = {
+    "atom": "http://www.w3.org/2005/Atom",
+    "yt": "http://www.youtube.com/xml/schemas/2015",
+}
+
+
+class _Subscription:
+    def __init__(self, channel_id: str):
+        self.channel_id = channel_id
+        self.requested_at = 0.0   # 마지막 구독 요청 시각
+        self.verified_at = 0.0    # 허브가 구독을 확인한 시각
+        self.expires_at = 0.0     # lease 만료 시각
+        self.last_push = 0.0
+        self.last_poll = 0.0      # 안전망 RSS 확인 시각 (time.monotonic)
+        self.pushes = 0
+        self.healthy = False      # False 면 평소 폴링으로 돌아간다
+
+
+# channel_id -> _Subscription
+_subs: dict[str, _Subscription] = {}
+_on_push = None
+_runner: web.AppRunner | None = None
+_callback_url = WEBSUB_CALLBACK_URL
+_hub_url = WEBSUB_HUB
+_secret = WEBSUB_SECRET or secrets.token_hex(20)
+_tasks: set[asyncio.Task] = set()
+_counters = {"pushes": 0, "rejected": 0, "ignored": 0, "requests": 0, "failed_requests": 0}
+
+
+def _topic(channel_id: str) -> str:
+    return TOPIC_URL.format(channel_id)
+
+
+def _channel_of(topic: str) -> str | None:
+    values = parse_qs(urlsplit(topic or "").query).get("channel_id")
+    return values[0] if values else None
+
+
+# ─── 구독 ─────────────────────────────────────────────
+async def subscribe(channel_id: str, mode: str = "subscribe") -> bool:
+    """허브에 구독(또는 해지) 요청. 허브가 받아들이면(2xx) True. 실제 확인은 콜백 GET 으로 온다."""
+    sub = _subs.setdefault(channel_id, _Subscription(channel_id))
+    sub.requested_at = time.time()
+    _counters["requests"] += 1
+    form = {
+        "hub.callback": _callback_url,
+        "hub.topic": _topic(channel_id),
+        "hub.mode": mode,
+        "hub.verify": "async",
+        "hub.lease_seconds": str(WEBSUB_LEASE_SECONDS),
+        "hub.secret": _secret,
+    }
+    try:
+        async with http_client.post(_hub_url, data=form) as resp:
+            if resp.status < 300:
+                return True
+            print(f"[WebSub] {channel_id} {mode} 요청 거절: {resp.status} {(await resp.text())[:200]}")
+    except Exception as e:
+        print(f"[WebSub] {channel_id} {mode} 요청 실패: {e}")
+    _counters["failed_requests"] += 1
+    return False
+
+
+def _needs_renewal(sub: _Subscription, now: float) -> bool:
+    if sub.verified_at and sub.healthy:
+        return sub.expires_at - now <= WEBSUB_RENEW_MARGIN
+    # 아직 확인 전이거나 푸시를 놓친 채널: 확인 대기 시간이 지났으면 다시 요청
+    return now - sub.requested_at >= WEBSUB_VERIFY_TIMEOUT
+
+
+async def renew():
+    """lease 가 곧 끝나거나 확인이 안 된 구독을 다시 요청한다 ("websub" 스케줄러 작업)."""
+    now = time.time()
+    due = [sub.channel_id for sub in _subs.values() if _needs_renewal(sub, now)]
+    if due:
+        await asyncio.gather(*(subscribe(channel_id) for channel_id in due))
+
+
+# ─── 콜백 서버 ─────────────────────────────────────────
+async def _handle_verify(request: web.Request) -> web.Response:
+    """허브의 구독 확인 (GET). 우리가 구독을 요청해 두고 확인을 기다리는 topic 일 때만 challenge 를 돌려준다.
+
+    콜백 주소는 공개돼 있으므로 누구나 GET 을 보낼 수 있다. 요청한 적 없는 확인이나
+    해지(이 봇은 해지를 보내지 않는다)를 받아 주면 채널을 안전망 폴링으로 돌리거나 구독을 끊을 수 있다.
+    """
+    mode = request.query.get("hub.mode")
+    channel_id = _channel_of(request.query.get("hub.topic"))
+    sub = _subs.get(channel_id)
+    if sub is None:
+        return web.Response(status=404)
+
+    if mode == "denied":
+        sub.verified_at = sub.expires_at = 0.0
+        sub.healthy = False
+        print(f"[WebSub] {channel_id} 구독 거부됨: {request.query.get('hub.reason', '')}")
+        return web.Response(text="")
+    if mode == "unsubscribe":
+        return web.Response(status=404)
+    if mode != "subscribe":
+        return web.Response(status=400)
+
+    now = time.time()
+    if not sub.requested_at or now - sub.requested_at >= WEBSUB_VERIFY_TIMEOUT:
+        print(f"[WebSub] {channel_id} 요청하지 않은 구독 확인 무시")
+        return web.Response(status=404)
+    try:
+        lease = int(request.query.get("hub.lease_seconds", WEBSUB_LEASE_SECONDS))
+    except ValueError:
+        lease = WEBSUB_LEASE_SECONDS
+    # 허브는 요청보다 짧게 줄 수는 있어도 길게 줄 수는 없다
+    lease = max(0, min(lease, WEBSUB_LEASE_SECONDS))
+    sub.requested_at = 0.0  # 확인을 한 번 받았으면 다음 요청 전까지는 대기 중이 아니다
+    sub.verified_at = now
+    sub.expires_at = now + lease
+    sub.healthy = True
+    print(f"[WebSub] {channel_id} 구독 확인 ({lease // 3600}시간)")
+    return web.Response(text=request.query.get("hub.challenge", ""))
+
+
+def _signature_ok(body: bytes, header: str | None) -> bool:
+    """X-Hub-Signature: sha1=<hex> (허브에 따라 sha256/sha512)."""
+    if not header or "=" not in header:
+        return False
+    algorithm, _, signature = header.partition("=")
+    if algorithm not in ("sha1", "sha256", "sha384", "sha512"):
+        return False
+    expected = hmac.new(_secret.encode(), body, getattr(hashlib, algorithm)).hexdigest()
+    return hmac.compare_digest(expected, signature.strip().lower())
+
+
+def _published_ts(text: str | None) -> float | None:
+    if not text:
+        return None
+    try:
+        moment = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def parse_notification(body: bytes) -> dict[str, list]:
+    """푸시 Atom 본문 → {channel_id: [video, ...]} (get_videos_via_rss 와 같은 dict 형식).
+
+    삭제 알림(at:deleted-entry)과 WEBSUB_MAX_AGE 보다 오래된 영상(제목/설명 수정 알림)은 뺀다.
+    """
+    root = ElementTree.fromstring(body)
+    horizon = time.time() - WEBSUB_MAX_AGE
+    result: dict[str, list] = {}
+    for entry in root.findall("atom:entry", _NS):
+        video_id = entry.findtext("yt:videoId", namespaces=_NS)
+        channel_id = entry.findtext("yt:channelId", namespaces=_NS)
+        if not video_id or not channel_id:
+            continue
+        published = entry.findtext("atom:published", default="", namespaces=_NS)
+        ts = _published_ts(published)
+        if ts is not None and ts < horizon:
+            continue
+        result.setdefault(channel_id, []).append({
+            "video_id": video_id,
+            "title": entry.findtext("atom:title", default="제목 없음", namespaces=_NS),
+            "thumbnail": f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg",
+            "published_at": published,
+        })
+    return result
+
+
+async def _handle_push(request: web.Request) -> web.Response:
+    """허브의 새 콘텐츠 알림 (POST). 서명을 확인하고 on_push 로 넘긴다. 허브에는 바로 답한다."""
+    body = await request.read()
+    if not _signature_ok(body, request.headers.get("X-Hub-Signature")):
+        _counters["rejected"] += 1
+        print("[WebSub] 서명이 맞지 않는 알림 무시")
+        return web.Response(status=202)
+
+    try:
+        deltas = parse_notification(body)
+    except ElementTree.ParseError as e:
+        print(f"[WebSub] 알림 파싱 실패: {e}")
+        return web.Response(status=202)
+
+    now = time.time()
+    for channel_id, videos in deltas.items():
+        sub = _subs.get(channel_id)
+        if sub is None:
+            _counters["ignored"] += 1
+            continue
+        sub.last_push = now
+        sub.pushes += 1
+        _counters["pushes"] += 1
+        if _on_push is not None:
+            task = asyncio.get_running_loop().create_task(_deliver(channel_id, videos))
+            _tasks.add(task)
+            task.add_done_callback(_tasks.discard)
+    return web.Response(status=204)
+
+
+async def _deliver(channel_id: str, videos: list):
+    try:
+        await _on_push(channel_id, videos)
+    except Exception as e:
+        print(f"[WebSub] {channel_id} 푸시 처리 실패: {e}")
+
+
+async def start(on_push, channel_ids, *, host: str = WEBSUB_HOST, port: int = WEBSUB_PORT,
+                callback_url: str | None = None, hub_url: str | None = None):
+    """콜백 서버를 띄우고 channel_ids 를 구독한다. on_push(channel_id, videos) 는 코루틴 함수.
+
+    서버를 못 띄우면 예외를 그대로 내보낸다 (구독 요청은 보내지 않음).
+    """
+    global _on_push, _runner, _callback_url, _hub_url
+    _on_push = on_push
+    _callback_url = callback_url or _callback_url
+    _hub_url = hub_url or _hub_url
+
+    if _runner is None:
+        app = web.Application()
+        path = urlsplit(_callback_url).path or "/"
+        app.router.add_get(path, _handle_verify)
+        app.router.add_post(path, _handle_push)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            await web.TCPSite(runner, host, port).start()
+        except Exception:
+            # 포트 사용 중 등: 반쯤 띄운 서버를 정리하고 호출한 쪽이 폴링으로 계속하게 한다
+            await runner.cleanup()
+            raise
+        _runner = runner
+        print(f"[WebSub] 콜백 서버 시작: {host}:{port}{path}")
+
+    for channel_id in channel_ids:
+        _subs.setdefault(channel_id, _Subscription(channel_id))
+    await asyncio.gather(*(subscribe(channel_id) for channel_id in channel_ids))
+    scheduler.register("websub", renew, **POLL_JOBS["websub"])
+
+
+async def stop():
+    """갱신 작업과 콜백 서버를 멈춘다. 허브 구독은 lease 가 끝나면 저절로 사라진다."""
+    global _runner
+    scheduler.unregister("websub")
+    for task in list(_tasks):
+        task.cancel()
+    if _runner is not None:
+        await _runner.cleanup()
+        _runner = None
+
+
+# ─── 폴링 쪽에서 쓰는 상태 ─────────────────────────────
+def is_live(channel_id: str) -> bool:
+    """이 채널은 푸시로 받고 있는지 (확인된 구독 + lease 유효 + 놓친 적 없음)."""
+    sub = _subs.get(channel_id)
+    return sub is not None and sub.healthy and sub.expires_at > time.time()
+
+
+def safety_due(channel_id: str) -> bool:
+    """푸시가 살아 있는 채널의 안전망 RSS 확인 차례인지."""
+    sub = _subs.get(channel_id)
+    return sub is None or time.monotonic() - sub.last_poll >= WEBSUB_SAFETY_POLL
+
+
+def safety_in(channel_id: str) -> float:
+    """다음 안전망 RSS 확인까지 남은 초."""
+    sub = _subs.get(channel_id)
+    return 0.0 if sub is None else max(0.0, sub.last_poll + WEBSUB_SAFETY_POLL - time.monotonic())
+
+
+def mark_polled(channel_id: str):
+    sub = _subs.get(channel_id)
+    if sub is not None:
+        sub.last_poll = time.monotonic()
+
+
+def mark_missed(channel_id: str, video: dict):
+    """폴링에서 푸시로 안 온 영상을 찾았다 → 재구독이 확인될 때까지 평소 폴링으로.
+
+    방금 올라온 영상은 푸시가 아직 오는 중일 수 있으니 WEBSUB_PUSH_GRACE 가 지난 것만 센다.
+    """
+    sub = _subs.get(channel_id)
+    if sub is None or not sub.healthy:
+        return
+    published = _published_ts(video.get("published_at"))
+    if published is not None and time.time() - published < WEBSUB_PUSH_GRACE:
+        return
+    video_id = video["video_id"]
+    sub.healthy = False
+    sub.requested_at = 0.0  # 다음 renew 에서 바로 다시 구독
+    print(f"[WebSub] {channel_id} 푸시 누락({video_id}) — 폴링으로 전환 후 재구독")
+
+
+def stats() -> dict:
+    """구독 수 / 푸시 수신 중인 채널 수 / 누적 카운터."""
+    now = time.time()
+    last_push = max((sub.last_push for sub in _subs.values()), default=0.0)
+    return {
+        "enabled": _runner is not None,
+        "channels": len(_subs),
+        "live": sum(1 for channel_id in _subs if is_live(channel_id)),
+        "last_push_ago": now - last_push if last_push else None,
+        **_counters,
+    }